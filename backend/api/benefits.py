@@ -0,0 +1,72 @@
+"""
+Benefits lookup API endpoints.
+
+Serves benefit text, phone numbers and websites directly from the
+preprocessed service data, without an LLM call.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from backend.models.schemas import (
+    BenefitResult,
+    BenefitsLookupResponse,
+    BenefitCategory,
+    BenefitCategoriesResponse
+)
+from backend.services.benefits_catalog import benefits_catalog, normalize_hmo, normalize_tier
+from utils.helpers import get_error_message
+from config.settings import settings
+
+router = APIRouter()
+
+@router.get("/benefits/categories", response_model=BenefitCategoriesResponse)
+async def list_benefit_categories():
+    """List service categories and the services in each."""
+    return BenefitCategoriesResponse(
+        categories=[BenefitCategory(**category) for category in benefits_catalog.categories()]
+    )
+
+@router.get("/benefits", response_model=BenefitsLookupResponse)
+async def lookup_benefits(
+    hmo_name: str = Query(..., description="HMO name (Hebrew or English)"),
+    membership_tier: str = Query(..., description="Membership tier (Hebrew or English)"),
+    category: Optional[str] = Query(None, description="Category key or title"),
+    service: Optional[str] = Query(None, description="Service name (exact, or resolved through the search index)"),
+    q: Optional[str] = Query(None, description="Free-text service query"),
+    limit: int = Query(3, ge=1, le=20),
+    language: str = Query(settings.DEFAULT_LANGUAGE, description="Language for error messages")
+):
+    """
+    Look up benefits for an HMO and membership tier.
+    
+    Provide a category (lists all its services), a service name, a free-text
+    query, or a combination (category restricts service and query matches).
+    """
+    
+    hmo = normalize_hmo(hmo_name)
+    tier = normalize_tier(membership_tier)
+    if not hmo or not tier:
+        raise HTTPException(status_code=400, detail=get_error_message("invalid_hmo_tier", language))
+    
+    if not (category or service or q):
+        raise HTTPException(status_code=400, detail=get_error_message("missing_benefit_query", language))
+    
+    category_key = None
+    if category:
+        category_key = benefits_catalog.resolve_category(category)
+        if not category_key:
+            raise HTTPException(status_code=404, detail=get_error_message("unknown_category", language))
+    
+    results = benefits_catalog.lookup(
+        hmo_name=hmo,
+        membership_tier=tier,
+        category_key=category_key,
+        service_name=service,
+        query=q,
+        limit=limit
+    )
+    
+    return BenefitsLookupResponse(
+        status="success" if results else "not_found",
+        results=[BenefitResult(**vars(result)) for result in results]
+    )
@@ -7,7 +7,10 @@ from fastapi import APIRouter
 from fastapi.responses import Response
 from backend.models.schemas import HealthCheckResponse
 from config.settings import settings
-from utils.helpers import get_available_contexts
+from backend.services import azure_openai_service, answer_cache, intent_classifier
+from utils.helpers import medical_context_store, small_talk_stats
+from utils.search import service_index
+from utils.logging import logger
 
 router = APIRouter()
 
@@ -20,6 +23,19 @@ async def health_check():
     - Service status
     - Azure OpenAI configuration
     - Available user contexts
+    - In-memory context store size and load time
+    - Service search index size and build time
+    - Answer cache size and hit/miss counters
+    - Fast-path hit rate and estimated latency savings
+    - LLM calls skipped for greetings and off-topic messages
+    - Medical Q&A routing decisions between GPT-4o and GPT-4o Mini
+    - Medical Q&A output budgets and truncated answers per question type
+    - Upstream prompt-cache hit rate and cached tokens per deployment
+    - Azure OpenAI token usage, latency and cost per phase, HMO, tier and deployment
+    - Log queue depth, written and dropped records
+    - Single-flight coalescing of identical Azure OpenAI requests
+    - Circuit breaker state per Azure OpenAI deployment
+    - TPM/RPM scheduler usage per Azure OpenAI deployment
     """
     
     try:
@@ -27,15 +43,31 @@ async def health_check():
         config_result = settings.validate_azure_config()
         azure_configured = config_result['valid']
         
-        # Get available user contexts
-        available_contexts = get_available_contexts(settings.DATA_FOLDER)
-        context_names = [f"{hmo}_{tier}" for hmo, tier in available_contexts]
+        # Get available user contexts from the preloaded store
+        context_names = [f"{hmo}_{tier}" for hmo, tier in medical_context_store.available_contexts()]
+        
+        # Report degraded while any deployment's circuit breaker is not closed
+        circuit_breakers = azure_openai_service.circuit_breaker_stats()
+        breakers_closed = all(breaker["state"] == "closed" for breaker in circuit_breakers.values())
         
         return HealthCheckResponse(
-            status="healthy",
+            status="healthy" if breakers_closed else "degraded",
             timestamp=datetime.now().isoformat(),
             azure_openai_configured=azure_configured,
-            available_contexts=context_names
+            available_contexts=context_names,
+            context_store=medical_context_store.stats(),
+            service_index=service_index.stats(),
+            answer_cache=answer_cache.stats(),
+            fast_path=intent_classifier.fast_path_stats.stats(),
+            small_talk=small_talk_stats.stats(),
+            model_routing=azure_openai_service.routing_stats(),
+            output_budget=azure_openai_service.output_budget_stats(),
+            prompt_cache=azure_openai_service.prompt_cache_report(),
+            usage=azure_openai_service.usage_stats(),
+            log_queue=logger.queue_stats(),
+            single_flight=azure_openai_service.single_flight_stats(),
+            circuit_breakers=circuit_breakers,
+            schedulers=azure_openai_service.scheduler_stats()
         )
         
     except Exception as e:
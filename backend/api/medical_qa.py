@@ -2,56 +2,94 @@
 Medical Q&A API endpoints.
 """
 
+import json
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional, AsyncIterator
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from backend.models.schemas import (
     MedicalQARequest, 
     MedicalQAResponse, 
     ChatMessage
 )
-from backend.services import azure_openai_service
+from backend.services import azure_openai_service, answer_cache, intent_classifier, UpstreamUnavailableError
 from config.prompts.medical_qa import build_medical_qa_prompt
-from utils.helpers import detect_language_from_text, get_error_message, load_user_medical_context
-from utils.logging import log_user_action, log_error
+from utils.helpers import (
+    detect_language_from_text,
+    get_error_message,
+    medical_context_store,
+    retrieve_relevant_context,
+    classify_small_talk,
+    get_small_talk_response,
+    small_talk_stats
+)
+from utils.logging import logger, log_user_action, log_error, update_request_context, span
+from utils.metrics import medical_qa_context_duration_seconds, system_prompt_chars, medical_qa_answers_total
 from config.settings import settings
 
 router = APIRouter()
 
-@router.post("/medical-qa", response_model=MedicalQAResponse)
-async def medical_question_answer(request: MedicalQARequest):
+def _start_medical_qa(request: MedicalQARequest, action: str) -> str:
     """
-    Handle medical Q&A phase.
+    Detect the language, attribute the request to the user's plan and log the interaction.
     
-    This endpoint provides medical service information based on user-specific
-    context and answers questions using the knowledge base.
+    Args:
+        request: Medical Q&A request
+        action: Action name for the interaction log
+    
+    Returns:
+        Detected user language
     """
     
-    try:
-        # Detect user language for error messages
+    # Detect user language for error messages
+    with span("detect_language"):
         user_language = detect_language_from_text(request.message)
-        
-        # Log medical Q&A interaction
-        log_user_action(
-            phase="medical_qa",
-            action="ask_question",
-            language=user_language,
-            user_hmo=request.user_info.hmo_name,
-            user_tier=request.user_info.membership_tier,
-            question_length=len(request.message),
-            conversation_length=len(request.conversation_history)
-        )
-        
-        # Load user-specific medical context
-        medical_context = load_user_medical_context(
+    
+    # Attribute this request's Azure OpenAI usage to the user's plan
+    update_request_context(
+        phase="medical_qa",
+        hmo_name=request.user_info.hmo_name,
+        membership_tier=request.user_info.membership_tier
+    )
+    
+    # Log medical Q&A interaction
+    log_user_action(
+        phase="medical_qa",
+        action=action,
+        language=user_language,
+        user_hmo=request.user_info.hmo_name,
+        user_tier=request.user_info.membership_tier,
+        question_length=len(request.message),
+        conversation_length=len(request.conversation_history)
+    )
+    
+    return user_language
+
+def _build_system_prompt(request: MedicalQARequest, user_language: str, shareable: bool = False) -> str:
+    """
+    Load the user's medical context and build the system prompt.
+    
+    Args:
+        request: Medical Q&A request
+        user_language: Detected user language
+        shareable: Leave out personal details, so the answer can be cached for other users
+    
+    Returns:
+        System prompt
+    """
+    
+    with span("context", retrieval=settings.RETRIEVAL_ENABLED):
+        # Get user-specific medical context from the preloaded store
+        context_start = time.perf_counter()
+        medical_context = medical_context_store.get(
             hmo_name=request.user_info.hmo_name,
-            membership_tier=request.user_info.membership_tier,
-            data_folder=settings.DATA_FOLDER
+            membership_tier=request.user_info.membership_tier
         )
         
         if not medical_context:
             log_error(
-                "Failed to load medical context", 
+                "Failed to load medical context",
                 user_hmo=request.user_info.hmo_name,
                 user_tier=request.user_info.membership_tier,
                 language=user_language
@@ -61,52 +99,251 @@ async def medical_question_answer(request: MedicalQARequest):
                 detail=get_error_message("context_load_error", user_language)
             )
         
-        # Build the medical Q&A prompt with user context
+        # Keep only the service categories relevant to the question
+        if settings.RETRIEVAL_ENABLED:
+            retrieval = retrieve_relevant_context(
+                medical_context=medical_context,
+                question=request.message,
+                history=[{"role": msg.role, "content": msg.content} for msg in request.conversation_history],
+                top_k=settings.RETRIEVAL_TOP_K
+            )
+            medical_context = retrieval.context
+            logger.debug(
+                "Medical context retrieval",
+                selected_categories=retrieval.selected_categories,
+                fallback=retrieval.fallback,
+                full_context_tokens=retrieval.full_context_tokens,
+                context_tokens=retrieval.context_tokens
+            )
+        medical_qa_context_duration_seconds.observe(time.perf_counter() - context_start)
+    
+    # Build the medical Q&A prompt with user context
+    with span("prompt_build"):
         system_prompt = build_medical_qa_prompt(
             user_info=request.user_info.dict(),
             medical_context=medical_context,
-            language=user_language
-        )
-        
-        # Get response from Azure OpenAI
-        ai_response = await azure_openai_service.medical_qa_chat(
-            system_prompt=system_prompt,
-            conversation_history=request.conversation_history,
-            user_message=request.message
+            language=user_language,
+            include_personal_details=not shareable
         )
+    system_prompt_chars.labels("medical_qa").observe(len(system_prompt))
+    
+    return system_prompt
+
+def _try_small_talk(request: MedicalQARequest) -> Optional[str]:
+    """
+    Answer greetings, thanks, farewells and off-topic messages with canned replies.
+    
+    Returns:
+        Canned reply, or None when the message needs the LLM
+    """
+    
+    if not settings.SMALL_TALK_ENABLED:
+        return None
+    
+    last_assistant_message = next(
+        (msg.content for msg in reversed(request.conversation_history) if msg.role == "assistant"),
+        None
+    )
+    kind = classify_small_talk(request.message, last_assistant_message)
+    small_talk_stats.record(kind)
+    if not kind:
+        return None
+    
+    user_language = detect_language_from_text(request.message)
+    log_user_action(
+        phase="medical_qa",
+        action="small_talk_reply",
+        language=user_language,
+        user_hmo=request.user_info.hmo_name,
+        user_tier=request.user_info.membership_tier,
+        kind=kind,
+        skipped_llm_calls=small_talk_stats.stats()["skipped_llm_calls"]
+    )
+    return get_small_talk_response(kind, user_language, request.user_info.hmo_name)
+
+def _try_local_answer(request: MedicalQARequest) -> Optional[str]:
+    """Answer the message locally (small talk, then the fast path), or None for the LLM."""
+    return _try_small_talk(request) or _try_fast_path(request)
+
+def _try_fast_path(request: MedicalQARequest) -> Optional[str]:
+    """
+    Answer simple structured questions (benefit, phone, category listing) from templates.
+    
+    Returns:
+        Templated answer, or None when the question needs the LLM
+    """
+    
+    if not settings.FAST_PATH_ENABLED:
+        return None
+    
+    user_language = detect_language_from_text(request.message)
+    match = intent_classifier.try_fast_path(
+        message=request.message,
+        hmo_name=request.user_info.hmo_name,
+        membership_tier=request.user_info.membership_tier,
+        language=user_language
+    )
+    if not match:
+        return None
+    
+    stats = intent_classifier.fast_path_stats.stats()
+    log_user_action(
+        phase="medical_qa",
+        action="fast_path_answer",
+        language=user_language,
+        user_hmo=request.user_info.hmo_name,
+        user_tier=request.user_info.membership_tier,
+        intent=match.intent,
+        category=match.category_key,
+        service=match.service_name,
+        fast_path_hit_ratio=stats["hit_ratio"],
+        estimated_saved_ms=stats["avg_llm_ms"]
+    )
+    return match.answer
+
+def _build_updated_history(request: MedicalQARequest, ai_response: str) -> List[ChatMessage]:
+    """Append the current question and the assistant answer to the conversation history."""
+    
+    # Update conversation history
+    updated_history: List[ChatMessage] = request.conversation_history.copy()
+    
+    # Add user message
+    updated_history.append(ChatMessage(
+        role="user",
+        content=request.message,
+        timestamp=datetime.now().isoformat()
+    ))
+    
+    # Add assistant response
+    updated_history.append(ChatMessage(
+        role="assistant",
+        content=ai_response,
+        timestamp=datetime.now().isoformat()
+    ))
+    
+    return updated_history
+
+def _answer_cache_key(request: MedicalQARequest, user_language: str) -> Optional[str]:
+    """Build the answer cache key for a request, or None when caching is disabled."""
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    
+    return answer_cache.make_key(
+        hmo_name=request.user_info.hmo_name,
+        membership_tier=request.user_info.membership_tier,
+        language=user_language,
+        question=request.message,
+        conversation_history=request.conversation_history,
+        context_version=medical_context_store.version
+    )
+
+def _cache_answer(cache_key: Optional[str], answer: str):
+    """
+    Store an answer in the answer cache if caching applies to it.
+    
+    Cacheable answers are generated from a prompt without personal details
+    (see _build_system_prompt), so they cannot carry the asking user's data.
+    """
+    if cache_key:
+        answer_cache.set(cache_key, answer)
+
+def _log_cache_hit(request: MedicalQARequest, user_language: str):
+    """Log a medical Q&A answer served from the answer cache."""
+    log_user_action(
+        phase="medical_qa",
+        action="answer_cache_hit",
+        language=user_language,
+        user_hmo=request.user_info.hmo_name,
+        user_tier=request.user_info.membership_tier,
+        conversation_length=len(request.conversation_history)
+    )
+
+def _raise_service_unavailable(error: UpstreamUnavailableError, user_language: str):
+    """Fail fast with 503 when the upstream deployment cannot take the request."""
+    log_error(
+        "Azure OpenAI deployment unavailable",
+        deployment=error.deployment,
+        reason=error.reason,
+        language=user_language
+    )
+    raise HTTPException(
+        status_code=503,
+        detail=get_error_message("service_unavailable", user_language)
+    )
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/medical-qa", response_model=MedicalQAResponse)
+async def medical_question_answer(request: MedicalQARequest):
+    """
+    Handle medical Q&A phase.
+    
+    This endpoint provides medical service information based on user-specific
+    context and answers questions using the knowledge base.
+    """
+    
+    try:
+        # Answer small talk and simple structured questions without calling GPT-4o
+        with span("local_answer"):
+            local_answer = _try_local_answer(request)
+        if local_answer:
+            medical_qa_answers_total.labels("local").inc()
+            with span("history"):
+                return MedicalQAResponse(
+                    status="success",
+                    response=local_answer,
+                    conversation_history=_build_updated_history(request, local_answer)
+                )
         
-        if not ai_response:
-            raise HTTPException(
-                status_code=500, 
-                detail=get_error_message("azure_connection_error", user_language)
-            )
-        
-        # Update conversation history
-        updated_history: List[ChatMessage] = request.conversation_history.copy()
+        user_language = _start_medical_qa(request, action="ask_question")
         
-        # Add user message
-        updated_history.append(ChatMessage(
-            role="user",
-            content=request.message,
-            timestamp=datetime.now().isoformat()
-        ))
+        # Serve repeated questions from the answer cache, before any context or prompt work
+        with span("answer_cache"):
+            cache_key = _answer_cache_key(request, user_language)
+            ai_response = answer_cache.get(cache_key) if cache_key else None
         
-        # Add assistant response
-        updated_history.append(ChatMessage(
-            role="assistant",
-            content=ai_response,
-            timestamp=datetime.now().isoformat()
-        ))
+        if ai_response:
+            _log_cache_hit(request, user_language)
+            medical_qa_answers_total.labels("cache").inc()
+        else:
+            system_prompt = _build_system_prompt(request, user_language, shareable=cache_key is not None)
+            
+            # Get response from Azure OpenAI
+            llm_start = time.perf_counter()
+            try:
+                with span("upstream"):
+                    ai_response = await azure_openai_service.medical_qa_chat(
+                        system_prompt=system_prompt,
+                        conversation_history=request.conversation_history,
+                        user_message=request.message
+                    )
+            except UpstreamUnavailableError as e:
+                _raise_service_unavailable(e, user_language)
+            
+            if ai_response:
+                intent_classifier.fast_path_stats.record_llm_latency((time.perf_counter() - llm_start) * 1000)
+            
+            if not ai_response:
+                raise HTTPException(
+                    status_code=500,
+                    detail=get_error_message("azure_connection_error", user_language)
+                )
+            
+            _cache_answer(cache_key, ai_response)
+            medical_qa_answers_total.labels("llm").inc()
         
         # Build response
-        response = MedicalQAResponse(
-            status="success",
-            response=ai_response,
-            conversation_history=updated_history
-        )
+        with span("history"):
+            response = MedicalQAResponse(
+                status="success",
+                response=ai_response,
+                conversation_history=_build_updated_history(request, ai_response)
+            )
         
         return response
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -117,4 +354,110 @@ async def medical_question_answer(request: MedicalQARequest):
         raise HTTPException(
             status_code=500,
             detail=get_error_message("server_error", user_language)
-        )
\ No newline at end of file
+        )
+
+@router.post("/medical-qa/stream")
+async def medical_question_answer_stream(request: MedicalQARequest):
+    """
+    Handle medical Q&A phase, streaming the answer as Server-Sent Events.
+    
+    Emits a `delta` event for every content chunk received from Azure OpenAI,
+    then a final `done` event carrying the full MedicalQAResponse (including the
+    updated conversation history), or an `error` event if generation fails.
+    """
+    
+    cache_key = None
+    try:
+        with span("local_answer"):
+            cached_response = _try_local_answer(request)
+        if cached_response:
+            medical_qa_answers_total.labels("local").inc()
+        else:
+            user_language = _start_medical_qa(request, action="ask_question_stream")
+            
+            # Serve repeated questions from the answer cache, before any context or prompt work
+            with span("answer_cache"):
+                cache_key = _answer_cache_key(request, user_language)
+                cached_response = answer_cache.get(cache_key) if cache_key else None
+            if cached_response:
+                _log_cache_hit(request, user_language)
+                medical_qa_answers_total.labels("cache").inc()
+            else:
+                system_prompt = _build_system_prompt(request, user_language, shareable=cache_key is not None)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("Error preparing streamed medical Q&A", exception=e)
+        raise HTTPException(
+            status_code=500,
+            detail=get_error_message("server_error", settings.DEFAULT_LANGUAGE)
+        )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        chunks: List[str] = []
+        
+        # Local and cached answers are sent as a single delta
+        if cached_response:
+            yield _sse_event("delta", {"content": cached_response})
+            yield _sse_event("done", MedicalQAResponse(
+                status="success",
+                response=cached_response,
+                conversation_history=_build_updated_history(request, cached_response)
+            ).model_dump())
+            return
+        
+        llm_start = time.perf_counter()
+        try:
+            with span("upstream", streamed=True):
+                async for delta in azure_openai_service.medical_qa_chat_stream(
+                    system_prompt=system_prompt,
+                    conversation_history=request.conversation_history,
+                    user_message=request.message
+                ):
+                    chunks.append(delta)
+                    yield _sse_event("delta", {"content": delta})
+        except UpstreamUnavailableError as e:
+            log_error(
+                "Azure OpenAI deployment unavailable",
+                deployment=e.deployment,
+                reason=e.reason,
+                language=user_language
+            )
+            yield _sse_event("error", {
+                "status": "error",
+                "message": get_error_message("service_unavailable", user_language)
+            })
+            return
+        except Exception as e:
+            log_error("Error streaming medical Q&A response", exception=e, language=user_language)
+            yield _sse_event("error", {
+                "status": "error",
+                "message": get_error_message("azure_connection_error", user_language)
+            })
+            return
+        
+        ai_response = "".join(chunks)
+        if not ai_response:
+            yield _sse_event("error", {
+                "status": "error",
+                "message": get_error_message("azure_connection_error", user_language)
+            })
+            return
+        
+        intent_classifier.fast_path_stats.record_llm_latency((time.perf_counter() - llm_start) * 1000)
+        _cache_answer(cache_key, ai_response)
+        medical_qa_answers_total.labels("llm").inc()
+        
+        with span("history"):
+            done_event = _sse_event("done", MedicalQAResponse(
+                status="success",
+                response=ai_response,
+                conversation_history=_build_updated_history(request, ai_response)
+            ).model_dump())
+        yield done_event
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,48 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from backend.services import azure_openai_service, answer_cache
+from utils.helpers import medical_context_store
+from utils.metrics import (
+    metrics,
+    medical_context_load_seconds,
+    medical_contexts_loaded,
+    answer_cache_entries,
+    answer_cache_hit_ratio,
+    prompt_cache_hit_ratio,
+    prompt_cache_cached_token_ratio
+)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _refresh_component_gauges():
+    """Copy point-in-time values from the component stats into their gauges."""
+    context_stats = medical_context_store.stats()
+    medical_context_load_seconds.set(context_stats["load_time_ms"] / 1000)
+    medical_contexts_loaded.set(context_stats["contexts"])
+    
+    cache_stats = answer_cache.stats()
+    answer_cache_entries.set(cache_stats["entries"])
+    answer_cache_hit_ratio.set(cache_stats["hit_ratio"])
+    
+    for deployment, stats in azure_openai_service.prompt_cache_report().items():
+        prompt_cache_hit_ratio.labels(deployment).set(stats["hit_ratio"])
+        prompt_cache_cached_token_ratio.labels(deployment).set(stats["cached_token_ratio"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Expose counters, gauges and latency histograms in the Prometheus text format.
+    
+    Covers HTTP latency per route and status, Azure OpenAI latency, tokens and
+    cost per deployment, medical context lookup time, system prompt size,
+    answer sources, cache hit ratios and in-flight requests.
+    """
+    
+    _refresh_component_gauges()
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -11,10 +11,11 @@ from backend.models.schemas import (
     ChatMessage,
     UserInfo
 )
-from backend.services import azure_openai_service
+from backend.services import azure_openai_service, UpstreamUnavailableError
 from config.prompts.user_info_collection import USER_INFO_COLLECTION_PROMPT, USER_INFO_COLLECTION_PROMPT_EN
 from utils.helpers import detect_language_from_text, get_error_message
-from utils.logging import log_user_action, log_error
+from utils.logging import log_user_action, log_error, update_request_context, span
+from utils.metrics import system_prompt_chars, user_info_turns_total
 from utils.validators.user_info_validator import validate_user_info
 from backend.translations import get_message
 from config.settings import settings
@@ -33,11 +34,14 @@ async def collect_user_info(request: UserInfoCollectionRequest):
     try:
         # Separate language concerns:
         # 1. Chat content language (auto-detected from message)
-        chat_content_language = detect_language_from_text(request.message)
+        with span("detect_language"):
+            chat_content_language = detect_language_from_text(request.message)
         
         # 2. UI language (user preference for interface messages)  
         ui_language = request.ui_language
         
+        update_request_context(phase="user_info_collection")
+        
         # Log user interaction (logs always in English)
         log_user_action(
             phase="user_info_collection",
@@ -50,13 +54,27 @@ async def collect_user_info(request: UserInfoCollectionRequest):
         
         # Select appropriate prompt based on detected language
         system_prompt = USER_INFO_COLLECTION_PROMPT_EN if chat_content_language == "en" else USER_INFO_COLLECTION_PROMPT
+        system_prompt_chars.labels("user_info_collection").observe(len(system_prompt))
         
         # Get response from Azure OpenAI
-        ai_response = await azure_openai_service.user_info_collection_chat(
-            system_prompt=system_prompt,
-            conversation_history=request.conversation_history,
-            user_message=request.message
-        )
+        try:
+            with span("upstream"):
+                ai_response = await azure_openai_service.user_info_collection_chat(
+                    system_prompt=system_prompt,
+                    conversation_history=request.conversation_history,
+                    user_message=request.message
+                )
+        except UpstreamUnavailableError as e:
+            log_error(
+                "Azure OpenAI deployment unavailable",
+                deployment=e.deployment,
+                reason=e.reason,
+                ui_language=ui_language
+            )
+            raise HTTPException(
+                status_code=503,
+                detail=get_error_message("service_unavailable", ui_language)
+            )
         
         if not ai_response:
             raise HTTPException(
@@ -65,33 +83,35 @@ async def collect_user_info(request: UserInfoCollectionRequest):
             )
         
         # Parse the AI response
-        parsed_response = azure_openai_service.parse_user_info_response(ai_response)
-        
-        # Update conversation history
-        updated_history: List[ChatMessage] = request.conversation_history.copy()
-        
-        # Add user message
-        updated_history.append(ChatMessage(
-            role="user",
-            content=request.message,
-            timestamp=datetime.now().isoformat()
-        ))
+        with span("parse"):
+            parsed_response = azure_openai_service.parse_user_info_response(ai_response)
         
-        # Add assistant response
-        updated_history.append(ChatMessage(
-            role="assistant",
-            content=parsed_response.get("response", ai_response),
-            timestamp=datetime.now().isoformat()
-        ))
-        
-        # Build response
-        response = UserInfoCollectionResponse(
-            status=parsed_response.get("status", "collecting"),
-            response=parsed_response.get("response", ai_response),
-            collected_fields=parsed_response.get("collected_fields", []),
-            missing_fields=parsed_response.get("missing_fields", []),
-            conversation_history=updated_history
-        )
+        with span("history"):
+            # Update conversation history
+            updated_history: List[ChatMessage] = request.conversation_history.copy()
+            
+            # Add user message
+            updated_history.append(ChatMessage(
+                role="user",
+                content=request.message,
+                timestamp=datetime.now().isoformat()
+            ))
+            
+            # Add assistant response
+            updated_history.append(ChatMessage(
+                role="assistant",
+                content=parsed_response.get("response", ai_response),
+                timestamp=datetime.now().isoformat()
+            ))
+            
+            # Build response
+            response = UserInfoCollectionResponse(
+                status=parsed_response.get("status", "collecting"),
+                response=parsed_response.get("response", ai_response),
+                collected_fields=parsed_response.get("collected_fields", []),
+                missing_fields=parsed_response.get("missing_fields", []),
+                conversation_history=updated_history
+            )
         
         # If status is completed, try to parse and validate user info
         if parsed_response.get("status") == "completed" and "user_info" in parsed_response:
@@ -99,7 +119,8 @@ async def collect_user_info(request: UserInfoCollectionRequest):
                 user_info_data = parsed_response["user_info"]
                 
                 # Validate user information
-                validation_result = validate_user_info(user_info_data, chat_content_language)
+                with span("validate"):
+                    validation_result = validate_user_info(user_info_data, chat_content_language)
                 
                 if validation_result["is_valid"]:
                     # Use cleaned data from validation
@@ -131,15 +152,16 @@ async def collect_user_info(request: UserInfoCollectionRequest):
                         chat_content_language=chat_content_language,
                         validation_errors=list(validation_result["field_errors"].keys())
                     )
-                
+            
             except Exception as e:
                 log_error("Error parsing user info", exception=e, ui_language=ui_language, chat_language=chat_content_language)
                 # If parsing fails, change status back to error
                 response.status = "error"
                 response.response = get_message("processing_error", ui_language)
         
+        user_info_turns_total.labels(response.status).inc()
         return response
-        
+    
     except HTTPException:
         raise
     except Exception as e:
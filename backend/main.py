@@ -19,12 +19,18 @@ from contextlib import asynccontextmanager
 from backend.api.user_info import router as user_info_router
 from backend.api.medical_qa import router as medical_qa_router
 from backend.api.health import router as health_router
+from backend.api.benefits import router as benefits_router
+from backend.api.metrics import router as metrics_router
+from backend.services import azure_openai_service
 from backend.utils.error_handlers import (
     ErrorHandlingMiddleware, 
     create_http_exception_handler,
     create_validation_exception_handler
 )
 from config.settings import settings
+from config.prompts.medical_qa import medical_qa_prompts
+from utils.helpers import medical_context_store
+from utils.search import service_index
 from utils.logging import logger, log_system_startup
 
 @asynccontextmanager
@@ -44,11 +50,36 @@ async def lifespan(app: FastAPI):
         logger.info("Azure OpenAI configuration validated successfully")
         print("Azure OpenAI configuration validated successfully")
     
+    # Preload all HMO x tier medical contexts into memory
+    contexts_loaded = medical_context_store.load(settings.DATA_FOLDER)
+    logger.info(
+        "Medical context store loaded",
+        **medical_context_store.stats()
+    )
+    print(f"Loaded {contexts_loaded} medical contexts into memory")
+    
+    # Compile the medical Q&A prompt once per HMO x tier x language
+    prompts_compiled = medical_qa_prompts.compile({
+        (hmo, tier): medical_context_store.get(hmo, tier)
+        for hmo, tier in medical_context_store.available_contexts()
+    })
+    logger.info("Medical Q&A prompts compiled", prompts=prompts_compiled)
+    
+    # Build the service search index used by context retrieval
+    documents_indexed = service_index.load(settings.SERVICE_JSONS_FOLDER)
+    logger.info(
+        "Service search index built",
+        **service_index.stats()
+    )
+    print(f"Indexed {documents_indexed} service documents")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Medical Chatbot Microservice...")
     print("Shutting down Medical Chatbot Microservice...")
+    await azure_openai_service.close()
+    logger.flush()
 
 # Create FastAPI application
 app = FastAPI(
@@ -80,6 +111,11 @@ app.add_exception_handler(RequestValidationError, create_validation_exception_ha
 app.include_router(health_router, prefix=f"/api/{settings.API_VERSION}", tags=["Health"])
 app.include_router(user_info_router, prefix=f"/api/{settings.API_VERSION}", tags=["User Information"])
 app.include_router(medical_qa_router, prefix=f"/api/{settings.API_VERSION}", tags=["Medical Q&A"])
+app.include_router(benefits_router, prefix=f"/api/{settings.API_VERSION}", tags=["Benefits"])
+
+# Prometheus scrape endpoint, at the conventional unversioned path
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["Metrics"])
 
 @app.get("/")
 async def root():
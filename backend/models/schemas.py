@@ -58,9 +58,49 @@ class MedicalQAResponse(BaseModel):
     response: str
     conversation_history: List[ChatMessage]
 
+class BenefitResult(BaseModel):
+    """Benefit of a single service for an HMO and membership tier."""
+    category_key: str
+    category_title: str
+    service_name: str
+    hmo_name: str
+    membership_tier: str
+    benefits: Optional[str] = None
+    phone: Optional[str] = None
+    website: Optional[str] = None
+    score: Optional[float] = None
+
+class BenefitsLookupResponse(BaseModel):
+    """Response schema for benefit lookups."""
+    status: str = Field(..., pattern="^(success|not_found)$")
+    results: List[BenefitResult]
+
+class BenefitCategory(BaseModel):
+    """Service category with its services."""
+    key: str
+    title: str
+    services: List[str]
+
+class BenefitCategoriesResponse(BaseModel):
+    """Response schema for the benefit category listing."""
+    categories: List[BenefitCategory]
+
 class HealthCheckResponse(BaseModel):
     """Health check response schema."""
     status: str = "healthy"
     timestamp: str
     azure_openai_configured: bool
-    available_contexts: List[str]
\ No newline at end of file
+    available_contexts: List[str]
+    context_store: Optional[Dict[str, Any]] = None
+    service_index: Optional[Dict[str, Any]] = None
+    answer_cache: Optional[Dict[str, Any]] = None
+    fast_path: Optional[Dict[str, Any]] = None
+    small_talk: Optional[Dict[str, Any]] = None
+    model_routing: Optional[Dict[str, Any]] = None
+    output_budget: Optional[Dict[str, Any]] = None
+    prompt_cache: Optional[Dict[str, Any]] = None
+    usage: Optional[Dict[str, Any]] = None
+    log_queue: Optional[Dict[str, Any]] = None
+    single_flight: Optional[Dict[str, Any]] = None
+    circuit_breakers: Optional[Dict[str, Any]] = None
+    schedulers: Optional[Dict[str, Any]] = None
\ No newline at end of file
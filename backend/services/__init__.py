@@ -1,5 +1,18 @@
 """Backend services package."""
 
 from .azure_openai_service import azure_openai_service
+from .answer_cache import answer_cache
+from .resilience import UpstreamUnavailableError, CircuitOpenError
+from .rate_limiter import SchedulerOverloadedError
+from .benefits_catalog import benefits_catalog
+from .intent_classifier import intent_classifier
 
-__all__ = ['azure_openai_service']
\ No newline at end of file
+__all__ = [
+    'azure_openai_service',
+    'answer_cache',
+    'UpstreamUnavailableError',
+    'CircuitOpenError',
+    'SchedulerOverloadedError',
+    'benefits_catalog',
+    'intent_classifier'
+]
\ No newline at end of file
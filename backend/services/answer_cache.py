@@ -0,0 +1,132 @@
+"""
+Answer Cache
+
+Bounded exact-match cache for medical Q&A answers with LRU and TTL eviction.
+"""
+
+import re
+import time
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from config.settings import settings
+from backend.models.schemas import ChatMessage
+
+class AnswerCache:
+    """
+    LRU + TTL cache of assistant answers.
+    
+    Keys are built from (HMO, tier, language, normalized question, history hash,
+    context version), so a cached answer is only reused for a first-turn
+    question or for a conversation with identical history, and is invalidated
+    whenever the medical context data changes.
+    """
+    
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Normalize question text: lowercase, drop punctuation, collapse whitespace."""
+        text = re.sub(r'[^\w\s%]', ' ', question.lower())
+        return ' '.join(text.split())
+    
+    @staticmethod
+    def history_hash(conversation_history: List[ChatMessage]) -> str:
+        """Hash conversation history roles and contents (timestamps are ignored)."""
+        if not conversation_history:
+            return "first_turn"
+        
+        digest = hashlib.sha256()
+        for msg in conversation_history:
+            digest.update(msg.role.encode('utf-8'))
+            digest.update(b'\x00')
+            digest.update(msg.content.encode('utf-8'))
+            digest.update(b'\x01')
+        return digest.hexdigest()
+    
+    def make_key(
+        self,
+        hmo_name: str,
+        membership_tier: str,
+        language: str,
+        question: str,
+        conversation_history: List[ChatMessage],
+        context_version: str
+    ) -> str:
+        """Build the cache key for a medical question."""
+        parts = [
+            context_version,
+            hmo_name,
+            membership_tier,
+            language,
+            self.history_hash(conversation_history),
+            self.normalize_question(question)
+        ]
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached answer.
+        
+        Returns:
+            Cached answer or None on miss or expiry
+        """
+        
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        stored_at, answer = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return answer
+    
+    def set(self, key: str, answer: str):
+        """Store an answer, evicting the least recently used entry when full."""
+        if self.max_entries <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic(), answer)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove all cached answers."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+# Create global cache instance
+answer_cache = AnswerCache(
+    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS
+)
@@ -5,38 +5,297 @@ Service layer for Azure OpenAI API interactions.
 """
 
 import json
-from typing import List, Dict, Any, Optional
-from openai import AzureOpenAI
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Callable
+from openai import AsyncAzureOpenAI
 from utils.logging import logger
+from utils.helpers.token_budget import fit_history_to_budget, estimate_tokens, estimate_message_tokens
+from backend.services.rate_limiter import DeploymentScheduler, SchedulerOverloadedError
+from backend.services.model_router import ModelRouter, QuestionFeatures, GPT4O_MINI_POLICY
+from backend.services.output_budget import OutputBudgetPolicy, LOOKUP, EXPLANATION, COMPARISON
+from backend.services.prompt_cache import PromptCacheStats, cached_prompt_tokens
+from backend.services.usage_tracker import UsageTracker, EstimatedUsage
+from utils.metrics import (
+    azure_openai_requests_total,
+    azure_openai_request_duration_seconds,
+    azure_openai_requests_in_flight,
+    azure_openai_retries_total,
+    azure_openai_tokens_total,
+    azure_openai_cost_usd_total
+)
+from backend.services.resilience import (
+    CircuitBreaker,
+    UpstreamUnavailableError,
+    CircuitOpenError,
+    is_retryable_error,
+    get_retry_after,
+    backoff_delay
+)
 from config.settings import settings
 from backend.models.schemas import ChatMessage
 
+@dataclass
+class CompletionResult:
+    """Assistant content and the reason generation stopped."""
+    content: str
+    finish_reason: Optional[str] = None
+
 class AzureOpenAIService:
     """Service for Azure OpenAI API interactions."""
     
     def __init__(self):
-        """Initialize Azure OpenAI clients for both endpoints."""
-        self.gpt4o_client = AzureOpenAI(
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_API_KEY,
-            api_version=settings.AZURE_OPENAI_API_VERSION
+        """
+        Initialize async Azure OpenAI clients for both endpoints.
+        
+        The async clients share the running event loop, so a single worker can
+        keep many upstream calls in flight instead of blocking on each one.
+        """
+        # An endpoint override (e.g. the local fake server) replaces both endpoints
+        override = settings.AZURE_OPENAI_ENDPOINT_OVERRIDE
+        
+        # GPT-4o client (for Medical Q&A)
+        self.gpt4o_client = AsyncAzureOpenAI(
+            azure_endpoint=override or settings.AZURE_OPENAI_ENDPOINT,
+            api_key=settings.AZURE_OPENAI_API_KEY or ("fake-key" if override else None),
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            timeout=settings.AZURE_OPENAI_TIMEOUT_SECONDS,
+            max_retries=0  # Retries are handled by the resilience layer
         )
         
         # GPT-4o-mini client (for User Info Collection)
-        self.gpt4o_mini_client = AzureOpenAI(
-            azure_endpoint=settings.AZURE_OPENAI_MINI_ENDPOINT,
-            api_key=settings.AZURE_OPENAI_MINI_API_KEY,
-            api_version=settings.AZURE_OPENAI_MINI_API_VERSION
+        self.gpt4o_mini_client = AsyncAzureOpenAI(
+            azure_endpoint=override or settings.AZURE_OPENAI_MINI_ENDPOINT,
+            api_key=settings.AZURE_OPENAI_MINI_API_KEY or ("fake-key" if override else None),
+            api_version=settings.AZURE_OPENAI_MINI_API_VERSION,
+            timeout=settings.AZURE_OPENAI_TIMEOUT_SECONDS,
+            max_retries=0  # Retries are handled by the resilience layer
         )
-
+        
+        # Single-flight: upstream calls in flight, keyed by prompt fingerprint
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.upstream_requests = 0
+        self.coalesced_requests = 0
+        
+        # Per-request model choice for medical Q&A
+        self.model_router = ModelRouter(settings.MEDICAL_QA_ROUTING_POLICY, settings.ROUTING_MINI_MAX_WORDS)
+        
+        # Per-question-type max_tokens for medical Q&A, escalated when an answer is cut off
+        self.output_budget = OutputBudgetPolicy(
+            budgets={
+                LOOKUP: settings.MEDICAL_QA_LOOKUP_MAX_TOKENS,
+                EXPLANATION: settings.MEDICAL_QA_EXPLANATION_MAX_TOKENS,
+                COMPARISON: settings.MEDICAL_QA_COMPARISON_MAX_TOKENS
+            },
+            max_tokens=settings.MEDICAL_QA_MAX_TOKENS,
+            max_escalations=settings.OUTPUT_BUDGET_MAX_ESCALATIONS
+        )
+        
+        # Upstream prompt-cache accounting (cached_tokens per deployment)
+        self.prompt_cache_stats = PromptCacheStats()
+        
+        # Token, latency and cost accounting per phase, HMO, tier and deployment
+        self.usage_tracker = UsageTracker(prices={
+            settings.GPT_4O_DEPLOYMENT_NAME: {
+                "input": settings.GPT_4O_INPUT_PRICE_PER_1M,
+                "cached_input": settings.GPT_4O_CACHED_INPUT_PRICE_PER_1M,
+                "output": settings.GPT_4O_OUTPUT_PRICE_PER_1M
+            },
+            settings.GPT_4O_MINI_DEPLOYMENT_NAME: {
+                "input": settings.GPT_4O_MINI_INPUT_PRICE_PER_1M,
+                "cached_input": settings.GPT_4O_MINI_CACHED_INPUT_PRICE_PER_1M,
+                "output": settings.GPT_4O_MINI_OUTPUT_PRICE_PER_1M
+            }
+        })
+        
+        # Per-deployment circuit breakers
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        for deployment in (settings.GPT_4O_DEPLOYMENT_NAME, settings.GPT_4O_MINI_DEPLOYMENT_NAME):
+            self._get_circuit_breaker(deployment)
+        
+        # Per-deployment TPM/RPM schedulers, so Q&A and info collection are paced independently
+        self.schedulers: Dict[str, DeploymentScheduler] = {
+            settings.GPT_4O_DEPLOYMENT_NAME: DeploymentScheduler(
+                settings.GPT_4O_DEPLOYMENT_NAME,
+                tpm_limit=settings.GPT_4O_TPM_LIMIT,
+                rpm_limit=settings.GPT_4O_RPM_LIMIT,
+                max_queue=settings.SCHEDULER_MAX_QUEUE,
+                max_wait_seconds=settings.SCHEDULER_MAX_WAIT_SECONDS
+            ),
+            settings.GPT_4O_MINI_DEPLOYMENT_NAME: DeploymentScheduler(
+                settings.GPT_4O_MINI_DEPLOYMENT_NAME,
+                tpm_limit=settings.GPT_4O_MINI_TPM_LIMIT,
+                rpm_limit=settings.GPT_4O_MINI_RPM_LIMIT,
+                max_queue=settings.SCHEDULER_MAX_QUEUE,
+                max_wait_seconds=settings.SCHEDULER_MAX_WAIT_SECONDS
+            )
+        }
+    
+    def _get_circuit_breaker(self, model_deployment: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a deployment."""
+        breaker = self.circuit_breakers.get(model_deployment)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                model_deployment,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout_seconds=settings.CIRCUIT_BREAKER_RESET_SECONDS
+            )
+            self.circuit_breakers[model_deployment] = breaker
+        return breaker
+    
+    def _get_scheduler(self, model_deployment: str) -> DeploymentScheduler:
+        """Get (or create an unlimited) scheduler for a deployment."""
+        scheduler = self.schedulers.get(model_deployment)
+        if scheduler is None:
+            scheduler = DeploymentScheduler(model_deployment)
+            self.schedulers[model_deployment] = scheduler
+        return scheduler
+    
+    def _route_medical_qa(self, user_message: str) -> Tuple[str, AsyncAzureOpenAI, QuestionFeatures]:
+        """
+        Choose the deployment and client for a medical Q&A request and log the decision.
+        
+        Returns:
+            Tuple of (deployment name, client, question features)
+        """
+        decision = self.model_router.route(user_message)
+        logger.info(
+            "Medical Q&A model routing",
+            model=decision.model,
+            reason=decision.reason,
+            policy=self.model_router.policy,
+            **asdict(decision.features)
+        )
+        
+        if decision.model == GPT4O_MINI_POLICY:
+            return settings.GPT_4O_MINI_DEPLOYMENT_NAME, self.gpt4o_mini_client, decision.features
+        return settings.GPT_4O_DEPLOYMENT_NAME, self.gpt4o_client, decision.features
+    
+    async def close(self):
+        """Close the underlying HTTP connection pools."""
+        await self.gpt4o_client.close()
+        await self.gpt4o_mini_client.close()
+    
+    def _build_messages(
+        self, 
+        system_prompt: str, 
+        conversation_history: List[ChatMessage], 
+        user_message: str,
+        token_budget: int,
+        phase: str
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages list: system prompt, history, then the current message.
+        
+        History is windowed to the phase's prompt token budget, keeping the
+        most recent turns and collapsing older ones.
+        """
+        history = [{"role": msg.role, "content": msg.content} for msg in conversation_history]
+        
+        window = fit_history_to_budget(system_prompt, history, user_message, token_budget)
+        
+        if window.dropped_messages:
+            logger.info(
+                "Conversation history trimmed to token budget",
+                phase=phase,
+                token_budget=token_budget,
+                prompt_tokens_estimate=window.prompt_tokens,
+                dropped_messages=window.dropped_messages,
+                trimmed_tokens=window.trimmed_tokens,
+                collapsed=window.collapsed
+            )
+        
+        return window.messages
+    
+    @staticmethod
+    def _prompt_fingerprint(
+        messages: List[Dict[str, str]], 
+        model_deployment: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Fingerprint a chat completion request: deployment, sampling parameters and all messages."""
+        payload = json.dumps(
+            [model_deployment, temperature, max_tokens, messages],
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
     async def chat_completion(
         self, 
         messages: List[Dict[str, str]], 
         model_deployment: str,
         temperature: float,
         max_tokens: int,
-        client: AzureOpenAI
+        client: AsyncAzureOpenAI
     ) -> Optional[str]:
+        """
+        Get chat completion content from Azure OpenAI (see complete()).
+        
+        Returns:
+            Assistant response content or None if error
+        """
+        result = await self.complete(messages, model_deployment, temperature, max_tokens, client)
+        return result.content if result else None
+    
+    async def complete(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_deployment: str,
+        temperature: float,
+        max_tokens: int,
+        client: AsyncAzureOpenAI
+    ) -> Optional[CompletionResult]:
+        """
+        Get chat completion from Azure OpenAI, coalescing identical in-flight requests.
+        
+        Concurrent calls with the same prompt fingerprint await a single upstream
+        call and share its result.
+        
+        Args:
+            messages: List of message dictionaries
+            model_deployment: Azure deployment name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            client: Async Azure OpenAI client to send the request with
+        
+        Returns:
+            CompletionResult, or None if error
+        """
+        
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            self.upstream_requests += 1
+            return await self._create_chat_completion(messages, model_deployment, temperature, max_tokens, client)
+        
+        fingerprint = self._prompt_fingerprint(messages, model_deployment, temperature, max_tokens)
+        
+        in_flight = self._in_flight.get(fingerprint)
+        if in_flight is not None:
+            self.coalesced_requests += 1
+            logger.debug("Coalesced identical Azure OpenAI request", deployment=model_deployment)
+            # Shield so a cancelled waiter does not cancel the shared call
+            return await asyncio.shield(in_flight)
+        
+        self.upstream_requests += 1
+        task = asyncio.ensure_future(
+            self._create_chat_completion(messages, model_deployment, temperature, max_tokens, client)
+        )
+        self._in_flight[fingerprint] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(fingerprint, None))
+        
+        return await asyncio.shield(task)
+    
+    async def _create_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_deployment: str,
+        temperature: float,
+        max_tokens: int,
+        client: AsyncAzureOpenAI
+    ) -> Optional[CompletionResult]:
         """
         Get chat completion from Azure OpenAI.
         
@@ -45,35 +304,239 @@ class AzureOpenAIService:
             model_deployment: Azure deployment name
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
-            
+            client: Async Azure OpenAI client to send the request with
+        
         Returns:
-            Assistant response content or None if error
+            CompletionResult, or None if error
         """
         
         try:
-            response = client.chat.completions.create(
-                model=model_deployment,
+            start = time.perf_counter()
+            response, retries = await self._create_with_resilience(
+                client,
+                model_deployment,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
-
+            self._record_usage(
+                model_deployment,
+                getattr(response, "usage", None),
+                (time.perf_counter() - start) * 1000,
+                retries
+            )
+            
             if response.choices and len(response.choices) > 0:
-                content = response.choices[0].message.content
+                choice = response.choices[0]
+                content = choice.message.content
                 
                 if not content:
                     logger.error("Azure OpenAI returned empty response", deployment=model_deployment)
                     return None
-                    
-                return content
+                
+                return CompletionResult(content=content, finish_reason=choice.finish_reason)
             else:
                 logger.error("No response choices returned from Azure OpenAI")
                 return None
-                
+        
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
-            print(f"Error in Azure OpenAI chat completion: {str(e)}")
+            logger.error("Error in Azure OpenAI chat completion", exception=e, deployment=model_deployment)
             return None
     
+    def _record_usage(self, model_deployment: str, usage: Any, latency_ms: float, retries: int, streamed: bool = False, aborted: bool = False):
+        """Feed a call's usage to the prompt-cache and usage accounting."""
+        # Streamed latency includes generation, so it is not comparable for cache hit/miss latency
+        if not aborted:
+            self.prompt_cache_stats.record(model_deployment, usage, None if streamed else latency_ms)
+        self.usage_tracker.record(model_deployment, usage, latency_ms, retries, streamed, aborted)
+        
+        azure_openai_requests_total.labels(model_deployment, "aborted" if aborted else "success").inc()
+        azure_openai_request_duration_seconds.labels(model_deployment, "true" if streamed else "false").observe(latency_ms / 1000)
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+            cached_tokens = cached_prompt_tokens(usage)
+            azure_openai_tokens_total.labels(model_deployment, "prompt").inc(prompt_tokens)
+            azure_openai_tokens_total.labels(model_deployment, "completion").inc(completion_tokens)
+            azure_openai_tokens_total.labels(model_deployment, "cached").inc(cached_tokens)
+            azure_openai_cost_usd_total.labels(model_deployment).inc(
+                self.usage_tracker.estimate_cost(model_deployment, prompt_tokens, cached_tokens, completion_tokens)
+            )
+    
+    async def _create_with_resilience(self, client: AsyncAzureOpenAI, model_deployment: str, **create_kwargs):
+        """
+        Call chat.completions.create with scheduling, circuit breaking and jittered retries.
+        
+        Every attempt first reserves its estimated token spend with the
+        deployment's TPM/RPM scheduler. Transient failures (429, 5xx, timeouts,
+        connection errors) are retried up to AZURE_OPENAI_MAX_RETRIES times,
+        honouring Retry-After when the server sends it. While a deployment's
+        breaker is open, calls fail fast.
+        
+        Returns:
+            Tuple of (response, number of retried attempts)
+        
+        Raises:
+            CircuitOpenError: If the deployment's circuit breaker is open
+            SchedulerOverloadedError: If the deployment's queue is full or the wait is too long
+            Exception: The last upstream error once retries are exhausted
+        """
+        
+        start = time.perf_counter()
+        breaker = self._get_circuit_breaker(model_deployment)
+        allowed, probe = breaker.allow_request()
+        if not allowed:
+            azure_openai_requests_total.labels(model_deployment, "circuit_open").inc()
+            self.usage_tracker.record_failure(
+                model_deployment, (time.perf_counter() - start) * 1000, 0, CircuitOpenError.__name__, create_kwargs.get("stream", False)
+            )
+            raise CircuitOpenError(model_deployment)
+        
+        scheduler = self._get_scheduler(model_deployment)
+        estimated_tokens = (
+            sum(estimate_message_tokens(msg) for msg in create_kwargs.get("messages", []))
+            + create_kwargs.get("max_tokens", 0)
+        )
+        
+        attempt = 0
+        in_flight = azure_openai_requests_in_flight.labels(model_deployment)
+        in_flight.inc()
+        try:
+            while True:
+                await scheduler.acquire(estimated_tokens)
+                try:
+                    response = await client.chat.completions.create(model=model_deployment, **create_kwargs)
+                    breaker.record_success()
+                    return response, attempt
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        # The deployment answered; the request itself was rejected
+                        breaker.record_success()
+                        raise
+                    
+                    breaker.record_failure()
+                    
+                    retry_after = get_retry_after(e)
+                    delay = retry_after if retry_after is not None else backoff_delay(
+                        attempt,
+                        settings.AZURE_OPENAI_RETRY_BASE_SECONDS,
+                        settings.AZURE_OPENAI_MAX_RETRY_DELAY_SECONDS
+                    )
+                    
+                    if (attempt >= settings.AZURE_OPENAI_MAX_RETRIES
+                            or breaker.state == CircuitBreaker.OPEN
+                            or delay > settings.AZURE_OPENAI_MAX_RETRY_DELAY_SECONDS):
+                        raise
+                    
+                    attempt += 1
+                    azure_openai_retries_total.labels(model_deployment).inc()
+                    logger.warning(
+                        "Retrying Azure OpenAI request",
+                        deployment=model_deployment,
+                        attempt=attempt,
+                        delay_seconds=round(delay, 3),
+                        error_type=type(e).__name__,
+                        status_code=getattr(e, "status_code", None)
+                    )
+                    await asyncio.sleep(delay)
+        except Exception as e:
+            outcome = "shed" if isinstance(e, SchedulerOverloadedError) else "error"
+            azure_openai_requests_total.labels(model_deployment, outcome).inc()
+            self.usage_tracker.record_failure(
+                model_deployment, (time.perf_counter() - start) * 1000, attempt, type(e).__name__, create_kwargs.get("stream", False)
+            )
+            raise
+        finally:
+            in_flight.dec()
+            # Only the call holding the half-open probe slot frees it
+            if probe:
+                breaker.release_probe()
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_deployment: str,
+        temperature: float,
+        max_tokens: int,
+        client: AsyncAzureOpenAI,
+        on_finish: Optional[Callable[[Optional[str]], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream chat completion deltas from Azure OpenAI.
+        
+        Args:
+            messages: List of message dictionaries
+            model_deployment: Azure deployment name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            client: Async Azure OpenAI client to send the request with
+            on_finish: Called with the finish reason once the stream ends (optional)
+        
+        Yields:
+            Assistant content deltas as they arrive
+        
+        Usage, latency and the finish callback are recorded however the stream
+        ends. When it is aborted (client disconnect, upstream error) before the
+        usage chunk arrives, the upstream response is closed and the tokens used
+        so far are estimated from the prompt and the content already streamed.
+        """
+        
+        # Usage (and cached_tokens) arrives in a final chunk only when requested
+        stream_options = {"stream_options": {"include_usage": True}} if settings.AZURE_OPENAI_STREAM_USAGE else {}
+        
+        start = time.perf_counter()
+        stream, retries = await self._create_with_resilience(
+            client,
+            model_deployment,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **stream_options
+        )
+        
+        finish_reason = None
+        usage = None
+        streamed_content: List[str] = []
+        completed = False
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                
+                # Azure sends content-filter and usage chunks without choices
+                if not chunk.choices:
+                    continue
+                
+                if chunk.choices[0].finish_reason:
+                    finish_reason = chunk.choices[0].finish_reason
+                
+                content = chunk.choices[0].delta.content
+                if content:
+                    streamed_content.append(content)
+                    yield content
+            completed = True
+        finally:
+            aborted = not completed
+            if aborted and usage is None:
+                usage = EstimatedUsage(
+                    prompt_tokens=sum(estimate_message_tokens(msg) for msg in messages),
+                    completion_tokens=estimate_tokens("".join(streamed_content))
+                )
+            self._record_usage(model_deployment, usage, (time.perf_counter() - start) * 1000, retries, streamed=True, aborted=aborted)
+            
+            if on_finish:
+                on_finish(finish_reason)
+            
+            # Stop upstream generation (and its billing) for an abandoned stream
+            if aborted:
+                try:
+                    await stream.close()
+                except Exception as e:
+                    logger.warning("Error closing aborted Azure OpenAI stream", deployment=model_deployment, error_type=type(e).__name__)
+    
     async def user_info_collection_chat(
         self, 
         system_prompt: str, 
@@ -87,19 +550,17 @@ class AzureOpenAIService:
             system_prompt: System prompt for user info collection
             conversation_history: Previous conversation messages
             user_message: Current user message
-            
+        
         Returns:
             Assistant response or None if error
         """
-        # Build messages list
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add conversation history
-        for msg in conversation_history:
-            messages.append({"role": msg.role, "content": msg.content})
-        
-        # Add current user message
-        messages.append({"role": "user", "content": user_message})
+        messages = self._build_messages(
+            system_prompt,
+            conversation_history,
+            user_message,
+            settings.USER_INFO_PROMPT_TOKEN_BUDGET,
+            phase="user_info_collection"
+        )
         
         # Use GPT-4o Mini with configured parameters for user info collection
         return await self.chat_completion(
@@ -123,37 +584,170 @@ class AzureOpenAIService:
             system_prompt: System prompt with user context
             conversation_history: Previous conversation messages
             user_message: Current user message
-            
+        
         Returns:
             Assistant response or None if error
         """
         
-        # Build messages list
-        messages = [{"role": "system", "content": system_prompt}]
+        messages = self._build_messages(
+            system_prompt,
+            conversation_history,
+            user_message,
+            settings.MEDICAL_QA_PROMPT_TOKEN_BUDGET,
+            phase="medical_qa"
+        )
+        
+        # Route to GPT-4o or GPT-4o Mini with configured parameters for medical Q&A
+        deployment, client, features = self._route_medical_qa(user_message)
         
-        # Add conversation history
-        for msg in conversation_history:
-            messages.append({"role": msg.role, "content": msg.content})
+        if not settings.OUTPUT_BUDGET_ENABLED:
+            return await self.chat_completion(
+                messages,
+                deployment,
+                settings.MEDICAL_QA_TEMPERATURE,
+                settings.MEDICAL_QA_MAX_TOKENS,
+                client
+            )
         
-        # Add current user message
-        messages.append({"role": "user", "content": user_message})
+        # Start from the question type's budget and escalate while the answer is cut off
+        question_type = self.output_budget.question_type(user_message, features)
+        max_tokens = self.output_budget.initial_budget(question_type)
+        escalations = 0
         
-        # Use GPT-4o with configured parameters for medical Q&A
-        return await self.chat_completion(
+        result = await self.complete(messages, deployment, settings.MEDICAL_QA_TEMPERATURE, max_tokens, client)
+        hit_limit = bool(result and result.finish_reason == "length")
+        
+        while result and result.finish_reason == "length":
+            next_budget = self.output_budget.escalate(max_tokens, escalations)
+            if next_budget is None:
+                break
+            
+            logger.info(
+                "Medical Q&A answer hit max_tokens, retrying with a larger budget",
+                question_type=question_type,
+                deployment=deployment,
+                max_tokens=max_tokens,
+                next_max_tokens=next_budget
+            )
+            escalations += 1
+            max_tokens = next_budget
+            result = await self.complete(messages, deployment, settings.MEDICAL_QA_TEMPERATURE, max_tokens, client)
+        
+        truncated = bool(result and result.finish_reason == "length")
+        self.output_budget.record(question_type, hit_limit, escalations, truncated)
+        if truncated:
+            logger.warning(
+                "Medical Q&A answer truncated at the maximum budget",
+                question_type=question_type,
+                deployment=deployment,
+                max_tokens=max_tokens
+            )
+        
+        return result.content if result else None
+    
+    def medical_qa_chat_stream(
+        self, 
+        system_prompt: str, 
+        conversation_history: List[ChatMessage], 
+        user_message: str
+    ) -> AsyncIterator[str]:
+        """
+        Handle medical Q&A conversation, streaming the answer.
+        
+        Args:
+            system_prompt: System prompt with user context
+            conversation_history: Previous conversation messages
+            user_message: Current user message
+        
+        Returns:
+            Async iterator of assistant content deltas
+        """
+        
+        messages = self._build_messages(
+            system_prompt,
+            conversation_history,
+            user_message,
+            settings.MEDICAL_QA_PROMPT_TOKEN_BUDGET,
+            phase="medical_qa"
+        )
+        
+        deployment, client, features = self._route_medical_qa(user_message)
+        
+        if not settings.OUTPUT_BUDGET_ENABLED:
+            return self.stream_chat_completion(
+                messages,
+                deployment,
+                settings.MEDICAL_QA_TEMPERATURE,
+                settings.MEDICAL_QA_MAX_TOKENS,
+                client
+            )
+        
+        # Streamed content is already sent, so truncation is recorded but not retried
+        question_type = self.output_budget.question_type(user_message, features)
+        max_tokens = self.output_budget.initial_budget(question_type)
+        
+        def on_finish(finish_reason: Optional[str]):
+            truncated = finish_reason == "length"
+            self.output_budget.record(question_type, truncated, 0, truncated)
+            if truncated:
+                logger.warning(
+                    "Streamed medical Q&A answer hit max_tokens",
+                    question_type=question_type,
+                    deployment=deployment,
+                    max_tokens=max_tokens
+                )
+        
+        return self.stream_chat_completion(
             messages,
-            settings.GPT_4O_DEPLOYMENT_NAME,
+            deployment,
             settings.MEDICAL_QA_TEMPERATURE,
-            settings.MEDICAL_QA_MAX_TOKENS,
-            self.gpt4o_client
+            max_tokens,
+            client,
+            on_finish=on_finish
         )
     
+    def single_flight_stats(self) -> Dict[str, Any]:
+        """Get single-flight coalescing counters."""
+        total = self.upstream_requests + self.coalesced_requests
+        return {
+            "enabled": settings.SINGLE_FLIGHT_ENABLED,
+            "in_flight": len(self._in_flight),
+            "upstream_requests": self.upstream_requests,
+            "coalesced_requests": self.coalesced_requests,
+            "coalesced_ratio": round(self.coalesced_requests / total, 4) if total else 0.0
+        }
+    
+    def usage_stats(self) -> Dict[str, Any]:
+        """Get token, latency and cost totals per phase, HMO, tier and deployment."""
+        return self.usage_tracker.stats()
+    
+    def prompt_cache_report(self) -> Dict[str, Any]:
+        """Get upstream prompt-cache hit rate and cached tokens per deployment."""
+        return self.prompt_cache_stats.stats()
+    
+    def output_budget_stats(self) -> Dict[str, Any]:
+        """Get medical Q&A output budgets and truncation counters."""
+        return self.output_budget.stats()
+    
+    def routing_stats(self) -> Dict[str, Any]:
+        """Get medical Q&A model routing counters."""
+        return self.model_router.stats()
+    
+    def circuit_breaker_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker state per deployment."""
+        return {deployment: breaker.stats() for deployment, breaker in self.circuit_breakers.items()}
+    
+    def scheduler_stats(self) -> Dict[str, Any]:
+        """Get TPM/RPM scheduler usage per deployment."""
+        return {deployment: scheduler.stats() for deployment, scheduler in self.schedulers.items()}
+    
     def parse_user_info_response(self, response: str) -> Dict[str, Any]:
         """
         Parse user information collection response.
         
         Args:
             response: Raw response from Azure OpenAI
-            
+        
         Returns:
             Parsed response dictionary
         """
@@ -184,7 +778,7 @@ class AzureOpenAIService:
                 parsed["status"] = "collecting"
             
             return parsed
-            
+        
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON response: {e}")
             return {
@@ -0,0 +1,217 @@
+"""
+Benefits Catalog
+
+Deterministic benefit lookups served straight from the preprocessed service
+JSONs (through the service search index), with no LLM call. Used by the
+/benefits endpoints and as a fast path for the medical Q&A phase.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+from utils.search import ServiceIndex, ServiceDocument, service_index
+
+HMO_ALIASES = {
+    "מכבי": "מכבי", "maccabi": "מכבי",
+    "מאוחדת": "מאוחדת", "meuhedet": "מאוחדת",
+    "כללית": "כללית", "clalit": "כללית"
+}
+
+TIER_ALIASES = {
+    "זהב": "זהב", "gold": "זהב",
+    "כסף": "כסף", "silver": "כסף",
+    "ארד": "ארד", "bronze": "ארד"
+}
+
+NOT_AVAILABLE = {
+    "he": "לא זמין",
+    "en": "Not available"
+}
+
+BENEFIT_ANSWER_TEMPLATES = {
+    "he": (
+        "בהתאם לרמת החברות שלך ({membership_tier}) ב{hmo_name}, עבור {service_name} ({category_title}): {benefits}.\n"
+        "לתיאום תור: {phone}\n"
+        "מידע נוסף: {website}\n"
+        "זהו מידע כללי, מומלץ לוודא את הפרטים מול הקופה."
+    ),
+    "en": (
+        "With your {membership_tier} membership at {hmo_name}, for {service_name} ({category_title}): {benefits}.\n"
+        "To book an appointment: {phone}\n"
+        "More information: {website}\n"
+        "This is general information; please verify the details with your HMO."
+    )
+}
+
+PHONE_ANSWER_TEMPLATES = {
+    "he": "לתיאום תור ב{category_title} ב{hmo_name}: {phone}\nמידע נוסף: {website}",
+    "en": "To book {category_title} services at {hmo_name}: {phone}\nMore information: {website}"
+}
+
+CATEGORY_ANSWER_TEMPLATES = {
+    "he": (
+        "השירותים ב{category_title} עבור {hmo_name} ברמת {membership_tier}:\n{services}\n"
+        "לתיאום תור: {phone}\n"
+        "זהו מידע כללי, מומלץ לוודא את הפרטים מול הקופה."
+    ),
+    "en": (
+        "{category_title} services for {hmo_name} {membership_tier} members:\n{services}\n"
+        "To book an appointment: {phone}\n"
+        "This is general information; please verify the details with your HMO."
+    )
+}
+
+@dataclass
+class BenefitInfo:
+    """A service's benefit for one HMO and membership tier."""
+    category_key: str
+    category_title: str
+    service_name: str
+    hmo_name: str
+    membership_tier: str
+    benefits: Optional[str]
+    phone: Optional[str]
+    website: Optional[str]
+    score: Optional[float] = None
+
+def normalize_hmo(hmo_name: str) -> Optional[str]:
+    """Map a Hebrew or English HMO name to its Hebrew form, or None if unknown."""
+    return HMO_ALIASES.get(hmo_name.strip().lower()) if hmo_name else None
+
+def normalize_tier(membership_tier: str) -> Optional[str]:
+    """Map a Hebrew or English membership tier to its Hebrew form, or None if unknown."""
+    return TIER_ALIASES.get(membership_tier.strip().lower()) if membership_tier else None
+
+class BenefitsCatalog:
+    """Structured benefit lookups over the service search index."""
+    
+    def __init__(self, index: ServiceIndex):
+        self.index = index
+    
+    def _service_documents(self) -> List[ServiceDocument]:
+        if not self.index.loaded:
+            self.index.load(self.index.jsons_folder or "preprocessing/jsons")
+        return [document for document in self.index.documents if document.service_name is not None]
+    
+    def categories(self) -> List[Dict[str, Any]]:
+        """List categories with their services."""
+        self._service_documents()
+        return [
+            {"key": key, "title": category["title"], "services": category["services"]}
+            for key, category in self.index.categories.items()
+        ]
+    
+    def resolve_category(self, category: str) -> Optional[str]:
+        """Resolve a category key or title to its key."""
+        self._service_documents()
+        category = category.strip()
+        for key, data in self.index.categories.items():
+            if category in (key, data["title"]):
+                return key
+        return None
+    
+    @staticmethod
+    def _to_benefit(document: ServiceDocument, hmo_name: str, membership_tier: str, score: Optional[float] = None) -> BenefitInfo:
+        return BenefitInfo(
+            category_key=document.category_key,
+            category_title=document.category_title,
+            service_name=document.service_name,
+            hmo_name=hmo_name,
+            membership_tier=membership_tier,
+            benefits=document.benefits.get(hmo_name, {}).get(membership_tier),
+            phone=document.phone_numbers.get(hmo_name),
+            website=document.websites.get(hmo_name),
+            score=score
+        )
+    
+    def lookup(
+        self,
+        hmo_name: str,
+        membership_tier: str,
+        category_key: Optional[str] = None,
+        service_name: Optional[str] = None,
+        query: Optional[str] = None,
+        limit: int = 3
+    ) -> List[BenefitInfo]:
+        """
+        Look up benefits for an HMO and tier.
+        
+        An exact service name is matched first; otherwise the service name or
+        free-text query is resolved through the search index.
+        
+        Args:
+            hmo_name: Hebrew HMO name
+            membership_tier: Hebrew membership tier
+            category_key: Restrict results to this category (optional)
+            service_name: Exact or approximate service name (optional)
+            query: Free-text query (optional)
+            limit: Maximum number of results for index lookups
+        
+        Returns:
+            Matching benefits, best first
+        """
+        
+        documents = self._service_documents()
+        
+        if service_name:
+            for document in documents:
+                if document.service_name == service_name.strip() and category_key in (None, document.category_key):
+                    return [self._to_benefit(document, hmo_name, membership_tier)]
+        
+        text = query or service_name
+        if not text:
+            # Whole category listing
+            return [
+                self._to_benefit(document, hmo_name, membership_tier)
+                for document in documents if category_key and document.category_key == category_key
+            ]
+        
+        hits = self.index.search(text, limit=len(documents))
+        results = [
+            self._to_benefit(hit.document, hmo_name, membership_tier, hit.score)
+            for hit in hits if category_key in (None, hit.document.category_key)
+        ]
+        return results[:limit]
+    
+    @staticmethod
+    def format_answer(benefit: BenefitInfo, language: str = "he") -> str:
+        """Render a benefit as a user-facing answer (used by the Q&A fast path)."""
+        template = BENEFIT_ANSWER_TEMPLATES.get(language, BENEFIT_ANSWER_TEMPLATES["he"])
+        not_available = NOT_AVAILABLE.get(language, NOT_AVAILABLE["he"])
+        return template.format(
+            membership_tier=benefit.membership_tier,
+            hmo_name=benefit.hmo_name,
+            service_name=benefit.service_name,
+            category_title=benefit.category_title,
+            benefits=benefit.benefits or not_available,
+            phone=benefit.phone or not_available,
+            website=benefit.website or not_available
+        )
+    
+    @staticmethod
+    def format_phone_answer(benefit: BenefitInfo, language: str = "he") -> str:
+        """Render a category's booking phone number and website as an answer."""
+        template = PHONE_ANSWER_TEMPLATES.get(language, PHONE_ANSWER_TEMPLATES["he"])
+        not_available = NOT_AVAILABLE.get(language, NOT_AVAILABLE["he"])
+        return template.format(
+            category_title=benefit.category_title,
+            hmo_name=benefit.hmo_name,
+            phone=benefit.phone or not_available,
+            website=benefit.website or not_available
+        )
+    
+    @staticmethod
+    def format_category_answer(benefits: List[BenefitInfo], language: str = "he") -> str:
+        """Render every service of a category with its benefit as an answer."""
+        template = CATEGORY_ANSWER_TEMPLATES.get(language, CATEGORY_ANSWER_TEMPLATES["he"])
+        not_available = NOT_AVAILABLE.get(language, NOT_AVAILABLE["he"])
+        first = benefits[0]
+        return template.format(
+            category_title=first.category_title,
+            hmo_name=first.hmo_name,
+            membership_tier=first.membership_tier,
+            services="\n".join(f"- {benefit.service_name}: {benefit.benefits or not_available}" for benefit in benefits),
+            phone=first.phone or not_available
+        )
+
+# Global catalog over the shared service index
+benefits_catalog = BenefitsCatalog(service_index)
@@ -0,0 +1,316 @@
+"""
+Fast-Path Intent Classifier
+
+Local rule-based classifier that recognises high-confidence structured
+questions (phone numbers, a single service's benefit, the services of a
+category) and answers them from the benefits catalog without an LLM call.
+The catalog data is Hebrew, so only Hebrew questions are answered locally.
+Anything ambiguous is left to GPT-4o.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Set, Any, Optional
+from backend.services.benefits_catalog import BenefitsCatalog, benefits_catalog, HMO_ALIASES, TIER_ALIASES
+from utils.search import normalize_text, query_terms, index_terms
+from utils.search.hebrew import HEBREW_PREFIXES, MAX_PREFIX_LETTERS
+
+PHONE_INTENT = "phone"
+SERVICE_BENEFIT_INTENT = "service_benefit"
+CATEGORY_SERVICES_INTENT = "category_services"
+
+# Languages answered from templates (the catalog's benefit texts are Hebrew)
+FAST_PATH_LANGUAGES = ("he",)
+
+# Longer questions usually carry nuance the templates cannot answer
+MAX_QUESTION_WORDS = 14
+
+# A service or category must score at least this much, and beat the runner-up by this ratio
+MIN_MATCH_SCORE = 4.0
+MIN_SCORE_RATIO = 2.0
+
+# Category title words too generic to name a category on their own
+GENERIC_TITLE_WORDS = ["מרפאות", "בריאות", "רפואה", "שירותים"]
+
+PHONE_CUES = [
+    "טלפון", "להתקשר", "מתקשרים", "לתאם תור", "לקבוע תור", "מוקד",
+    "phone", "call", "contact number", "how do i contact", "book an appointment"
+]
+
+BENEFIT_CUES = [
+    "כמה", "הנחה", "מגיע", "זכאי", "מחיר", "עולה", "עלות", "כיסוי", "החזר", "הטבה", "הטבות", "השתתפות", "כלול",
+    "how much", "how many", "discount", "cost", "price", "covered", "coverage", "entitled", "benefit",
+    "what do i get", "include"
+]
+
+CATEGORY_CUES = [
+    "אילו שירותים", "איזה שירותים", "אילו טיפולים", "איזה טיפולים", "מה כולל", "מה יש ב",
+    "which services", "what services", "which treatments", "what treatments"
+]
+
+# Comparisons and personal medical questions always go to the LLM
+LLM_ONLY_CUES = [
+    "השווה", "השוואה", "לעומת", "הבדל", "עדיף", "כדאי", "מומלץ", "כואב", "כאב", "תסמין",
+    "compare", "comparison", "versus", " vs", "difference", "better", "should i", "recommend", "pain", "symptom"
+]
+
+# Questions about someone else's coverage go to the LLM: the templates answer for the user's own plan
+THIRD_PARTY_CUES = [
+    "for someone else", "my wife", "my husband", "my partner", "my spouse", "my son", "my daughter",
+    "my child", "my kid", "my baby", "my mother", "my mom", "my father", "my dad", "my parent",
+    "my brother", "my sister", "my grand"
+]
+
+# Hebrew possessive forms ("לאשתי"), and family nouns followed by "שלי" ("לבן שלי", "בת הזוג שלי")
+THIRD_PARTY_WORDS = ["אשתי", "בעלי", "ילדיי", "הוריי"]
+FAMILY_NOUNS = [
+    "בן", "בת", "ילד", "ילדה", "ילדים", "תינוק", "תינוקת", "אמא", "אבא", "הורים",
+    "זוג", "אח", "אחות", "סבא", "סבתא", "נכד", "נכדה"
+]
+
+# Qualifiers (an age, a condition, "after ...", "for ...") narrow the question beyond the plan's general
+# benefit, so they go to the LLM unless they are part of the matched service or category name
+QUALIFIER_WORDS = [
+    "ילד", "ילדה", "ילדים", "תינוק", "תינוקות", "נוער", "מבוגרים", "קשישים", "גיל", "גילאי",
+    "אחרי", "לאחר", "עבור", "במקרה", "ניתוח", "מחלה", "מחלת", "כרוני", "כרונית", "נכות", "נכה",
+    "פציעה", "תאונה", "הריון", "סוכרת",
+    "child", "children", "kid", "kids", "baby", "babies", "teen", "teenager", "elderly", "senior", "seniors",
+    "age", "aged", "old", "after", "following", "surgery", "operation", "condition", "chronic", "disability",
+    "injury", "accident", "pregnant", "pregnancy", "diabetes", "diabetic"
+]
+
+def _normalized_cues(cues: List[str]) -> List[str]:
+    return [normalize_text(cue) for cue in cues]
+
+_PHONE_CUES = _normalized_cues(PHONE_CUES)
+_BENEFIT_CUES = _normalized_cues(BENEFIT_CUES)
+_CATEGORY_CUES = _normalized_cues(CATEGORY_CUES)
+_LLM_ONLY_CUES = _normalized_cues(LLM_ONLY_CUES)
+_THIRD_PARTY_CUES = _normalized_cues(THIRD_PARTY_CUES)
+_THIRD_PARTY_WORDS = set(_normalized_cues(THIRD_PARTY_WORDS))
+_FAMILY_NOUNS = set(_normalized_cues(FAMILY_NOUNS))
+_QUALIFIER_WORDS = set(_normalized_cues(QUALIFIER_WORDS))
+
+@dataclass
+class IntentMatch:
+    """A recognised structured intent."""
+    intent: str
+    category_key: str
+    service_name: Optional[str] = None
+    score: float = 0.0
+    answer: Optional[str] = None
+
+def _has_cue(text: str, cues: List[str]) -> bool:
+    return any(cue in text for cue in cues)
+
+def _strip_prefixes(word: str) -> Set[str]:
+    """The word with up to MAX_PREFIX_LETTERS leading prefix letters removed, including short words."""
+    forms = {word}
+    for length in range(1, MAX_PREFIX_LETTERS + 1):
+        if len(word) - length < 2 or word[length - 1] not in HEBREW_PREFIXES:
+            break
+        forms.add(word[length:])
+    return forms
+
+def _mentions_third_party(text: str) -> bool:
+    """Check whether a normalized question asks about a family member rather than the user."""
+    if _has_cue(text, _THIRD_PARTY_CUES):
+        return True
+    words = re.findall(r'\w+', text)
+    for index, word in enumerate(words):
+        forms = _strip_prefixes(word)
+        if forms & _THIRD_PARTY_WORDS:
+            return True
+        if index + 1 < len(words) and words[index + 1] == "שלי" and forms & _FAMILY_NOUNS:
+            return True
+    return False
+
+def _qualifiers(text: str) -> List[Set[str]]:
+    """The prefix-stripped forms of every qualifier word (or number, e.g. an age) in a normalized question."""
+    qualifiers = []
+    for word in re.findall(r'\w+', text):
+        forms = _strip_prefixes(word)
+        if word.isdigit() or forms & _QUALIFIER_WORDS:
+            qualifiers.append(forms)
+    return qualifiers
+
+def _has_uncovered_qualifier(qualifiers: List[Set[str]], name: str) -> bool:
+    """Check for a qualifier that is not part of the matched service or category name."""
+    covered = set(index_terms(name))
+    return any(not forms & covered for forms in qualifiers)
+
+def _is_confident(scores: List[float]) -> bool:
+    """Check that the best score is high and clearly ahead of the runner-up."""
+    if not scores or scores[0] < MIN_MATCH_SCORE:
+        return False
+    return len(scores) == 1 or scores[0] >= scores[1] * MIN_SCORE_RATIO
+
+class FastPathStats:
+    """Counters for fast-path answers and the LLM latency they avoid."""
+    
+    def __init__(self):
+        self.checked = 0
+        self.hits = 0
+        self.hits_by_intent: Dict[str, int] = {}
+        self.total_fast_path_ms = 0.0
+        self.llm_answers = 0
+        self.total_llm_ms = 0.0
+    
+    def record_hit(self, intent: str, elapsed_ms: float):
+        self.checked += 1
+        self.hits += 1
+        self.hits_by_intent[intent] = self.hits_by_intent.get(intent, 0) + 1
+        self.total_fast_path_ms += elapsed_ms
+    
+    def record_miss(self):
+        self.checked += 1
+    
+    def record_llm_latency(self, elapsed_ms: float):
+        """Record how long an LLM-answered question took, to estimate savings."""
+        self.llm_answers += 1
+        self.total_llm_ms += elapsed_ms
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit rate and estimated latency savings."""
+        avg_llm_ms = self.total_llm_ms / self.llm_answers if self.llm_answers else 0.0
+        avg_fast_path_ms = self.total_fast_path_ms / self.hits if self.hits else 0.0
+        return {
+            "checked": self.checked,
+            "hits": self.hits,
+            "hit_ratio": round(self.hits / self.checked, 4) if self.checked else 0.0,
+            "hits_by_intent": dict(self.hits_by_intent),
+            "avg_fast_path_ms": round(avg_fast_path_ms, 3),
+            "avg_llm_ms": round(avg_llm_ms, 2),
+            "estimated_saved_ms": round(self.hits * max(avg_llm_ms - avg_fast_path_ms, 0.0), 2)
+        }
+
+class IntentClassifier:
+    """Rule-based classifier over the benefits catalog."""
+    
+    def __init__(self, catalog: BenefitsCatalog):
+        self.catalog = catalog
+        self.fast_path_stats = FastPathStats()
+        self._category_words: Dict[str, Set[str]] = {}
+        self._category_words_source = None
+    
+    def _distinctive_category_words(self) -> Dict[str, Set[str]]:
+        """Title words that name exactly one category, rebuilt when the index is reloaded."""
+        categories = self.catalog.index.categories
+        if self._category_words_source is not categories:
+            generic = set(index_terms(" ".join(GENERIC_TITLE_WORDS)))
+            words = {key: set(index_terms(data["title"])) - generic for key, data in categories.items()}
+            self._category_words = {
+                key: {word for word in title_words if all(word not in other for other_key, other in words.items() if other_key != key)}
+                for key, title_words in words.items()
+            }
+            self._category_words_source = categories
+        return self._category_words
+    
+    def _named_category(self, variants: Set[str]) -> Optional[str]:
+        """Return the category key when the question's word variants name exactly one category."""
+        named = [key for key, words in self._distinctive_category_words().items() if words & variants]
+        return named[0] if len(named) == 1 else None
+    
+    def _mentions_other_plan(self, variants: Set[str], hmo_name: str, membership_tier: str) -> bool:
+        """
+        Questions about another HMO or tier need the LLM (the user's context is per plan).
+        
+        Aliases are matched against the prefix-stripped word variants, so
+        "במאוחדת", "לכללית" and "בכסף" are recognised.
+        """
+        for alias, hmo in HMO_ALIASES.items():
+            if hmo != hmo_name and normalize_text(alias) in variants:
+                return True
+        for alias, tier in TIER_ALIASES.items():
+            if tier != membership_tier and normalize_text(alias) in variants:
+                return True
+        return False
+    
+    def classify(self, message: str, hmo_name: str, membership_tier: str) -> Optional[IntentMatch]:
+        """
+        Classify a question into a structured intent.
+        
+        Args:
+            message: User question
+            hmo_name: User's HMO (Hebrew)
+            membership_tier: User's membership tier (Hebrew)
+        
+        Returns:
+            IntentMatch when the question can be answered from templates, otherwise None
+        """
+        
+        text = normalize_text(message)
+        if len(text.split()) > MAX_QUESTION_WORDS or _has_cue(text, _LLM_ONLY_CUES) or _mentions_third_party(text):
+            return None
+        variants = set().union(*query_terms(message)) if message else set()
+        if self._mentions_other_plan(variants, hmo_name, membership_tier):
+            return None
+        qualifiers = _qualifiers(text)
+        
+        service_hits = self.catalog.index.search(message, limit=2)
+        service_confident = _is_confident([hit.score for hit in service_hits])
+        named_category = self._named_category(variants)
+        
+        if _has_cue(text, _CATEGORY_CUES) and named_category:
+            if _has_uncovered_qualifier(qualifiers, self.catalog.index.categories[named_category]["title"]):
+                return None
+            return IntentMatch(CATEGORY_SERVICES_INTENT, named_category)
+        
+        if _has_cue(text, _PHONE_CUES):
+            if named_category:
+                return IntentMatch(PHONE_INTENT, named_category)
+            # Phone numbers are per category, so the top services only need to agree on it
+            same_category = len({hit.document.category_key for hit in service_hits}) == 1
+            if service_hits and service_hits[0].score >= MIN_MATCH_SCORE and (service_confident or same_category):
+                return IntentMatch(PHONE_INTENT, service_hits[0].document.category_key, score=service_hits[0].score)
+            return None
+        
+        if _has_cue(text, _BENEFIT_CUES) and service_confident:
+            document = service_hits[0].document
+            if _has_uncovered_qualifier(qualifiers, f"{document.service_name} {document.category_title}"):
+                return None
+            return IntentMatch(SERVICE_BENEFIT_INTENT, document.category_key, document.service_name, service_hits[0].score)
+        
+        return None
+    
+    def answer(self, match: IntentMatch, hmo_name: str, membership_tier: str, language: str) -> Optional[str]:
+        """Render the templated answer for a recognised intent."""
+        if match.intent == SERVICE_BENEFIT_INTENT:
+            results = self.catalog.lookup(hmo_name, membership_tier, match.category_key, service_name=match.service_name)
+            return self.catalog.format_answer(results[0], language) if results else None
+        
+        results = self.catalog.lookup(hmo_name, membership_tier, match.category_key)
+        if not results:
+            return None
+        if match.intent == PHONE_INTENT:
+            return self.catalog.format_phone_answer(results[0], language)
+        return self.catalog.format_category_answer(results, language)
+    
+    def try_fast_path(self, message: str, hmo_name: str, membership_tier: str, language: str) -> Optional[IntentMatch]:
+        """
+        Classify and answer a question locally when possible.
+        
+        Returns:
+            IntentMatch with the answer set, or None when the LLM should answer
+        """
+        
+        # Hebrew catalog values would otherwise be filled into the English templates
+        if language not in FAST_PATH_LANGUAGES:
+            self.fast_path_stats.record_miss()
+            return None
+        
+        start = time.perf_counter()
+        match = self.classify(message, hmo_name, membership_tier)
+        answer = self.answer(match, hmo_name, membership_tier, language) if match else None
+        
+        if not answer:
+            self.fast_path_stats.record_miss()
+            return None
+        
+        match.answer = answer
+        self.fast_path_stats.record_hit(match.intent, (time.perf_counter() - start) * 1000)
+        return match
+
+# Global classifier over the shared benefits catalog
+intent_classifier = IntentClassifier(benefits_catalog)
@@ -0,0 +1,152 @@
+"""
+Medical Q&A Model Router
+
+Chooses the deployment for each medical Q&A request: simple single-service
+lookups go to GPT-4o Mini, while comparisons, multi-service questions and long
+questions stay on GPT-4o. The choice is driven by cheap local features of the
+question and a configurable policy.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Dict, Set, Any
+from backend.services.benefits_catalog import HMO_ALIASES, TIER_ALIASES
+from utils.search import service_index, normalize_text
+from utils.search.hebrew import word_variants
+
+AUTO_POLICY = "auto"
+GPT4O_POLICY = "gpt-4o"
+GPT4O_MINI_POLICY = "gpt-4o-mini"
+ROUTING_POLICIES = (AUTO_POLICY, GPT4O_POLICY, GPT4O_MINI_POLICY)
+
+# A service or category counts as mentioned when it scores this much, and at least this share of the best
+MENTION_MIN_SCORE = 4.0
+MENTION_RELATIVE_SCORE = 0.6
+
+# Comparison cues are matched as whole words (or word sequences), with Hebrew prefixes stripped
+COMPARISON_CUES = [
+    "השווה", "השוואה", "לעומת", "הבדל", "עדיף", "כדאי", "יותר", "פחות", "מול",
+    "compare", "comparison", "versus", "vs", "difference", "better", "cheaper", "more than", "less than", "which is"
+]
+
+_COMPARISON_WORDS = {normalize_text(cue) for cue in COMPARISON_CUES if " " not in cue}
+_COMPARISON_PHRASES = [f" {normalize_text(cue)} " for cue in COMPARISON_CUES if " " in cue]
+_HMO_ALIASES = {normalize_text(alias): hmo for alias, hmo in HMO_ALIASES.items()}
+_TIER_ALIASES = {normalize_text(alias): tier for alias, tier in TIER_ALIASES.items()}
+
+@dataclass
+class QuestionFeatures:
+    """Complexity features of a medical question."""
+    word_count: int
+    services_mentioned: int
+    services_named: int  # Services scoring MENTION_MIN_SCORE, without the relative cutoff
+    categories_mentioned: int
+    plans_mentioned: int  # Distinct HMOs or tiers named (prefixes stripped), whichever is more
+    comparison: bool  # A comparison cue, whatever is compared
+    
+    @property
+    def compares(self) -> bool:
+        """A comparison cue with at least two services, categories or plans to compare."""
+        return self.comparison and max(self.services_named, self.categories_mentioned, self.plans_mentioned) > 1
+
+@dataclass
+class RoutingDecision:
+    """The deployment chosen for a request and why."""
+    model: str
+    reason: str
+    features: QuestionFeatures
+
+def _mentioned(scores: List[float]) -> int:
+    if not scores:
+        return 0
+    cutoff = max(MENTION_MIN_SCORE, max(scores) * MENTION_RELATIVE_SCORE)
+    return sum(1 for score in scores if score >= cutoff)
+
+def _has_comparison_cue(words: List[str], variants: List[Set[str]]) -> bool:
+    if any(word_forms & _COMPARISON_WORDS for word_forms in variants):
+        return True
+    joined = f" {' '.join(words)} "
+    return any(phrase in joined for phrase in _COMPARISON_PHRASES)
+
+def extract_features(question: str) -> QuestionFeatures:
+    """
+    Extract complexity features from a question.
+    
+    Args:
+        question: User question
+    
+    Returns:
+        QuestionFeatures for the routing policy
+    """
+    
+    text = normalize_text(question)
+    words = re.findall(r'\w+', text)
+    variants = [word_variants(word) for word in words]
+    hits = service_index.search(question, limit=5)
+    category_scores = service_index.category_scores([(question, 1.0)])
+    
+    return QuestionFeatures(
+        word_count=len(words),
+        services_mentioned=_mentioned([hit.score for hit in hits]),
+        services_named=sum(1 for hit in hits if hit.score >= MENTION_MIN_SCORE),
+        categories_mentioned=_mentioned(list(category_scores.values())),
+        plans_mentioned=max(
+            len({_HMO_ALIASES[form] for word_forms in variants for form in word_forms if form in _HMO_ALIASES}),
+            len({_TIER_ALIASES[form] for word_forms in variants for form in word_forms if form in _TIER_ALIASES})
+        ),
+        comparison=_has_comparison_cue(words, variants)
+    )
+
+class ModelRouter:
+    """Routes medical Q&A requests between GPT-4o and GPT-4o Mini."""
+    
+    def __init__(self, policy: str = AUTO_POLICY, mini_max_words: int = 20):
+        self.policy = policy if policy in ROUTING_POLICIES else AUTO_POLICY
+        self.mini_max_words = mini_max_words
+        self.decisions: Dict[str, int] = {GPT4O_POLICY: 0, GPT4O_MINI_POLICY: 0}
+        self.reasons: Dict[str, int] = {}
+    
+    def _auto_route(self, features: QuestionFeatures) -> RoutingDecision:
+        # A comparison needs two things to compare; "is it better to book early?" stays on the mini model
+        if features.compares:
+            return RoutingDecision(GPT4O_POLICY, "comparison", features)
+        if features.services_mentioned > 1:
+            return RoutingDecision(GPT4O_POLICY, "multiple_services", features)
+        if features.categories_mentioned > 1:
+            return RoutingDecision(GPT4O_POLICY, "multiple_categories", features)
+        if features.plans_mentioned > 1:
+            return RoutingDecision(GPT4O_POLICY, "multiple_plans", features)
+        if features.word_count > self.mini_max_words:
+            return RoutingDecision(GPT4O_POLICY, "long_question", features)
+        return RoutingDecision(GPT4O_MINI_POLICY, "simple_question", features)
+    
+    def route(self, question: str) -> RoutingDecision:
+        """
+        Choose the model for a medical question.
+        
+        Args:
+            question: User question
+        
+        Returns:
+            RoutingDecision with the chosen model ('gpt-4o' or 'gpt-4o-mini')
+        """
+        
+        features = extract_features(question)
+        if self.policy == AUTO_POLICY:
+            decision = self._auto_route(features)
+        else:
+            decision = RoutingDecision(self.policy, "policy", features)
+        
+        self.decisions[decision.model] += 1
+        self.reasons[decision.reason] = self.reasons.get(decision.reason, 0) + 1
+        return decision
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get routing decision counters."""
+        total = sum(self.decisions.values())
+        return {
+            "policy": self.policy,
+            "decisions": dict(self.decisions),
+            "mini_ratio": round(self.decisions[GPT4O_MINI_POLICY] / total, 4) if total else 0.0,
+            "reasons": dict(self.reasons)
+        }
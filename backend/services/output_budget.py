@@ -0,0 +1,84 @@
+"""
+Medical Q&A Output Budget
+
+Chooses max_tokens per request from the question type instead of a fixed
+MEDICAL_QA_MAX_TOKENS, so short lookups reserve a small share of the
+deployment's TPM quota. Answers cut off at the budget are retried with a
+doubled budget, up to MEDICAL_QA_MAX_TOKENS.
+"""
+
+from typing import Dict, Any, Optional
+from backend.services.model_router import QuestionFeatures
+from utils.search import normalize_text
+
+LOOKUP = "lookup"
+EXPLANATION = "explanation"
+COMPARISON = "comparison"
+
+ESCALATION_FACTOR = 2
+
+EXPLANATION_CUES = [
+    "הסבר", "להסביר", "למה", "מדוע", "איך", "כיצד", "ספר לי", "פרט", "פירוט", "תהליך",
+    "explain", "why", "how does", "how do", "how can", "describe", "tell me about", "details", "process"
+]
+
+_EXPLANATION_CUES = [normalize_text(cue) for cue in EXPLANATION_CUES]
+
+class OutputBudgetPolicy:
+    """Per-question-type max_tokens with escalation on truncated answers."""
+    
+    def __init__(self, budgets: Dict[str, int], max_tokens: int, max_escalations: int):
+        self.budgets = budgets
+        self.max_tokens = max_tokens
+        self.max_escalations = max_escalations
+        self.counters: Dict[str, Dict[str, int]] = {
+            question_type: {"requests": 0, "hit_limit": 0, "escalations": 0, "still_truncated": 0}
+            for question_type in budgets
+        }
+    
+    def question_type(self, question: str, features: QuestionFeatures) -> str:
+        """
+        Classify a question for budgeting.
+        
+        Args:
+            question: User question
+            features: Complexity features from the model router
+        
+        Returns:
+            'comparison', 'explanation' or 'lookup'
+        """
+        
+        if features.compares or features.plans_mentioned > 1:
+            return COMPARISON
+        text = normalize_text(question)
+        if features.services_mentioned > 1 or features.categories_mentioned > 1 or any(cue in text for cue in _EXPLANATION_CUES):
+            return EXPLANATION
+        return LOOKUP
+    
+    def initial_budget(self, question_type: str) -> int:
+        """Get the first-attempt max_tokens for a question type."""
+        return min(self.budgets.get(question_type, self.max_tokens), self.max_tokens)
+    
+    def escalate(self, budget: int, escalations: int) -> Optional[int]:
+        """Get the next max_tokens after a truncated answer, or None when no retry is left."""
+        if escalations >= self.max_escalations or budget >= self.max_tokens:
+            return None
+        return min(budget * ESCALATION_FACTOR, self.max_tokens)
+    
+    def record(self, question_type: str, hit_limit: bool, escalations: int, truncated: bool):
+        """Record the outcome of a budgeted request."""
+        counters = self.counters.setdefault(
+            question_type, {"requests": 0, "hit_limit": 0, "escalations": 0, "still_truncated": 0}
+        )
+        counters["requests"] += 1
+        counters["hit_limit"] += int(hit_limit)
+        counters["escalations"] += escalations
+        counters["still_truncated"] += int(truncated)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get budgets and truncation counters per question type."""
+        return {
+            "budgets": {question_type: self.initial_budget(question_type) for question_type in self.budgets},
+            "max_tokens": self.max_tokens,
+            "by_type": {question_type: dict(counters) for question_type, counters in self.counters.items()}
+        }
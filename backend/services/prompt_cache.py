@@ -0,0 +1,80 @@
+"""
+Prompt Cache Accounting
+
+Records usage.prompt_tokens_details.cached_tokens from every Azure OpenAI
+response, per deployment, to measure the upstream prompt-cache hit rate and
+the latency of cached versus uncached requests.
+"""
+
+from typing import Dict, Any, Optional
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Read cached_tokens from a response's usage (0 when the service does not report it)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+class DeploymentCacheStats:
+    """Cached-token counters for one deployment."""
+    
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.hit_latency_ms = 0.0
+        self.hit_latency_samples = 0
+        self.miss_latency_ms = 0.0
+        self.miss_latency_samples = 0
+    
+    def record(self, prompt_tokens: int, cached_tokens: int, latency_ms: Optional[float]):
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        if cached_tokens:
+            self.cache_hits += 1
+        
+        if latency_ms is None:
+            return
+        if cached_tokens:
+            self.hit_latency_ms += latency_ms
+            self.hit_latency_samples += 1
+        else:
+            self.miss_latency_ms += latency_ms
+            self.miss_latency_samples += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "hit_ratio": round(self.cache_hits / self.requests, 4) if self.requests else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_token_ratio": round(self.cached_tokens / self.prompt_tokens, 4) if self.prompt_tokens else 0.0,
+            "avg_hit_latency_ms": round(self.hit_latency_ms / self.hit_latency_samples, 2) if self.hit_latency_samples else None,
+            "avg_miss_latency_ms": round(self.miss_latency_ms / self.miss_latency_samples, 2) if self.miss_latency_samples else None
+        }
+
+class PromptCacheStats:
+    """Cached-token counters per deployment."""
+    
+    def __init__(self):
+        self.deployments: Dict[str, DeploymentCacheStats] = {}
+    
+    def record(self, model_deployment: str, usage: Any, latency_ms: Optional[float] = None):
+        """
+        Record a response's prompt and cached token counts.
+        
+        Args:
+            model_deployment: Azure deployment name
+            usage: Response usage object (ignored when None)
+            latency_ms: Request latency, for non-streamed requests
+        """
+        
+        if usage is None:
+            return
+        deployment_stats = self.deployments.setdefault(model_deployment, DeploymentCacheStats())
+        deployment_stats.record(getattr(usage, "prompt_tokens", 0) or 0, cached_prompt_tokens(usage), latency_ms)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit rate, cached token share and latency per deployment."""
+        return {deployment: stats.stats() for deployment, stats in self.deployments.items()}
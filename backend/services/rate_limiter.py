@@ -0,0 +1,177 @@
+"""
+Deployment Request Scheduler
+
+Paces Azure OpenAI calls against per-deployment tokens-per-minute (TPM) and
+requests-per-minute (RPM) quotas over a sliding window, queueing requests for a
+bounded time and shedding load when the queue is full.
+"""
+
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Deque, Tuple
+from backend.services.resilience import UpstreamUnavailableError
+
+class SchedulerOverloadedError(UpstreamUnavailableError):
+    """Raised when a request cannot be scheduled within the queue limits."""
+
+class DeploymentScheduler:
+    """
+    Sliding-window TPM/RPM scheduler for a single deployment.
+    
+    Each admitted request reserves its estimated token spend (prompt estimate
+    plus max_tokens, the same figure Azure uses for quota accounting) for one
+    window. Requests wait in FIFO order until the window has room; a request
+    that would wait longer than max_wait_seconds, or arrives while max_queue
+    requests are already waiting, is rejected immediately.
+    
+    Waiters queue behind each other with one event each; the head of the queue
+    is the only one checking the window, and whoever leaves the head position
+    (admitted, timed out or cancelled) wakes the next one.
+    """
+    
+    def __init__(
+        self,
+        deployment: str,
+        tpm_limit: int = 0,
+        rpm_limit: int = 0,
+        max_queue: int = 100,
+        max_wait_seconds: float = 10.0,
+        window_seconds: float = 60.0
+    ):
+        self.deployment = deployment
+        self.tpm_limit = tpm_limit
+        self.rpm_limit = rpm_limit
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.window_seconds = window_seconds
+        
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._waiters: Deque[asyncio.Event] = deque()
+        self.waiting = 0
+        
+        self.admitted_requests = 0
+        self.queued_requests = 0
+        self.shed_requests = 0
+        self.total_wait_seconds = 0.0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any quota is enforced for this deployment."""
+        return self.tpm_limit > 0 or self.rpm_limit > 0
+    
+    def _evict(self, now: float):
+        """Drop reservations that have left the sliding window."""
+        while self._window and now - self._window[0][0] >= self.window_seconds:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+    
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a reservation of `tokens` fits in the window (0 if it fits now)."""
+        wait = 0.0
+        
+        if self.rpm_limit > 0 and len(self._window) >= self.rpm_limit:
+            oldest = self._window[len(self._window) - self.rpm_limit][0]
+            wait = max(wait, oldest + self.window_seconds - now)
+        
+        if self.tpm_limit > 0 and self._window_tokens + tokens > self.tpm_limit:
+            # A single request above the limit is admitted once the window is empty
+            excess = self._window_tokens + min(tokens, self.tpm_limit) - self.tpm_limit
+            freed = 0
+            for timestamp, reserved in self._window:
+                freed += reserved
+                if freed >= excess:
+                    wait = max(wait, timestamp + self.window_seconds - now)
+                    break
+        
+        return wait
+    
+    def _reserve(self, tokens: int, now: float):
+        """Record a reservation in the sliding window."""
+        self._window.append((now, tokens))
+        self._window_tokens += tokens
+    
+    def _overloaded(self, reason: str) -> SchedulerOverloadedError:
+        self.shed_requests += 1
+        return SchedulerOverloadedError(self.deployment, reason)
+    
+    async def acquire(self, estimated_tokens: int):
+        """
+        Wait until the deployment has quota for a request, then reserve it.
+        
+        Args:
+            estimated_tokens: Estimated token spend of the request
+        
+        Raises:
+            SchedulerOverloadedError: If the queue is full or the wait would exceed max_wait_seconds
+        """
+        
+        if not self.enabled:
+            self.admitted_requests += 1
+            return
+        
+        # Fast path: nobody is queued and the window has room
+        if not self._waiters:
+            now = time.monotonic()
+            self._evict(now)
+            if self._wait_time(estimated_tokens, now) <= 0:
+                self._reserve(estimated_tokens, now)
+                self.admitted_requests += 1
+                return
+        
+        if self.waiting >= self.max_queue:
+            raise self._overloaded("queue_full")
+        
+        start = time.monotonic()
+        deadline = start + self.max_wait_seconds
+        turn = asyncio.Event()
+        self._waiters.append(turn)
+        if self._waiters[0] is turn:
+            turn.set()
+        self.waiting += 1
+        try:
+            # Waiters are admitted in arrival order; waiting on our own event leaves nothing held on timeout
+            try:
+                await asyncio.wait_for(turn.wait(), timeout=self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                raise self._overloaded("wait_timeout")
+            
+            while True:
+                now = time.monotonic()
+                self._evict(now)
+                wait = self._wait_time(estimated_tokens, now)
+                
+                if wait <= 0:
+                    self._reserve(estimated_tokens, now)
+                    break
+                
+                if now + wait > deadline:
+                    raise self._overloaded("wait_timeout")
+                
+                await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+            was_head = self._waiters[0] is turn
+            self._waiters.remove(turn)
+            if was_head and self._waiters:
+                self._waiters[0].set()
+        
+        self.admitted_requests += 1
+        self.queued_requests += 1
+        self.total_wait_seconds += time.monotonic() - start
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get current window usage and queue counters."""
+        self._evict(time.monotonic())
+        return {
+            "tpm_limit": self.tpm_limit,
+            "rpm_limit": self.rpm_limit,
+            "window_tokens": self._window_tokens,
+            "window_requests": len(self._window),
+            "waiting": self.waiting,
+            "admitted_requests": self.admitted_requests,
+            "queued_requests": self.queued_requests,
+            "shed_requests": self.shed_requests,
+            "avg_wait_ms": round(self.total_wait_seconds / self.admitted_requests * 1000, 2) if self.admitted_requests else 0.0
+        }
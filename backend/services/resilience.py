@@ -0,0 +1,155 @@
+"""
+Resilience primitives for Azure OpenAI calls.
+
+Circuit breaker, retry classification and jittered backoff honouring Retry-After.
+"""
+
+import time
+import random
+import asyncio
+from typing import Dict, Any, Optional, Tuple
+import openai
+
+class UpstreamUnavailableError(Exception):
+    """Raised when an upstream deployment cannot take the request right now."""
+    
+    def __init__(self, deployment: str, reason: str):
+        super().__init__(f"Deployment '{deployment}' unavailable: {reason}")
+        self.deployment = deployment
+        self.reason = reason
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised when a deployment's circuit breaker is open."""
+    
+    def __init__(self, deployment: str):
+        super().__init__(deployment, "circuit_open")
+
+class CircuitBreaker:
+    """
+    Per-deployment circuit breaker.
+    
+    Closed: requests flow normally; consecutive failures are counted.
+    Open: requests fail fast until the reset timeout has passed.
+    Half-open: a single probe request is let through; success closes the
+    circuit, failure opens it again. Only the call that took the probe slot
+    releases it, so calls admitted earlier cannot let a second probe through.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected_requests = 0
+        self._probe_in_flight = False
+    
+    def allow_request(self) -> Tuple[bool, bool]:
+        """
+        Check whether a request may be sent to the deployment.
+        
+        Returns:
+            Tuple of (allowed, probe); probe is True when this call took the
+            half-open probe slot and must call release_probe() when it ends
+        """
+        if self.state == self.CLOSED:
+            return True, False
+        
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.reset_timeout_seconds:
+                self.state = self.HALF_OPEN
+            else:
+                self.rejected_requests += 1
+                return False, False
+        
+        # Half-open: allow a single probe at a time
+        if self._probe_in_flight:
+            self.rejected_requests += 1
+            return False, False
+        
+        self._probe_in_flight = True
+        return True, True
+    
+    def record_success(self):
+        """Record a successful upstream call."""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        """Record a failed upstream call, opening the circuit past the threshold."""
+        self.consecutive_failures += 1
+        
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+    
+    def release_probe(self):
+        """Release the half-open probe slot (only by the call that took it)."""
+        self._probe_in_flight = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state for health reporting."""
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = max(self.reset_timeout_seconds - (time.monotonic() - self.opened_at), 0.0)
+        
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_requests": self.rejected_requests,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None
+        }
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether an upstream error is transient (429, 5xx, timeout, connection)."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    
+    return False
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the server-requested delay from a 429/503 response.
+    
+    Returns:
+        Delay in seconds, or None if the response carries no Retry-After hint
+    """
+    
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    headers = response.headers
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            return None
+    
+    return None
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt (0-based)."""
+    return random.uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
@@ -0,0 +1,208 @@
+"""
+Azure OpenAI Usage Tracker
+
+Accounts prompt, completion and cached tokens, upstream latency, retries and
+estimated cost for every Azure OpenAI call. Streams aborted before the final
+usage chunk (client disconnect, upstream error) are recorded with token counts
+estimated from the prompt and the content streamed so far. Calls that fail (retries exhausted, circuit breaker open, shed by the
+scheduler) are recorded too, with their latency, retry count and error class.
+Each call is logged with the
+request's phase, HMO and tier, added to the request context (so the API
+response log carries the request's totals) and aggregated in memory per
+(phase, HMO, tier, deployment).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from backend.services.prompt_cache import cached_prompt_tokens
+from utils.logging import logger, get_request_context
+from utils.logging.request_context import RequestContext
+
+UNKNOWN = "unknown"
+
+@dataclass
+class EstimatedUsage:
+    """Locally estimated token counts, for streams aborted before the usage chunk."""
+    prompt_tokens: int
+    completion_tokens: int
+    prompt_tokens_details: Any = None
+
+class UsageBucket:
+    """Aggregated usage for one (phase, HMO, tier, deployment)."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.calls_without_usage = 0
+        self.aborted_streams = 0
+        self.failed_calls = 0
+        self.failed_upstream_ms = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.upstream_ms = 0.0
+        self.retries = 0
+        self.cost_usd = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "calls_without_usage": self.calls_without_usage,
+            "aborted_streams": self.aborted_streams,
+            "failed_calls": self.failed_calls,
+            "avg_failed_upstream_ms": round(self.failed_upstream_ms / self.failed_calls, 2) if self.failed_calls else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "avg_upstream_ms": round(self.upstream_ms / self.calls, 2) if self.calls else 0.0,
+            "retries": self.retries,
+            "cost_usd": round(self.cost_usd, 6)
+        }
+
+class UsageTracker:
+    """Per-call usage accounting with in-memory aggregation."""
+    
+    def __init__(self, prices: Dict[str, Dict[str, float]]):
+        """
+        Args:
+            prices: USD per 1M tokens per deployment, with 'input', 'cached_input' and 'output' keys
+        """
+        self.prices = prices
+        self.buckets: Dict[Tuple[str, str, str, str], UsageBucket] = {}
+    
+    def estimate_cost(self, model_deployment: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        """Estimate the USD cost of a call (0 for deployments without prices)."""
+        price = self.prices.get(model_deployment)
+        if not price:
+            return 0.0
+        uncached_tokens = max(prompt_tokens - cached_tokens, 0)
+        return (
+            uncached_tokens * price["input"]
+            + cached_tokens * price["cached_input"]
+            + completion_tokens * price["output"]
+        ) / 1_000_000
+    
+    def record(
+        self,
+        model_deployment: str,
+        usage: Any,
+        latency_ms: float,
+        retries: int = 0,
+        streamed: bool = False,
+        aborted: bool = False
+    ):
+        """
+        Record one Azure OpenAI call.
+        
+        Args:
+            model_deployment: Azure deployment name
+            usage: Response usage object (None when the service did not report it)
+            latency_ms: Upstream latency including retries
+            retries: Number of retried attempts
+            streamed: Whether the response was streamed
+            aborted: Whether the stream ended before completing
+        """
+        
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        cached_tokens = cached_prompt_tokens(usage)
+        cost_usd = self.estimate_cost(model_deployment, prompt_tokens, cached_tokens, completion_tokens)
+        
+        context, bucket = self._attribute(model_deployment)
+        bucket.calls += 1
+        bucket.calls_without_usage += int(usage is None)
+        bucket.aborted_streams += int(aborted)
+        bucket.prompt_tokens += prompt_tokens
+        bucket.completion_tokens += completion_tokens
+        bucket.cached_tokens += cached_tokens
+        bucket.upstream_ms += latency_ms
+        bucket.retries += retries
+        bucket.cost_usd += cost_usd
+        
+        if context:
+            context.azure_calls += 1
+            context.prompt_tokens += prompt_tokens
+            context.completion_tokens += completion_tokens
+            context.cached_tokens += cached_tokens
+            context.upstream_ms += latency_ms
+            context.retries += retries
+            context.cost_usd += cost_usd
+        
+        logger.azure_openai_request(
+            model=model_deployment,
+            tokens_used=prompt_tokens + completion_tokens if usage is not None else None,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            latency_ms=round(latency_ms, 2),
+            retries=retries,
+            streamed=streamed,
+            aborted=aborted,
+            usage_estimated=isinstance(usage, EstimatedUsage),
+            cost_usd=round(cost_usd, 6),
+            outcome="aborted" if aborted else "success",
+            **self._log_attribution(context)
+        )
+    
+    def record_failure(self, model_deployment: str, latency_ms: float, retries: int, error_type: str, streamed: bool = False):
+        """
+        Record one Azure OpenAI call that failed without a response.
+        
+        Args:
+            model_deployment: Azure deployment name
+            latency_ms: Time spent until the call failed, including retries
+            retries: Number of retried attempts
+            error_type: Class name of the final error
+            streamed: Whether a streamed response was requested
+        """
+        
+        context, bucket = self._attribute(model_deployment)
+        bucket.failed_calls += 1
+        bucket.failed_upstream_ms += latency_ms
+        bucket.retries += retries
+        
+        if context:
+            context.azure_failed_calls += 1
+            context.upstream_ms += latency_ms
+            context.retries += retries
+        
+        logger.azure_openai_request(
+            model=model_deployment,
+            latency_ms=round(latency_ms, 2),
+            retries=retries,
+            streamed=streamed,
+            outcome="failed",
+            error_type=error_type,
+            **self._log_attribution(context)
+        )
+    
+    def _attribute(self, model_deployment: str) -> Tuple[Optional[RequestContext], UsageBucket]:
+        """Get the current request context and the bucket of its phase, HMO and tier."""
+        context = get_request_context()
+        phase = (context.phase if context else None) or UNKNOWN
+        hmo_name = (context.hmo_name if context else None) or UNKNOWN
+        membership_tier = (context.membership_tier if context else None) or UNKNOWN
+        return context, self.buckets.setdefault((phase, hmo_name, membership_tier, model_deployment), UsageBucket())
+    
+    def _log_attribution(self, context: Optional[RequestContext]) -> Dict[str, Any]:
+        return {
+            "phase": (context.phase if context else None) or UNKNOWN,
+            "user_hmo": (context.hmo_name if context else None) or UNKNOWN,
+            "user_tier": (context.membership_tier if context else None) or UNKNOWN,
+            "request_id": context.request_id if context else None
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get usage totals and the breakdown per phase, HMO, tier and deployment."""
+        totals = UsageBucket()
+        breakdown = []
+        for (phase, hmo_name, membership_tier, deployment), bucket in sorted(self.buckets.items()):
+            breakdown.append({
+                "phase": phase,
+                "hmo_name": hmo_name,
+                "membership_tier": membership_tier,
+                "deployment": deployment,
+                **bucket.stats()
+            })
+            for name in ("calls", "calls_without_usage", "aborted_streams", "failed_calls", "failed_upstream_ms", "prompt_tokens", "completion_tokens", "cached_tokens", "upstream_ms", "retries", "cost_usd"):
+                setattr(totals, name, getattr(totals, name) + getattr(bucket, name))
+        return {"totals": totals.stats(), "breakdown": breakdown}
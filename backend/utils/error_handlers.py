@@ -2,71 +2,142 @@
 Comprehensive error handling middleware for FastAPI.
 """
 
+import time
 from datetime import datetime
+from typing import Optional
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from utils.logging import logger, log_error
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+from config.settings import settings
+from utils.logging import logger, log_error, start_request_context, reset_request_context, get_request_context, trace_exporter
+from utils.logging.tracing import serialize_span, server_timing_header, stage_durations_ms
+from utils.metrics import http_requests_total, http_request_duration_seconds, http_requests_in_flight
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle all unhandled exceptions."""
+class ErrorHandlingMiddleware:
+    """
+    Pure ASGI middleware that logs one access record per request and handles all unhandled exceptions.
     
-    async def dispatch(self, request: Request, call_next):
+    The app runs in the middleware's own task and response messages are passed
+    straight through, so streaming bodies are neither buffered nor wrapped.
+    Stage spans recorded by the endpoints are added as a Server-Timing header.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Collects the request's Azure OpenAI usage and stage spans for the access record
+        context_token = start_request_context(scope["path"], _header(scope, b"traceparent"))
+        context = get_request_context()
+        http_requests_in_flight.inc()
+        start_ns = context.start_perf_ns
+        status_code: Optional[int] = None
+        first_byte_ms: Optional[float] = None
+        response_bytes = 0
+        
+        async def send_with_timing(message: Message):
+            nonlocal status_code, first_byte_ms, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_start_ns = time.perf_counter_ns()
+                first_byte_ms = (response_start_ns - start_ns) / 1_000_000
+                if settings.TRACING_ENABLED:
+                    serialize = serialize_span(context, response_start_ns)
+                    if serialize:
+                        context.spans.append(serialize)
+                    server_timing = server_timing_header(context.spans, first_byte_ms)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", server_timing.encode("latin-1"))]}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+        
         try:
-            # Log incoming request
-            logger.api_request(
-                endpoint=str(request.url.path),
-                method=request.method,
-                client_ip=request.client.host if request.client else "unknown",
-                user_agent=request.headers.get("user-agent", "unknown")
-            )
-            
-            start_time = datetime.now()
-            response = await call_next(request)
-            end_time = datetime.now()
-            
-            # Log successful response
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
-            logger.api_response(
-                endpoint=str(request.url.path),
-                status_code=response.status_code,
-                response_time_ms=response_time_ms
-            )
-            
-            return response
-            
-        except HTTPException as e:
-            # Log HTTP exceptions
-            log_error(
-                f"HTTP Exception: {e.status_code} - {e.detail}",
-                endpoint=str(request.url.path),
-                method=request.method,
-                status_code=e.status_code
-            )
-            raise
-            
+            await self.app(scope, receive, send_with_timing)
+        
         except Exception as e:
             # Log unhandled exceptions
-            print(f"*** EXCEPTION CAUGHT IN MIDDLEWARE: {type(e).__name__}: {str(e)} ***")
             log_error(
-                f"Unhandled exception in {request.method} {request.url.path}",
+                f"Unhandled exception in {scope['method']} {scope['path']}",
                 exception=e,
-                endpoint=str(request.url.path),
-                method=request.method,
-                client_ip=request.client.host if request.client else "unknown"
+                endpoint=scope["path"],
+                method=scope["method"],
+                client_ip=_client_ip(scope)
             )
             
+            # Headers already sent (e.g. mid-stream): let the server abort the connection
+            if status_code is not None:
+                raise
+            
             # Return generic error response
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
                     "message": "An unexpected error occurred. Please try again later.",
                     "timestamp": datetime.now().isoformat(),
-                    "path": str(request.url.path)
+                    "path": scope["path"]
                 }
             )
+            await response(scope, receive, send_with_timing)
+        
+        finally:
+            end_ns = time.perf_counter_ns()
+            elapsed = (end_ns - start_ns) / 1_000_000_000
+            http_requests_in_flight.dec()
+            
+            # Label by route template, so path parameters and unknown paths cannot explode the series count
+            route_label = _route_template(scope)
+            status_label = status_code if status_code is not None else "aborted"
+            http_requests_total.labels(scope["method"], route_label, status_label).inc()
+            http_request_duration_seconds.labels(scope["method"], route_label, status_label).observe(elapsed)
+            
+            usage = context.usage_summary() if context.azure_calls or context.azure_failed_calls else {}
+            stages = {"stages_ms": stage_durations_ms(context.spans)} if context.spans else {}
+            if trace_exporter:
+                stages["trace_id"] = context.trace_id
+            logger.api_access(
+                method=scope["method"],
+                endpoint=scope["path"],
+                status_code=status_code,
+                response_time_ms=round(elapsed * 1000, 3),
+                first_byte_ms=round(first_byte_ms, 3) if first_byte_ms is not None else None,
+                response_bytes=response_bytes,
+                client_ip=_client_ip(scope),
+                user_agent=_header(scope, b"user-agent") or "unknown",
+                **usage,
+                **stages
+            )
+            if trace_exporter:
+                trace_exporter.export(context, context.spans, scope["method"], route_label, status_code, end_ns)
+            reset_request_context(context_token)
+
+
+def _client_ip(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _route_template(scope: Scope) -> str:
+    """Full mounted path template of the matched route, including router prefixes."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI versions that keep included routes unprefixed record the effective (prefixed) route here
+    effective_route = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(effective_route, "path", None) or route.path
+    return scope.get("root_path", "") + path
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
 
 def create_http_exception_handler():
@@ -80,7 +151,7 @@ def create_http_exception_handler():
             status_code=exc.status_code,
             detail=exc.detail
         )
-
+        
         return JSONResponse(
             status_code=exc.status_code,
             content={
@@ -0,0 +1,95 @@
+"""
+Async Client Concurrency Benchmark
+
+Compares the legacy blocking call path (synchronous AzureOpenAI client awaited
+from a coroutine) with the async AzureOpenAIService against a local fake
+endpoint, using the same number of concurrent requests.
+
+Usage:
+    python benchmarks/bench_async_client.py --requests 200 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import AzureOpenAI
+
+from benchmarks.fake_azure_openai import FakeServerThread, create_fake_app
+
+MESSAGES = [
+    {"role": "system", "content": "אתה מומחה בשירותי בריאות בישראל."},
+    {"role": "user", "content": "כמה עולה דיקור סיני?"}
+]
+
+
+async def run_legacy(url: str, requests: int) -> float:
+    """Run concurrent requests through a synchronous client, as before."""
+    client = AzureOpenAI(azure_endpoint=url, api_key="fake", api_version="2024-02-01")
+    
+    async def call():
+        # Blocks the event loop for the whole round trip
+        client.chat.completions.create(model="gpt-4o", messages=MESSAGES, max_tokens=100)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+async def run_async(requests: int) -> float:
+    """Run concurrent requests through the async AzureOpenAIService."""
+    from backend.services.azure_openai_service import AzureOpenAIService
+    
+    service = AzureOpenAIService()
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        service.chat_completion(MESSAGES, "gpt-4o", 0.1, 100, service.gpt4o_client)
+        for _ in range(requests)
+    ))
+    elapsed = time.perf_counter() - start
+    await service.close()
+    
+    failed = sum(1 for result in results if result is None)
+    if failed:
+        print(f"WARNING: {failed} async requests failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async vs blocking Azure OpenAI client benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Concurrent requests per run")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fake upstream latency")
+    args = parser.parse_args()
+    
+    with FakeServerThread(create_fake_app(latency_ms=args.latency_ms)) as server:
+        # Point the service settings at the fake endpoint before importing it
+        os.environ.update({
+            "AZURE_OPENAI_ENDPOINT": server.url,
+            "AZURE_OPENAI_API_KEY": "fake",
+            "AZURE_OPENAI_MINI_ENDPOINT": server.url,
+            "AZURE_OPENAI_MINI_API_KEY": "fake"
+        })
+        
+        legacy_elapsed = asyncio.run(run_legacy(server.url, args.requests))
+        async_elapsed = asyncio.run(run_async(args.requests))
+    
+    print("=" * 60)
+    print(f"Concurrent requests: {args.requests}, upstream latency: {args.latency_ms:.0f} ms")
+    print("-" * 60)
+    print(f"{'client':<20}{'wall time (s)':>15}{'requests/s':>15}")
+    print(f"{'sync (legacy)':<20}{legacy_elapsed:>15.2f}{args.requests / legacy_elapsed:>15.1f}")
+    print(f"{'async':<20}{async_elapsed:>15.2f}{args.requests / async_elapsed:>15.1f}")
+    print("-" * 60)
+    print(f"Speedup: {legacy_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
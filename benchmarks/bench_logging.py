@@ -0,0 +1,80 @@
+"""
+Log Call Benchmark
+
+Measures StructuredLogger calls per second at different logger levels,
+comparing the previous eager record building (entry dict and json.dumps
+before the level check) with the level-gated calls, plus per-event sampling.
+Records go to a NullHandler, so only the caller-side cost is measured.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 100000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging import logger
+
+CONTEXT = {
+    "user_hmo": "מכבי",
+    "user_tier": "זהב",
+    "question_length": 42,
+    "conversation_length": 6
+}
+
+
+def eager(level: int, message: str, **kwargs):
+    """The previous behaviour: build and serialize the record, then check the level."""
+    entry = logger._create_log_entry(logging.getLevelName(level), message, **kwargs)
+    logger.logger.log(level, json.dumps(entry, ensure_ascii=False))
+
+
+def measure(call, calls: int) -> float:
+    """Return calls per second."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eager vs level-gated log call benchmark")
+    parser.add_argument("--calls", type=int, default=100000, help="Log calls per measurement")
+    args = parser.parse_args()
+    
+    logger.logger.handlers = [logging.NullHandler()]
+    
+    cases = [
+        ("debug", lambda: eager(logging.DEBUG, "Debug event", **CONTEXT), lambda: logger.debug("Debug event", **CONTEXT)),
+        ("info", lambda: eager(logging.INFO, "Info event", **CONTEXT), lambda: logger.info("Info event", **CONTEXT))
+    ]
+    
+    print("=" * 72)
+    print(f"Calls per measurement: {args.calls}")
+    print("-" * 72)
+    print(f"{'call':<20}{'logger level':<14}{'eager calls/s':>18}{'gated calls/s':>18}")
+    for level_name in ("DEBUG", "INFO", "WARNING"):
+        logger.logger.setLevel(level_name)
+        for name, eager_call, gated_call in cases:
+            eager_rate = measure(eager_call, args.calls)
+            gated_rate = measure(gated_call, args.calls)
+            print(f"{name:<20}{level_name:<14}{eager_rate:>18,.0f}{gated_rate:>18,.0f}")
+    
+    print("-" * 72)
+    print(f"{'call':<20}{'sample rate':<14}{'':>18}{'gated calls/s':>18}")
+    logger.logger.setLevel(logging.INFO)
+    for rate in (1.0, 0.1, 0.01):
+        logger.sample_rates = {"user_interaction": rate}
+        gated_rate = measure(lambda: logger.user_interaction("medical_qa", "ask_question", "he", **CONTEXT), args.calls)
+        print(f"{'user_interaction':<20}{rate:<14g}{'':>18}{gated_rate:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Request Middleware Benchmark
+
+Compares the legacy BaseHTTPMiddleware request logging (separate request and
+response records) with the pure ASGI ErrorHandlingMiddleware (one access
+record), on a minimal FastAPI app served in-process, so only the middleware
+and logging overhead differs. Both runs write their records to a temporary
+file that is removed afterwards, so the application log is left untouched;
+console logging is switched off so terminal output does not dominate.
+
+Usage:
+    python benchmarks/bench_middleware.py --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.utils.error_handlers import ErrorHandlingMiddleware
+from utils.logging import logger
+from utils.logging.async_handlers import BatchedFileHandler
+from utils.logging.logger import StructuredFormatter
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+    
+    async def dispatch(self, request: Request, call_next):
+        logger.api_request(
+            endpoint=str(request.url.path),
+            method=request.method,
+            client_ip=request.client.host if request.client else "unknown",
+            user_agent=request.headers.get("user-agent", "unknown")
+        )
+        
+        start_time = datetime.now()
+        response = await call_next(request)
+        end_time = datetime.now()
+        
+        logger.api_response(
+            endpoint=str(request.url.path),
+            status_code=response.status_code,
+            response_time_ms=(end_time - start_time).total_seconds() * 1000
+        )
+        return response
+
+
+def create_app(middleware) -> FastAPI:
+    """Create a minimal app with a JSON and a streaming endpoint."""
+    app = FastAPI()
+    app.add_middleware(middleware)
+    
+    @app.get("/json")
+    async def json_endpoint():
+        return {"status": "ok"}
+    
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def chunks():
+            for _ in range(10):
+                yield b"event: delta\ndata: {}\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+    
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Send requests through the app and return requests/s."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+        
+        # Warm up routing and logging
+        await asyncio.gather(*(call() for _ in range(min(requests, 100))))
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BaseHTTPMiddleware vs pure ASGI middleware benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent requests")
+    args = parser.parse_args()
+    
+    # Write records to a temporary file instead of the console and the application log
+    log_dir = tempfile.TemporaryDirectory()
+    file_handler = BatchedFileHandler(os.path.join(log_dir.name, "bench.log"), encoding="utf-8")
+    file_handler.setFormatter(StructuredFormatter())
+    if logger.listener:
+        logger.listener.handlers = (file_handler,)
+    else:
+        logger.logger.handlers = [file_handler]
+    
+    variants = [
+        ("BaseHTTPMiddleware", create_app(LegacyErrorHandlingMiddleware)),
+        ("pure ASGI", create_app(ErrorHandlingMiddleware))
+    ]
+    
+    print("=" * 60)
+    print(f"Requests per run: {args.requests}, concurrency: {args.concurrency}")
+    print("-" * 60)
+    print(f"{'middleware':<22}{'endpoint':<12}{'requests/s':>15}")
+    results = {}
+    for path in ("/json", "/stream"):
+        for name, app in variants:
+            results[(name, path)] = asyncio.run(run(app, path, args.requests, args.concurrency))
+            print(f"{name:<22}{path:<12}{results[(name, path)]:>15.1f}")
+    print("-" * 60)
+    for path in ("/json", "/stream"):
+        speedup = results[("pure ASGI", path)] / results[("BaseHTTPMiddleware", path)]
+        print(f"Speedup {path}: {speedup:.2f}x")
+    
+    logger.flush()
+    file_handler.close()
+    log_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Fake Azure OpenAI Server
+
+Local stand-in for the Azure OpenAI chat-completions API, used for benchmarks
+and load tests so they never touch real quota.
+
+Supports streaming and non-streaming completions, configurable latency
+distributions, injected 5xx errors and 429 rate limits (with Retry-After),
+and canned responses, including the JSON shapes that
+AzureOpenAIService.parse_user_info_response expects.
+
+Point the backend at it through settings:
+    AZURE_OPENAI_ENDPOINT_OVERRIDE=http://127.0.0.1:9000
+
+Usage:
+    python benchmarks/fake_azure_openai.py --port 9000 --latency lognormal --latency-ms 800
+"""
+
+import json
+import time
+import hashlib
+import uuid
+import random
+import socket
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Canned user details returned once info collection "completes"
+CANNED_USER_INFO = {
+    "first_name": "שחר",
+    "last_name": "סמירה",
+    "id_number": "316164417",
+    "gender": "זכר",
+    "age": 30,
+    "hmo_name": "מכבי",
+    "hmo_card_number": "987654321",
+    "membership_tier": "זהב"
+}
+
+HMO_ALIASES = {
+    "מכבי": "מכבי", "maccabi": "מכבי",
+    "מאוחדת": "מאוחדת", "meuhedet": "מאוחדת",
+    "כללית": "כללית", "clalit": "כללית"
+}
+
+TIER_ALIASES = {
+    "זהב": "זהב", "gold": "זהב",
+    "כסף": "כסף", "silver": "כסף",
+    "ארד": "ארד", "bronze": "ארד"
+}
+
+USER_INFO_FIELDS = list(CANNED_USER_INFO.keys())
+
+DEFAULT_MEDICAL_ANSWER = (
+    "בהתאם לרמת החברות שלך, אתה זכאי ל-70% הנחה על דיקור סיני, עד 20 טיפולים בשנה. "
+    "לתיאום תור ניתן להתקשר למוקד הקופה. "
+    "זהו מידע כללי, מומלץ לוודא את הפרטים מול הקופה."
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour of the fake server."""
+    latency_distribution: str = "fixed"  # fixed | uniform | normal | lognormal
+    latency_ms: float = 200.0
+    latency_jitter_ms: float = 50.0
+    stream_chunk_words: int = 3
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_ms: int = 500
+    user_info_turns: int = 3
+    medical_answer: str = DEFAULT_MEDICAL_ANSWER
+    user_info_prompt_marker: str = "missing_fields"  # Only the user info system prompt asks for this field
+    prompt_cache: bool = True
+    
+    def sample_latency(self) -> float:
+        """Sample one request latency in seconds."""
+        if self.latency_distribution == "uniform":
+            value = random.uniform(self.latency_ms - self.latency_jitter_ms, self.latency_ms + self.latency_jitter_ms)
+        elif self.latency_distribution == "normal":
+            value = random.gauss(self.latency_ms, self.latency_jitter_ms)
+        elif self.latency_distribution == "lognormal":
+            # Long-tailed, like real LLM latency; latency_ms is the median
+            sigma = self.latency_jitter_ms / max(self.latency_ms, 1.0)
+            value = self.latency_ms * random.lognormvariate(0, sigma)
+        else:
+            value = self.latency_ms
+        return max(value, 0.0) / 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for reported usage.
+    
+    Kept local rather than importing utils.helpers, which would load the
+    backend settings before callers get a chance to point them at this server.
+    """
+    return len(text) // 3 + 1 if text else 0
+
+
+# Azure caches prompt prefixes from 1,024 tokens, in 128-token increments
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+class PrefixCache:
+    """Emulate upstream prompt caching: report the longest previously seen prompt prefix as cached."""
+    
+    def __init__(self, max_blocks: int = 50000):
+        self.blocks: "OrderedDict[str, None]" = OrderedDict()
+        self.max_blocks = max_blocks
+    
+    def cached_tokens(self, deployment: str, messages: List[Dict[str, str]]) -> int:
+        """Return the cached prefix length in tokens and remember this prompt's prefix blocks."""
+        text = "".join(msg.get("content", "") for msg in messages)
+        block_chars = CACHE_BLOCK_TOKENS * 3  # Matches estimate_tokens
+        digest = hashlib.sha256(deployment.encode("utf-8"))
+        cached_chars = 0
+        prefix_hit = True
+        
+        for start in range(0, len(text) - block_chars + 1, block_chars):
+            digest.update(text[start:start + block_chars].encode("utf-8"))
+            key = digest.copy().hexdigest()
+            if prefix_hit and key in self.blocks:
+                cached_chars = start + block_chars
+                self.blocks.move_to_end(key)
+            else:
+                prefix_hit = False
+                self.blocks[key] = None
+        
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        
+        cached = cached_chars // 3
+        return cached if cached >= CACHE_MIN_TOKENS else 0
+
+
+def _find_alias(texts: List[str], aliases: Dict[str, str]) -> Optional[str]:
+    """Find the last HMO/tier mentioned in the given texts."""
+    found = None
+    for text in texts:
+        lowered = text.lower()
+        for alias, value in aliases.items():
+            if alias in lowered:
+                found = value
+    return found
+
+
+def user_info_response(messages: List[Dict[str, str]], config: FakeLLMConfig) -> str:
+    """
+    Build a canned user info collection reply.
+    
+    Returns "collecting" JSON until the conversation has `user_info_turns` user
+    messages, then "completed" JSON. HMO and tier mentioned by the user are
+    echoed back so load tests can cover every context.
+    """
+    
+    user_texts = [msg["content"] for msg in messages if msg["role"] == "user"]
+    turns = len(user_texts)
+    
+    if turns < config.user_info_turns:
+        collected = USER_INFO_FIELDS[:min(turns * 3, len(USER_INFO_FIELDS) - 1)]
+        return json.dumps({
+            "status": "collecting",
+            "collected_fields": collected,
+            "missing_fields": [field for field in USER_INFO_FIELDS if field not in collected],
+            "response": "תודה! אני צריך עוד כמה פרטים כדי להמשיך."
+        }, ensure_ascii=False)
+    
+    user_info = dict(CANNED_USER_INFO)
+    user_info["hmo_name"] = _find_alias(user_texts, HMO_ALIASES) or user_info["hmo_name"]
+    user_info["membership_tier"] = _find_alias(user_texts, TIER_ALIASES) or user_info["membership_tier"]
+    
+    return "```json\n" + json.dumps({"status": "completed", "user_info": user_info}, ensure_ascii=False) + "\n```"
+
+
+def create_fake_app(
+    latency_ms: float = 200.0,
+    response_text: Optional[str] = None,
+    config: Optional[FakeLLMConfig] = None
+) -> FastAPI:
+    """
+    Create a FastAPI app serving the Azure chat-completions route.
+    
+    Args:
+        latency_ms: Fixed upstream latency (used when no config is given)
+        response_text: Assistant content for non user-info deployments (overrides config)
+        config: Full fake server behaviour
+    
+    Returns:
+        FastAPI application
+    """
+    
+    config = config or FakeLLMConfig(latency_ms=latency_ms)
+    if response_text is not None:
+        config.medical_answer = response_text
+    
+    app = FastAPI(title="Fake Azure OpenAI")
+    app.state.config = config
+    app.state.stats = {
+        "requests": 0, "streamed": 0, "truncated": 0, "errors_injected": 0, "rate_limited": 0, "cached_prompt_tokens": 0
+    }
+    prefix_cache = PrefixCache()
+    
+    def completion_text(deployment: str, messages: List[Dict[str, str]]) -> str:
+        # Medical Q&A may also be routed to the mini deployment, so the phase is told by the system prompt
+        system_prompt = messages[0].get("content", "") if messages and messages[0].get("role") == "system" else ""
+        if config.user_info_prompt_marker in system_prompt:
+            return user_info_response(messages, config)
+        return config.medical_answer
+    
+    def usage(deployment: str, messages: List[Dict[str, str]], content: str) -> Dict[str, Any]:
+        prompt_tokens = sum(estimate_tokens(msg.get("content", "")) + 4 for msg in messages)
+        completion_tokens = estimate_tokens(content)
+        cached_tokens = prefix_cache.cached_tokens(deployment, messages) if config.prompt_cache else 0
+        app.state.stats["cached_prompt_tokens"] += cached_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+    
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def chat_completions(deployment: str, request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        app.state.stats["requests"] += 1
+        
+        # Fault injection happens before any latency, like a gateway rejection
+        if random.random() < config.rate_limit_rate:
+            app.state.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={
+                    "retry-after-ms": str(config.retry_after_ms),
+                    "retry-after": str(max(1, round(config.retry_after_ms / 1000)))
+                },
+                content={"error": {"code": "429", "message": "Rate limit is exceeded. (fake)"}}
+            )
+        
+        if random.random() < config.error_rate:
+            app.state.stats["errors_injected"] += 1
+            await asyncio.sleep(config.sample_latency() / 2)
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"code": "InternalServerError", "message": "Injected failure (fake)"}}
+            )
+        
+        content = completion_text(deployment, messages)
+        
+        # Honour max_tokens like the real service: cut the answer and report finish_reason=length
+        finish_reason = "stop"
+        max_tokens = body.get("max_tokens")
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[:max_tokens * 3]
+            finish_reason = "length"
+            app.state.stats["truncated"] += 1
+        
+        if body.get("stream"):
+            app.state.stats["streamed"] += 1
+            stream_usage = usage(deployment, messages, content) if (body.get("stream_options") or {}).get("include_usage") else None
+            return StreamingResponse(
+                _stream_chunks(deployment, content, finish_reason, stream_usage),
+                media_type="text/event-stream"
+            )
+        
+        await asyncio.sleep(config.sample_latency())
+        
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": deployment,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason
+            }],
+            "usage": usage(deployment, messages, content)
+        }
+    
+    @app.get("/fake/stats")
+    async def fake_stats():
+        return app.state.stats
+    
+    async def _stream_chunks(deployment: str, content: str, finish_reason: str = "stop", stream_usage: Optional[Dict[str, Any]] = None):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        words = content.split(" ")
+        groups = [
+            " ".join(words[index:index + config.stream_chunk_words])
+            for index in range(0, len(words), config.stream_chunk_words)
+        ]
+        total_latency = config.sample_latency()
+        
+        # Time to first token takes a share of the latency, the rest is spread over chunks
+        await asyncio.sleep(total_latency * 0.3)
+        delay = total_latency * 0.7 / max(len(groups), 1)
+        
+        for index, group in enumerate(groups):
+            if index:
+                await asyncio.sleep(delay)
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": deployment,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": group if index == 0 else f" {group}"},
+                    "finish_reason": finish_reason if index == len(groups) - 1 else None
+                }]
+            }
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        
+        if stream_usage:
+            usage_chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": deployment,
+                "choices": [],
+                "usage": stream_usage
+            }
+            yield f"data: {json.dumps(usage_chunk, ensure_ascii=False)}\n\n"
+        
+        yield "data: [DONE]\n\n"
+    
+    return app
+
+
+def find_free_port() -> int:
+    """Return a free TCP port on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeServerThread:
+    """Run a fake server with uvicorn in a background thread."""
+    
+    def __init__(self, app: FastAPI, port: int = None):
+        self.port = port or find_free_port()
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self.port}"
+    
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Azure OpenAI chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="fixed", choices=["fixed", "uniform", "normal", "lognormal"],
+                        help="Latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean/median latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="Spread of the latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests rejected with 429")
+    parser.add_argument("--retry-after-ms", type=int, default=500, help="Retry-After sent with 429 responses")
+    parser.add_argument("--user-info-turns", type=int, default=3,
+                        help="User messages before info collection returns 'completed'")
+    args = parser.parse_args()
+    
+    config = FakeLLMConfig(
+        latency_distribution=args.latency,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_ms=args.retry_after_ms,
+        user_info_turns=args.user_info_turns
+    )
+    
+    print(f"Fake Azure OpenAI listening on http://{args.host}:{args.port}")
+    uvicorn.run(create_fake_app(config=config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
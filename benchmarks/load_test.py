@@ -0,0 +1,271 @@
+"""
+End-to-End Load Test
+
+Drives realistic chat sessions against the backend: a multi-turn user info
+collection followed by several medical Q&A turns with a growing history,
+spread across all nine HMO/tier contexts. Reports throughput, p50/p95/p99
+latency and error rates per endpoint.
+
+By default the backend and a fake Azure OpenAI server are started in-process
+(over real HTTP, so middleware and serialization are exercised), which keeps
+FastAPI-layer regressions separate from upstream latency. Use --base-url to
+target an already running backend instead.
+
+Usage:
+    python benchmarks/load_test.py --sessions 90 --concurrency 30 --qa-turns 4
+    python benchmarks/load_test.py --base-url http://localhost:8000 --sessions 20
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+import httpx
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_azure_openai import FakeServerThread, FakeLLMConfig, create_fake_app, find_free_port
+
+HMOS = ["מכבי", "מאוחדת", "כללית"]
+TIERS = ["זהב", "כסף", "ארד"]
+
+INFO_MESSAGES = [
+    "שלום, קוראים לי דני כהן",
+    "תעודת זהות 316164417, גבר בן 34",
+    "אני חבר ב{hmo}, מספר כרטיס 987654321, מסלול {tier}"
+]
+
+QUESTIONS = [
+    "כמה עולה טיפול דיקור סיני?",
+    "האם יש הנחה על משקפיים?",
+    "מה ההטבות לטיפולי שיניים לילדים?",
+    "האם סדנת הפסקת עישון כלולה?",
+    "מה כלול במעקב הריון?",
+    "How many speech therapy sessions are covered?",
+    "האם יש החזר על עדשות מגע?",
+    "מה ההשתתפות העצמית בהומיאופתיה?"
+]
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class EndpointStats:
+    """Latency samples and error counts for one endpoint."""
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    
+    def record(self, latency_ms: float, status: str, ok: bool):
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples (0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class LoadTest:
+    """Runs concurrent chat sessions and collects per-endpoint statistics."""
+    
+    def __init__(self, base_url: str, sessions: int, concurrency: int, qa_turns: int,
+                 max_info_turns: int, vary_questions: bool):
+        self.base_url = base_url
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.qa_turns = qa_turns
+        self.max_info_turns = max_info_turns
+        self.vary_questions = vary_questions
+        self.stats: Dict[str, EndpointStats] = {
+            "user-info-collection": EndpointStats(),
+            "medical-qa": EndpointStats()
+        }
+        self.completed_sessions = 0
+        self.failed_sessions = 0
+    
+    async def _post(self, client: httpx.AsyncClient, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST to an endpoint, recording latency; returns the JSON body on success."""
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"{API_PREFIX}/{endpoint}", json=payload)
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.stats[endpoint].record((time.perf_counter() - start) * 1000, type(e).__name__, False)
+            return None
+        
+        ok = response.status_code == 200 and body.get("status") != "error"
+        self.stats[endpoint].record((time.perf_counter() - start) * 1000, str(response.status_code), ok)
+        return body if ok else None
+    
+    async def run_session(self, client: httpx.AsyncClient, index: int) -> bool:
+        """Run one session: info collection, then Q&A with a growing history."""
+        hmo = HMOS[index % len(HMOS)]
+        tier = TIERS[(index // len(HMOS)) % len(TIERS)]
+        
+        # Phase 1: user info collection
+        history: List[Dict[str, Any]] = []
+        user_info = None
+        for turn in range(self.max_info_turns):
+            message = INFO_MESSAGES[min(turn, len(INFO_MESSAGES) - 1)].format(hmo=hmo, tier=tier)
+            body = await self._post(client, "user-info-collection", {
+                "message": message,
+                "conversation_history": history
+            })
+            if body is None:
+                return False
+            history = body["conversation_history"]
+            if body["status"] == "completed":
+                user_info = body["user_info"]
+                break
+        
+        if user_info is None:
+            return False
+        
+        # Phase 2: medical Q&A
+        history = []
+        for turn in range(self.qa_turns):
+            question = random.choice(QUESTIONS)
+            if self.vary_questions:
+                question = f"{question} ({index}-{turn})"
+            body = await self._post(client, "medical-qa", {
+                "message": question,
+                "user_info": user_info,
+                "conversation_history": history
+            })
+            if body is None:
+                return False
+            history = body["conversation_history"]
+        
+        return True
+    
+    async def run(self) -> float:
+        """Run all sessions with bounded concurrency; returns wall time in seconds."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=120) as client:
+            async def bounded(index: int):
+                async with semaphore:
+                    if await self.run_session(client, index):
+                        self.completed_sessions += 1
+                    else:
+                        self.failed_sessions += 1
+            
+            start = time.perf_counter()
+            await asyncio.gather(*(bounded(index) for index in range(self.sessions)))
+            return time.perf_counter() - start
+    
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Build the summary report."""
+        endpoints = {}
+        for name, stats in self.stats.items():
+            count = len(stats.latencies_ms)
+            endpoints[name] = {
+                "requests": count,
+                "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(stats.latencies_ms, 50), 2),
+                "p95_ms": round(percentile(stats.latencies_ms, 95), 2),
+                "p99_ms": round(percentile(stats.latencies_ms, 99), 2),
+                "max_ms": round(max(stats.latencies_ms), 2) if count else 0.0,
+                "errors": stats.errors,
+                "error_rate": round(stats.errors / count, 4) if count else 0.0,
+                "status_codes": stats.status_codes
+            }
+        
+        return {
+            "wall_time_s": round(elapsed, 2),
+            "sessions": self.sessions,
+            "completed_sessions": self.completed_sessions,
+            "failed_sessions": self.failed_sessions,
+            "concurrency": self.concurrency,
+            "endpoints": endpoints
+        }
+
+
+def print_report(report: Dict[str, Any], upstream: str):
+    print("=" * 96)
+    print(f"Sessions: {report['sessions']} ({report['completed_sessions']} completed, "
+          f"{report['failed_sessions']} failed), concurrency: {report['concurrency']}, "
+          f"wall time: {report['wall_time_s']:.2f} s")
+    print(f"Upstream: {upstream}")
+    print("-" * 96)
+    print(f"{'endpoint':<24}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'errors':>12}")
+    for name, stats in report["endpoints"].items():
+        print(f"{name:<24}{stats['requests']:>10}{stats['throughput_rps']:>10.1f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+              f"{stats['errors']:>6} ({stats['error_rate']:.1%})")
+    print("-" * 96)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test for the chatbot backend")
+    parser.add_argument("--base-url", help="Target a running backend instead of starting one in-process")
+    parser.add_argument("--sessions", type=int, default=90, help="Total chat sessions")
+    parser.add_argument("--concurrency", type=int, default=30, help="Concurrent sessions")
+    parser.add_argument("--qa-turns", type=int, default=4, help="Medical Q&A turns per session")
+    parser.add_argument("--max-info-turns", type=int, default=6, help="Give up info collection after this many turns")
+    parser.add_argument("--vary-questions", action="store_true", help="Make every question unique (bypasses the answer cache)")
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "normal", "lognormal"],
+                        help="Fake upstream latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Fake upstream mean/median latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0, help="Fake upstream latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake upstream 500 rate")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fake upstream 429 rate")
+    parser.add_argument("--json-output", help="Write the report as JSON to this path")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for question selection")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    
+    if args.base_url:
+        test = LoadTest(args.base_url, args.sessions, args.concurrency, args.qa_turns,
+                        args.max_info_turns, args.vary_questions)
+        elapsed = asyncio.run(test.run())
+        upstream = "external backend"
+    else:
+        fake_config = FakeLLMConfig(
+            latency_distribution=args.latency,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            user_info_turns=len(INFO_MESSAGES)
+        )
+        fake_port = find_free_port()
+        
+        # Settings are read at import time, so point them at the fake server before importing the app
+        os.environ["AZURE_OPENAI_ENDPOINT_OVERRIDE"] = f"http://127.0.0.1:{fake_port}"
+        from backend.main import app
+        
+        with FakeServerThread(create_fake_app(config=fake_config), port=fake_port), FakeServerThread(app) as backend:
+            test = LoadTest(backend.url, args.sessions, args.concurrency, args.qa_turns,
+                            args.max_info_turns, args.vary_questions)
+            elapsed = asyncio.run(test.run())
+        upstream = f"fake ({args.latency}, {args.latency_ms:.0f} ms, errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%})"
+    
+    report = test.report(elapsed)
+    print_report(report, upstream)
+    
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
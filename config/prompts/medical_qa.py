@@ -5,17 +5,17 @@ This prompt handles medical service questions using user-specific context data.
 It provides accurate, personalized information based on the user's HMO and membership tier.
 """
 
+from typing import Optional
+from utils.helpers.context_loader import validate_user_context
+
+# Static instructions and the medical context come first and the per-user details last, so every user of the
+# same HMO, tier and language shares the prompt prefix and upstream prompt caching can reuse it. With context
+# retrieval on (the default) the context starts with a per-HMO/tier benefits summary and only the categories
+# after it are selected per question, so the shared prefix (~1,100-1,400 tokens) stays above Azure's
+# 1,024-token caching minimum.
 MEDICAL_QA_PROMPT_TEMPLATE = """
 אתה מומחה בשירותי בריאות בישראל. אתה עונה על שאלות לגבי שירותים רפואיים בהתבסס על הנתונים הספציפיים של המשתמש.
 
-**פרטי המשתמש:**
-- שם: {user_name}
-- קופת חולים: {hmo_name}
-- רמת חברות: {membership_tier}
-
-**ההקשר הרפואי הרלוונטי למשתמש זה:**
-{medical_context}
-
 **כללי התנהגות:**
 1. **מידע מדויק**: התבסס רק על הנתונים הרלוונטיים למשתמש הספציפי
 2. **תשובות ברורות**: תן תשובות פרקטיות וקונקרטיות
@@ -36,6 +36,14 @@ MEDICAL_QA_PROMPT_TEMPLATE = """
 **אם השאלה לא רלוונטי להקשר:**
 "אני מתמחה במידע על השירותים הרפואיים הזמינים לך דרך {hmo_name}. האם תוכל לשאול על נושא רפואי ספציפי?"
 
+**ההקשר הרפואי הרלוונטי למשתמש זה ({hmo_name}, {membership_tier}):**
+{medical_context}
+
+**פרטי המשתמש:**
+- שם: {user_name}
+- קופת חולים: {hmo_name}
+- רמת חברות: {membership_tier}
+
 עכשיו ענה על השאלה של המשתמש בהתבסס על הנתונים שלו.
 """
 
@@ -43,14 +51,6 @@ MEDICAL_QA_PROMPT_TEMPLATE = """
 MEDICAL_QA_PROMPT_TEMPLATE_EN = """
 You are an expert in Israeli healthcare services. You answer questions about medical services based on the user's specific data.
 
-**User Details:**
-- Name: {user_name}
-- HMO: {hmo_name}
-- Membership Tier: {membership_tier}
-
-**Relevant Medical Context for this User:**
-{medical_context}
-
 **Behavior Rules:**
 1. **Accurate information**: Base answers only on data relevant to this specific user
 2. **Clear responses**: Provide practical and concrete answers
@@ -63,17 +63,121 @@ You are an expert in Israeli healthcare services. You answer questions about med
 - Don't give personal medical advice
 - Always emphasize this is general information and to verify with the HMO
 
+**Relevant Medical Context for this User ({hmo_name}, {membership_tier}):**
+{medical_context}
+
+**User Details:**
+- Name: {user_name}
+- HMO: {hmo_name}
+- Membership Tier: {membership_tier}
+
 Now answer the user's question based on their data.
 """
 
-def build_medical_qa_prompt(user_info: dict, medical_context: str, language: str = "hebrew") -> str:
-    """Build the medical Q&A prompt with user-specific information."""
+HEBREW_LANGUAGES = ("he", "hebrew")
+
+def _template_for(language: str) -> str:
+    return MEDICAL_QA_PROMPT_TEMPLATE if language in HEBREW_LANGUAGES else MEDICAL_QA_PROMPT_TEMPLATE_EN
+
+class CompiledMedicalQAPrompt:
+    """
+    A medical Q&A template with the HMO and tier already filled in.
+    
+    The template is split around the medical context and the user name, so a
+    request only joins the pieces instead of formatting the whole prompt. The
+    prompt with the full context is prebuilt when the context is known; it is
+    used with RETRIEVAL_ENABLED=false and when retrieval falls back to the full
+    context (which returns the same string object), not for retrieved selections.
+    """
+    
+    def __init__(self, hmo_name: str, membership_tier: str, language: str, full_context: Optional[str] = None):
+        template = _template_for(language)
+        head, tail = template.split("{medical_context}")
+        tail_before_name, tail_after_name = tail.split("{user_name}")
+        
+        fill = {"hmo_name": hmo_name, "membership_tier": membership_tier}
+        self.head = head.format(**fill)
+        self.tail_before_name = tail_before_name.format(**fill)
+        self.tail_after_name = tail_after_name.format(**fill)
+        # Same tail without the user's name line, for prompts whose answers may be shared
+        name_line_start = self.tail_before_name.rfind("\n") + 1
+        self.tail_without_name = self.tail_before_name[:name_line_start] + self.tail_after_name.lstrip("\n")
+        self.full_context = full_context
+        self.head_with_full_context = self.head + full_context + self.tail_before_name if full_context is not None else None
+    
+    def render(self, user_name: Optional[str], medical_context: str) -> str:
+        """Fill the per-request slots; without a user name the name line is left out."""
+        if user_name is None:
+            return "".join((self.head, medical_context, self.tail_without_name))
+        if self.head_with_full_context is not None and medical_context is self.full_context:
+            return self.head_with_full_context + user_name + self.tail_after_name
+        return "".join((self.head, medical_context, self.tail_before_name, user_name, self.tail_after_name))
+
+class MedicalQAPromptStore:
+    """
+    Compiled medical Q&A prompts per (HMO, tier, language).
+    
+    Only supported HMO and tier combinations are kept, and languages fold to
+    Hebrew or English, so the store holds at most 3 x 3 x 2 prompts.
+    """
+    
+    def __init__(self):
+        self._prompts = {}
+    
+    def compile(self, contexts: dict, languages=("he", "en")) -> int:
+        """
+        Compile prompts for every (HMO, tier) context and language.
+        
+        Args:
+            contexts: Mapping of (hmo_name, membership_tier) to the full medical context
+            languages: Language codes to compile
+        
+        Returns:
+            Number of compiled prompts
+        """
+        
+        self._prompts = {
+            (hmo, tier, "he" if language in HEBREW_LANGUAGES else "en"): CompiledMedicalQAPrompt(hmo, tier, language, context)
+            for (hmo, tier), context in contexts.items()
+            for language in languages
+        }
+        return len(self._prompts)
+    
+    def get(self, hmo_name: str, membership_tier: str, language: str) -> CompiledMedicalQAPrompt:
+        """
+        Get the compiled prompt, compiling it (without a prebuilt full context) if missing.
+        
+        Prompts for unsupported HMO or tier values are compiled for the call but not stored.
+        """
+        key = (hmo_name, membership_tier, "he" if language in HEBREW_LANGUAGES else "en")
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            prompt = CompiledMedicalQAPrompt(hmo_name, membership_tier, language)
+            if validate_user_context(hmo_name, membership_tier):
+                self._prompts[key] = prompt
+        return prompt
+    
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+# Global compiled prompts, built in the application lifespan
+medical_qa_prompts = MedicalQAPromptStore()
+
+def build_medical_qa_prompt(user_info: dict, medical_context: str, language: str = "he", include_personal_details: bool = True) -> str:
+    """
+    Build the medical Q&A prompt with user-specific information.
+    
+    With include_personal_details=False the prompt carries only the HMO and
+    tier, so its answer can be shared with other users of the same plan.
+    """
     
-    template = MEDICAL_QA_PROMPT_TEMPLATE if language == "hebrew" else MEDICAL_QA_PROMPT_TEMPLATE_EN
+    prompt = medical_qa_prompts.get(
+        user_info.get('hmo_name', ''),
+        user_info.get('membership_tier', ''),
+        language
+    )
     
-    return template.format(
-        user_name=f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip(),
-        hmo_name=user_info.get('hmo_name', ''),
-        membership_tier=user_info.get('membership_tier', ''),
+    return prompt.render(
+        user_name=f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip() if include_personal_details else None,
         medical_context=medical_context
-    )
\ No newline at end of file
+    )
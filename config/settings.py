@@ -23,16 +23,80 @@ class Settings:
     AZURE_OPENAI_MINI_API_KEY: str = os.getenv("AZURE_OPENAI_MINI_API_KEY")
     AZURE_OPENAI_MINI_API_VERSION: str = os.getenv("AZURE_OPENAI_MINI_API_VERSION", "2024-02-01")
     
+    # Route both deployments to one endpoint (e.g. the local fake server in benchmarks/)
+    AZURE_OPENAI_ENDPOINT_OVERRIDE: str = os.getenv("AZURE_OPENAI_ENDPOINT_OVERRIDE", "")
+    
     # Model Configuration
     GPT_4O_DEPLOYMENT_NAME: str = os.getenv("GPT_4O_DEPLOYMENT_NAME", "gpt-4o")
     GPT_4O_MINI_DEPLOYMENT_NAME: str = os.getenv("GPT_4O_MINI_DEPLOYMENT_NAME", "gpt-4o-mini")
     
+    # Medical Q&A model routing: "auto" sends simple questions to GPT-4o Mini, or pin "gpt-4o" / "gpt-4o-mini"
+    MEDICAL_QA_ROUTING_POLICY: str = os.getenv("MEDICAL_QA_ROUTING_POLICY", "auto")
+    ROUTING_MINI_MAX_WORDS: int = int(os.getenv("ROUTING_MINI_MAX_WORDS", "20"))
+    
     # Azure OpenAI Parameters
     USER_INFO_MAX_TOKENS: int = int(os.getenv("USER_INFO_MAX_TOKENS", "1500"))
     USER_INFO_TEMPERATURE: float = float(os.getenv("USER_INFO_TEMPERATURE", "0.3"))
     MEDICAL_QA_MAX_TOKENS: int = int(os.getenv("MEDICAL_QA_MAX_TOKENS", "8000"))
     MEDICAL_QA_TEMPERATURE: float = float(os.getenv("MEDICAL_QA_TEMPERATURE", "0.1"))
     
+    # Medical Q&A output budget per question type; answers cut off at the budget are retried with a doubled
+    # budget (up to MEDICAL_QA_MAX_TOKENS)
+    OUTPUT_BUDGET_ENABLED: bool = os.getenv("OUTPUT_BUDGET_ENABLED", "true").lower() == "true"
+    MEDICAL_QA_LOOKUP_MAX_TOKENS: int = int(os.getenv("MEDICAL_QA_LOOKUP_MAX_TOKENS", "600"))
+    MEDICAL_QA_EXPLANATION_MAX_TOKENS: int = int(os.getenv("MEDICAL_QA_EXPLANATION_MAX_TOKENS", "1200"))
+    MEDICAL_QA_COMPARISON_MAX_TOKENS: int = int(os.getenv("MEDICAL_QA_COMPARISON_MAX_TOKENS", "2000"))
+    OUTPUT_BUDGET_MAX_ESCALATIONS: int = int(os.getenv("OUTPUT_BUDGET_MAX_ESCALATIONS", "2"))
+    
+    # Prompt token budgets (system prompt + context + history); older turns beyond the budget are collapsed
+    USER_INFO_PROMPT_TOKEN_BUDGET: int = int(os.getenv("USER_INFO_PROMPT_TOKEN_BUDGET", "4000"))
+    MEDICAL_QA_PROMPT_TOKEN_BUDGET: int = int(os.getenv("MEDICAL_QA_PROMPT_TOKEN_BUDGET", "12000"))
+    
+    # Request usage (incl. cached prompt tokens) on streamed responses; needs API version 2024-09-01-preview or later
+    AZURE_OPENAI_STREAM_USAGE: bool = os.getenv("AZURE_OPENAI_STREAM_USAGE", "false").lower() == "true"
+    
+    # Token prices for cost accounting (USD per 1M tokens)
+    GPT_4O_INPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_INPUT_PRICE_PER_1M", "2.50"))
+    GPT_4O_CACHED_INPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_CACHED_INPUT_PRICE_PER_1M", "1.25"))
+    GPT_4O_OUTPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_OUTPUT_PRICE_PER_1M", "10.00"))
+    GPT_4O_MINI_INPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_MINI_INPUT_PRICE_PER_1M", "0.15"))
+    GPT_4O_MINI_CACHED_INPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_MINI_CACHED_INPUT_PRICE_PER_1M", "0.075"))
+    GPT_4O_MINI_OUTPUT_PRICE_PER_1M: float = float(os.getenv("GPT_4O_MINI_OUTPUT_PRICE_PER_1M", "0.60"))
+    
+    # Azure OpenAI Resilience (timeouts, retries, circuit breaker)
+    AZURE_OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("AZURE_OPENAI_TIMEOUT_SECONDS", "60"))
+    AZURE_OPENAI_MAX_RETRIES: int = int(os.getenv("AZURE_OPENAI_MAX_RETRIES", "2"))
+    AZURE_OPENAI_RETRY_BASE_SECONDS: float = float(os.getenv("AZURE_OPENAI_RETRY_BASE_SECONDS", "0.5"))
+    AZURE_OPENAI_MAX_RETRY_DELAY_SECONDS: float = float(os.getenv("AZURE_OPENAI_MAX_RETRY_DELAY_SECONDS", "10"))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_RESET_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", "30"))
+    
+    # Per-deployment quota scheduling (0 disables the limit)
+    GPT_4O_TPM_LIMIT: int = int(os.getenv("GPT_4O_TPM_LIMIT", "0"))
+    GPT_4O_RPM_LIMIT: int = int(os.getenv("GPT_4O_RPM_LIMIT", "0"))
+    GPT_4O_MINI_TPM_LIMIT: int = int(os.getenv("GPT_4O_MINI_TPM_LIMIT", "0"))
+    GPT_4O_MINI_RPM_LIMIT: int = int(os.getenv("GPT_4O_MINI_RPM_LIMIT", "0"))
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "100"))
+    SCHEDULER_MAX_WAIT_SECONDS: float = float(os.getenv("SCHEDULER_MAX_WAIT_SECONDS", "10"))
+    
+    # Context retrieval: send only the service categories relevant to the question
+    RETRIEVAL_ENABLED: bool = os.getenv("RETRIEVAL_ENABLED", "true").lower() == "true"
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "2"))
+    
+    # Answer greetings, thanks and off-topic messages with canned replies instead of GPT-4o
+    SMALL_TALK_ENABLED: bool = os.getenv("SMALL_TALK_ENABLED", "true").lower() == "true"
+    
+    # Answer simple benefit/phone/category questions from templates instead of GPT-4o
+    FAST_PATH_ENABLED: bool = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    
+    # Coalesce identical in-flight Azure OpenAI requests into one upstream call
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    
+    # Answer Cache Configuration (exact-match medical Q&A answers)
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+    ANSWER_CACHE_TTL_SECONDS: int = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+    
     # Application Configuration
     APP_HOST: str = os.getenv("APP_HOST", "localhost")
     APP_PORT: int = int(os.getenv("APP_PORT", "8000"))
@@ -42,6 +106,7 @@ class Settings:
     
     # Data Configuration
     DATA_FOLDER: str = os.getenv("DATA_FOLDER", "user_specific_data")
+    SERVICE_JSONS_FOLDER: str = os.getenv("SERVICE_JSONS_FOLDER", "preprocessing/jsons")
     
     # Language Configuration
     DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "he")
@@ -52,6 +117,21 @@ class Settings:
     LOG_MAX_SIZE_MB: int = int(os.getenv("LOG_MAX_SIZE_MB", "10"))
     LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
     
+    # Per-request stage spans (Server-Timing header, access log) and optional OTLP/JSON export, e.g. logs/traces.jsonl
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_EXPORT_FILE: str = os.getenv("TRACE_EXPORT_FILE", "")
+    
+    # Expose Prometheus metrics on /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
+    # Per-event sampling of high-volume INFO records, e.g. "api_access=0.1,user_interaction=0.5" (unset = log all)
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+    
+    # Write logs from a background thread through a bounded queue (false = write synchronously)
+    LOG_ASYNC_ENABLED: bool = os.getenv("LOG_ASYNC_ENABLED", "true").lower() == "true"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "100"))
+    
     # Derived Configuration Properties
     @property
     def BACKEND_URL(self) -> str:
@@ -64,11 +144,21 @@ class Settings:
         return {
             "health": f"/api/{self.API_VERSION}/health",
             "user_info": f"/api/{self.API_VERSION}/user-info-collection", 
-            "medical_qa": f"/api/{self.API_VERSION}/medical-qa"
+            "medical_qa": f"/api/{self.API_VERSION}/medical-qa",
+            "medical_qa_stream": f"/api/{self.API_VERSION}/medical-qa/stream",
+            "benefits": f"/api/{self.API_VERSION}/benefits",
+            "benefit_categories": f"/api/{self.API_VERSION}/benefits/categories"
         }
     
     def validate_azure_config(self) -> dict:
         """Validate that required Azure OpenAI configuration is properly set."""
+        if self.AZURE_OPENAI_ENDPOINT_OVERRIDE:
+            return {
+                'valid': True,
+                'invalid_fields': [],
+                'message': f"Azure OpenAI endpoint override active: {self.AZURE_OPENAI_ENDPOINT_OVERRIDE}"
+            }
+        
         required_fields = {
             'AZURE_OPENAI_ENDPOINT': self.AZURE_OPENAI_ENDPOINT,
             'AZURE_OPENAI_API_KEY': self.AZURE_OPENAI_API_KEY,
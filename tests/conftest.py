@@ -0,0 +1,15 @@
+"""
+Shared test setup.
+
+Tests never reach Azure OpenAI: the clients point at an unused local port,
+so only code paths that answer locally (or fail fast) are exercised.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT_OVERRIDE", "http://127.0.0.1:9")
+os.environ.setdefault("LOG_ASYNC_ENABLED", "false")
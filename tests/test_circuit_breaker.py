@@ -0,0 +1,76 @@
+"""Tests for the per-deployment circuit breaker."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from backend.services.resilience import CircuitBreaker, CircuitOpenError
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=30.0)
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout_seconds
+    return breaker
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = _half_open_breaker()
+    
+    assert breaker.allow_request() == (True, True)
+    assert breaker.allow_request() == (False, False)
+    
+    breaker.release_probe()
+    assert breaker.allow_request() == (True, True)
+
+
+def test_closed_breaker_calls_are_not_probes():
+    breaker = CircuitBreaker("test")
+    assert breaker.allow_request() == (True, False)
+
+
+def test_call_admitted_before_opening_does_not_release_the_probe():
+    from backend.services import azure_openai_service
+    
+    deployment = "test-half-open"
+    breaker = azure_openai_service._get_circuit_breaker(deployment)
+    release = asyncio.Event()
+    
+    async def create(**kwargs):
+        await release.wait()
+        return SimpleNamespace(choices=[])
+    
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    
+    async def scenario():
+        call = lambda: azure_openai_service._create_with_resilience(client, deployment, messages=[], max_tokens=1)
+        
+        # A normal call is in flight when the breaker opens and turns half-open
+        normal = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout_seconds
+        
+        probe = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        
+        # The normal call ends without a verdict while the probe is still out
+        normal.cancel()
+        await asyncio.gather(normal, return_exceptions=True)
+        
+        # A second probe would block on the stub, so bound the wait
+        rejected = None
+        try:
+            await asyncio.wait_for(call(), timeout=1.0)
+        except CircuitOpenError as e:
+            rejected = e
+        except asyncio.TimeoutError:
+            pass
+        assert rejected is not None
+        
+        release.set()
+        await probe
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+"""Tests for category-level context retrieval."""
+
+from config.prompts.medical_qa import CompiledMedicalQAPrompt
+from utils.helpers.context_loader import load_user_medical_context
+from utils.helpers.context_retrieval import retrieve_relevant_context, summarize_context
+from utils.helpers.token_budget import estimate_tokens
+
+# Azure OpenAI only caches prompt prefixes of at least this many tokens
+PROMPT_CACHING_MIN_TOKENS = 1024
+
+
+def test_summary_lists_every_service_benefit():
+    context = load_user_medical_context("מכבי", "זהב")
+    summary = summarize_context(context)
+    assert "- דיקור סיני (אקופונקטורה): 70% הנחה, עד 20 טיפולים בשנה" in summary
+    assert "- עדשות מגע: 60% הנחה, כולל ערכת טיפול שנתית" in summary
+    assert "אתר: https://www.maccabi4u.co.il/complementary-medicine" in summary
+
+
+def test_retrieved_prompts_share_a_cacheable_prefix():
+    context = load_user_medical_context("מאוחדת", "ארד")
+    first = retrieve_relevant_context(context, "כמה עולה דיקור סיני?", [])
+    second = retrieve_relevant_context(context, "how much are contact lenses?", [])
+    assert first.selected_categories != second.selected_categories
+    
+    for language in ("he", "en"):
+        prompt = CompiledMedicalQAPrompt("מאוחדת", "ארד", language)
+        first_prompt = prompt.render(None, first.context)
+        second_prompt = prompt.render(None, second.context)
+        shared = 0
+        while first_prompt[shared] == second_prompt[shared]:
+            shared += 1
+        assert estimate_tokens(first_prompt[:shared]) >= PROMPT_CACHING_MIN_TOKENS
@@ -0,0 +1,33 @@
+"""Tests for the Q&A fast-path intent classifier."""
+
+import pytest
+from backend.services.intent_classifier import intent_classifier, SERVICE_BENEFIT_INTENT
+
+HMO, TIER = "מכבי", "זהב"
+
+
+def test_plain_benefit_question_is_answered_locally():
+    match = intent_classifier.try_fast_path("כמה הנחה יש על עדשות מגע?", HMO, TIER, "he")
+    assert match is not None
+    assert match.intent == SERVICE_BENEFIT_INTENT
+    assert match.service_name == "עדשות מגע"
+
+
+def test_english_questions_go_to_the_llm():
+    assert intent_classifier.try_fast_path("How much is acupuncture?", HMO, TIER, "en") is None
+
+
+@pytest.mark.parametrize("message", [
+    "כמה עולה דיקור סיני לאחר ניתוח?",
+    "כמה הנחה יש על עדשות מגע לילדים?",
+    "כמה עולה דיקור סיני בגיל 70?",
+    "אילו שירותים יש במרפאות השיניים לילדים?",
+])
+def test_qualified_questions_go_to_the_llm(message):
+    assert intent_classifier.try_fast_path(message, HMO, TIER, "he") is None
+
+
+def test_qualifier_that_is_part_of_the_service_name_is_allowed():
+    match = intent_classifier.try_fast_path("כמה עולה טיפול בילדים באופטומטריה?", HMO, TIER, "he")
+    assert match is not None
+    assert match.service_name == "טיפול בילדים"
@@ -0,0 +1,16 @@
+"""Tests for the compiled medical Q&A prompt."""
+
+from config.prompts.medical_qa import build_medical_qa_prompt
+
+USER_INFO = {"hmo_name": "מכבי", "membership_tier": "זהב", "first_name": "דני", "last_name": "כהן"}
+
+
+def test_prompt_includes_user_name_by_default():
+    assert "דני כהן" in build_medical_qa_prompt(USER_INFO, "CONTEXT", "he")
+
+
+def test_shareable_prompt_has_no_personal_details():
+    for language in ("he", "en"):
+        prompt = build_medical_qa_prompt(USER_INFO, "CONTEXT", language, include_personal_details=False)
+        assert "דני" not in prompt and "כהן" not in prompt
+        assert "CONTEXT" in prompt and "מכבי" in prompt and "זהב" in prompt
@@ -0,0 +1,25 @@
+"""Tests for medical Q&A model routing."""
+
+import pytest
+from backend.services.model_router import ModelRouter, GPT4O_POLICY, GPT4O_MINI_POLICY
+
+
+@pytest.mark.parametrize("question", [
+    "מה ההבדל בין שיאצו לרפלקסולוגיה?",
+    "מה עדיף, דיקור סיני או כירופרקטיקה?",
+    "השוואה בין זהב לכסף בעדשות מגע",
+    "which is better, shiatsu or reflexology?",
+])
+def test_comparisons_of_two_items_go_to_gpt4o(question):
+    decision = ModelRouter().route(question)
+    assert decision.model == GPT4O_POLICY
+    assert decision.reason == "comparison"
+
+
+@pytest.mark.parametrize("question", [
+    "כמה עולה יישור שיניים במולטיפוקל?",
+    "האם כדאי לקבוע תור מוקדם לבדיקת ראייה?",
+    "is it better to book early for an eye exam?",
+])
+def test_comparison_cue_without_two_items_stays_on_mini(question):
+    assert ModelRouter().route(question).model == GPT4O_MINI_POLICY
@@ -0,0 +1,45 @@
+"""Tests for the per-deployment request scheduler."""
+
+import asyncio
+import pytest
+from backend.services.rate_limiter import DeploymentScheduler, SchedulerOverloadedError
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    scheduler = DeploymentScheduler("test", rpm_limit=1, window_seconds=0.05, max_wait_seconds=1.0)
+    admitted = []
+    
+    async def request(name):
+        await scheduler.acquire(1)
+        admitted.append(name)
+    
+    async def scenario():
+        await asyncio.gather(*(request(name) for name in "abcd"))
+    
+    asyncio.run(scenario())
+    assert admitted == list("abcd")
+    assert scheduler.queued_requests == 3
+
+
+def test_timed_out_and_cancelled_waiters_do_not_block_the_queue():
+    scheduler = DeploymentScheduler("test", rpm_limit=1, window_seconds=0.2, max_wait_seconds=0.3)
+    
+    async def scenario():
+        await scheduler.acquire(1)
+        head = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        # Behind the head, the next slot is past its deadline
+        with pytest.raises(SchedulerOverloadedError):
+            await asyncio.gather(head, scheduler.acquire(1))
+        await head
+        
+        cancelled = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        
+        await asyncio.wait_for(scheduler.acquire(1), timeout=1.0)
+        assert scheduler.waiting == 0
+        assert not scheduler._waiters
+    
+    asyncio.run(scenario())
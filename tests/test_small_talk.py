@@ -0,0 +1,42 @@
+"""Tests for local small-talk classification."""
+
+import pytest
+from fastapi.testclient import TestClient
+from utils.helpers.small_talk import classify_small_talk, GREETING
+from utils.search.hebrew import word_variants
+
+USER_INFO = {
+    "first_name": "דני",
+    "last_name": "כהן",
+    "id_number": "123456782",
+    "gender": "זכר",
+    "age": 30,
+    "hmo_name": "מכבי",
+    "hmo_card_number": "123456789",
+    "membership_tier": "זהב"
+}
+
+
+def test_word_variants_of_empty_word():
+    assert word_variants("") == set()
+
+
+@pytest.mark.parametrize("message", ["כמה עולה דיקור ־ סיני?", "־", "ְ"])
+def test_standalone_maqaf_or_niqqud_is_not_small_talk(message):
+    assert classify_small_talk(message) is None
+
+
+def test_standalone_maqaf_between_small_talk_words():
+    assert classify_small_talk("שלום ־ שלום") == GREETING
+
+
+def test_medical_qa_question_with_standalone_maqaf():
+    from backend.main import app
+    
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/medical-qa",
+            json={"message": "כמה עולה דיקור ־ סיני?", "user_info": USER_INFO}
+        )
+    
+    assert response.status_code == 200
@@ -1,12 +1,31 @@
 """Helper utilities for the medical chatbot system."""
 
-from .context_loader import load_user_medical_context, get_available_contexts, validate_user_context
+from .context_loader import (
+    load_user_medical_context,
+    get_available_contexts,
+    validate_user_context,
+    MedicalContextStore,
+    medical_context_store
+)
 from .language_utils import detect_language_from_text, get_error_message
+from .token_budget import estimate_tokens, fit_history_to_budget, HistoryWindow
+from .context_retrieval import retrieve_relevant_context, RetrievalResult
+from .small_talk import classify_small_talk, get_small_talk_response, small_talk_stats
 
 __all__ = [
     'load_user_medical_context', 
     'get_available_contexts', 
     'validate_user_context',
+    'MedicalContextStore',
+    'medical_context_store',
     'detect_language_from_text',
-    'get_error_message'
+    'get_error_message',
+    'estimate_tokens',
+    'fit_history_to_budget',
+    'HistoryWindow',
+    'retrieve_relevant_context',
+    'RetrievalResult',
+    'classify_small_talk',
+    'get_small_talk_response',
+    'small_talk_stats'
 ]
\ No newline at end of file
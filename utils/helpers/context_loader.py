@@ -5,7 +5,9 @@ Utility to load user-specific medical service data for prompt injection.
 """
 
 import os
-from typing import Optional
+import time
+import hashlib
+from typing import Optional, Dict, Tuple, Any
 
 def load_user_medical_context(hmo_name: str, membership_tier: str, data_folder: str = "user_specific_data") -> Optional[str]:
     """
@@ -77,4 +79,88 @@ def validate_user_context(hmo_name: str, membership_tier: str) -> bool:
     valid_hmos = ["מכבי", "מאוחדת", "כללית"]
     valid_tiers = ["זהב", "כסף", "ארד"]
     
-    return hmo_name in valid_hmos and membership_tier in valid_tiers
\ No newline at end of file
+    return hmo_name in valid_hmos and membership_tier in valid_tiers
+
+class MedicalContextStore:
+    """
+    In-memory store of all HMO x tier medical contexts.
+    
+    Contexts are read from disk once (at application startup) and then served
+    from a dictionary, keeping file system access off the request path.
+    """
+    
+    def __init__(self):
+        self._contexts: Dict[Tuple[str, str], str] = {}
+        self.data_folder: Optional[str] = None
+        self.loaded = False
+        self.total_bytes = 0
+        self.load_time_ms = 0.0
+        self.version = ""
+    
+    def load(self, data_folder: str = "user_specific_data") -> int:
+        """
+        Load every available context file into memory, replacing current contents.
+        
+        Args:
+            data_folder: Folder containing user-specific data files
+            
+        Returns:
+            Number of contexts loaded
+        """
+        
+        start_time = time.perf_counter()
+        contexts = {}
+        total_bytes = 0
+        digest = hashlib.sha256()
+        
+        for hmo, tier in sorted(get_available_contexts(data_folder)):
+            context = load_user_medical_context(hmo, tier, data_folder)
+            if context is None:
+                continue
+            
+            contexts[(hmo, tier)] = context
+            encoded = context.encode('utf-8')
+            total_bytes += len(encoded)
+            digest.update(f"{hmo}_{tier}".encode('utf-8'))
+            digest.update(encoded)
+        
+        self._contexts = contexts
+        self.data_folder = data_folder
+        self.total_bytes = total_bytes
+        self.version = digest.hexdigest()[:12]
+        self.load_time_ms = (time.perf_counter() - start_time) * 1000
+        self.loaded = True
+        
+        return len(contexts)
+    
+    def get(self, hmo_name: str, membership_tier: str) -> Optional[str]:
+        """
+        Get the medical context for an HMO and tier combination.
+        
+        Loads the store on first use if it was not loaded at startup.
+        
+        Returns:
+            Medical context string or None if combination is not available
+        """
+        
+        if not self.loaded:
+            self.load(self.data_folder or "user_specific_data")
+        
+        return self._contexts.get((hmo_name, membership_tier))
+    
+    def available_contexts(self) -> list:
+        """Get list of (hmo, tier) tuples held in the store."""
+        return list(self._contexts.keys())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get store size and load statistics."""
+        return {
+            "loaded": self.loaded,
+            "contexts": len(self._contexts),
+            "total_bytes": self.total_bytes,
+            "load_time_ms": round(self.load_time_ms, 2),
+            "version": self.version
+        }
+
+# Global context store instance, loaded in the application lifespan
+medical_context_store = MedicalContextStore()
@@ -0,0 +1,170 @@
+"""
+Category-level retrieval over user-specific medical context.
+
+Splits a context file into its service categories (the `## ` / `**service:**`
+structure emitted by preprocessing/generate_user_data.py), scores each
+category against the question and recent history with the service search
+index, and keeps only the most relevant ones. Falls back to the full context
+when nothing scores.
+
+A selection starts with a summary of every category (each service's benefit
+and the booking contacts), which is the same for every question of an HMO and
+tier, so the prompt prefix shared between questions is long enough for
+upstream prompt caching and omitted categories are still covered briefly.
+"""
+
+import re
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple
+from utils.helpers.token_budget import estimate_tokens
+from utils.search import service_index
+
+CATEGORY_SEPARATOR = "=" * 50
+
+# Minimum score for a category to be selected, absolute and relative to the best category
+MIN_CATEGORY_SCORE = 1.0
+RELATIVE_SCORE_CUTOFF = 0.5
+
+# Weight of recent user messages relative to the current question
+HISTORY_WEIGHT = 0.5
+HISTORY_USER_MESSAGES = 2
+
+SUMMARY_TITLE = "### סיכום ההטבות בכל הקטגוריות (פירוט מלא לקטגוריות הרלוונטיות בהמשך):"
+SERVICE_LINE = re.compile(r'^\*\*(.+?):?\*\*:?$')
+BENEFIT_PREFIX = "הטבות:"
+DESCRIPTION_SECTION = "### תיאור כללי"
+CONTACT_SECTIONS = ("### מספרי טלפון", "### מידע נוסף")
+
+@dataclass
+class ContextCategory:
+    """One service category of a context file."""
+    title: str
+    text: str
+
+@dataclass
+class RetrievalResult:
+    """Context selected for a question."""
+    context: str
+    selected_categories: List[str] = field(default_factory=list)
+    fallback: bool = False
+    full_context_tokens: int = 0
+    context_tokens: int = 0
+
+@lru_cache(maxsize=32)
+def split_context(medical_context: str) -> Tuple[str, Tuple[ContextCategory, ...]]:
+    """
+    Split a context file into its header and service categories.
+    
+    Args:
+        medical_context: Full user-specific context text
+    
+    Returns:
+        Tuple of (header, categories)
+    """
+    
+    parts = re.split(r'^(?=## )', medical_context, flags=re.MULTILINE)
+    header = parts[0].strip()
+    
+    categories = []
+    for part in parts[1:]:
+        text = part.strip()
+        if text.endswith(CATEGORY_SEPARATOR):
+            text = text[:-len(CATEGORY_SEPARATOR)].rstrip()
+        
+        title = text.splitlines()[0][3:].strip()
+        categories.append(ContextCategory(title=title, text=text))
+    
+    return header, tuple(categories)
+
+@lru_cache(maxsize=32)
+def summarize_context(medical_context: str) -> str:
+    """
+    Condense a context file to each category's opening sentence, each service's
+    benefit and each category's contacts.
+    
+    Args:
+        medical_context: Full user-specific context text
+    
+    Returns:
+        Summary text, identical for every question of the same context
+    """
+    
+    _, categories = split_context(medical_context)
+    lines = [SUMMARY_TITLE]
+    for category in categories:
+        lines.append(f"**{category.title}:**")
+        service = None
+        description_pending = in_contacts = False
+        for line in category.text.splitlines()[1:]:
+            line = line.strip()
+            if line.startswith("###"):
+                description_pending = line.startswith(DESCRIPTION_SECTION)
+                in_contacts = line.startswith(CONTACT_SECTIONS)
+                continue
+            match = SERVICE_LINE.match(line)
+            if description_pending and line:
+                # Only the opening sentence of the general description
+                lines.append(line.split(". ")[0].rstrip(".") + ".")
+                description_pending = False
+            elif match:
+                service = match.group(1)
+            elif line.startswith(BENEFIT_PREFIX) and service:
+                lines.append(f"- {service}: {line[len(BENEFIT_PREFIX):].strip()}")
+            # Contact lines carry a value after the colon; section intros end with it
+            elif in_contacts and ":" in line and not line.endswith(":"):
+                lines.append(line)
+    return "\n".join(lines)
+
+def retrieve_relevant_context(
+    medical_context: str,
+    question: str,
+    history: List[Dict[str, str]],
+    top_k: int = 2
+) -> RetrievalResult:
+    """
+    Select the service categories relevant to a question.
+    
+    Args:
+        medical_context: Full user-specific context text
+        question: Current user question
+        history: Previous conversation messages as role/content dicts
+        top_k: Maximum number of categories to keep
+    
+    Returns:
+        RetrievalResult with the reduced context (or the full context on fallback)
+    """
+    
+    full_tokens = estimate_tokens(medical_context)
+    header, categories = split_context(medical_context)
+    
+    if not categories or top_k <= 0:
+        return RetrievalResult(context=medical_context, fallback=True, full_context_tokens=full_tokens, context_tokens=full_tokens)
+    
+    # The current question counts fully, recent user messages partially
+    recent_user_messages = [msg["content"] for msg in history if msg["role"] == "user"][-HISTORY_USER_MESSAGES:]
+    queries = [(message, HISTORY_WEIGHT) for message in recent_user_messages] + [(question, 1.0)]
+    title_scores: Dict[str, float] = service_index.category_scores(queries)
+    scores = [title_scores.get(category.title, 0.0) for category in categories]
+    
+    ranked = sorted(range(len(categories)), key=lambda index: scores[index], reverse=True)
+    threshold = max(MIN_CATEGORY_SCORE, scores[ranked[0]] * RELATIVE_SCORE_CUTOFF)
+    selected = [index for index in ranked[:top_k] if scores[index] >= threshold]
+    
+    if not selected or len(selected) == len(categories):
+        return RetrievalResult(context=medical_context, fallback=True, full_context_tokens=full_tokens, context_tokens=full_tokens)
+    
+    # Keep the original category order so the prompt reads like the source file
+    selected.sort()
+    omitted = [category.title for index, category in enumerate(categories) if index not in selected]
+    # The header and summary are stable per context and come first, so the prompt prefix is shared
+    blocks = [header, summarize_context(medical_context)] + [categories[index].text for index in selected]
+    blocks.append(f"(קטגוריות שמופיעות רק בסיכום: {', '.join(omitted)})")
+    context = f"\n\n{CATEGORY_SEPARATOR}\n\n".join(blocks)
+    
+    return RetrievalResult(
+        context=context,
+        selected_categories=[categories[index].title for index in selected],
+        full_context_tokens=full_tokens,
+        context_tokens=estimate_tokens(context)
+    )
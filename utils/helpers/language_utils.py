@@ -5,6 +5,9 @@ Simple language detection and multilingual error messages.
 import re
 from config.settings import settings
 
+HEBREW_CHAR_PATTERN = r'[\u0590-\u05FF]'
+ENGLISH_CHAR_PATTERN = r'[a-zA-Z]'
+
 def detect_language_from_text(text: str) -> str:
     """
     Detect if text is primarily Hebrew or English, with fallback to default.
@@ -20,12 +23,10 @@ def detect_language_from_text(text: str) -> str:
         return settings.DEFAULT_LANGUAGE
     
     # Count Hebrew characters
-    hebrew_pattern = r'[\u0590-\u05FF]'
-    hebrew_chars = len(re.findall(hebrew_pattern, text))
+    hebrew_chars = len(re.findall(HEBREW_CHAR_PATTERN, text))
     
     # Count English characters  
-    english_pattern = r'[a-zA-Z]'
-    english_chars = len(re.findall(english_pattern, text))
+    english_chars = len(re.findall(ENGLISH_CHAR_PATTERN, text))
     
     # Need at least some characters to decide
     if hebrew_chars == 0 and english_chars == 0:
@@ -54,10 +55,26 @@ ERROR_MESSAGES = {
         'he': 'שגיאה בחיבור לשירות. אנא נסה שוב.',
         'en': 'Service connection error. Please try again.'
     },
+    "service_unavailable": {
+        'he': 'השירות עמוס כרגע. אנא נסה שוב בעוד מספר רגעים.',
+        'en': 'The service is busy right now. Please try again in a few moments.'
+    },
     "invalid_user_info": {
         'he': 'הנתונים שסופקו אינם תקינים. אנא בדוק ונסה שוב.',
         'en': 'The provided information is invalid. Please check and try again.'
     },
+    "invalid_hmo_tier": {
+        'he': 'קופת החולים או רמת החברות אינן תקינות.',
+        'en': 'Invalid HMO or membership tier.'
+    },
+    "missing_benefit_query": {
+        'he': 'יש לציין קטגוריה, שירות או טקסט לחיפוש.',
+        'en': 'Please specify a category, a service or a search query.'
+    },
+    "unknown_category": {
+        'he': 'הקטגוריה המבוקשת אינה קיימת.',
+        'en': 'The requested category does not exist.'
+    },
     "context_load_error": {
         'he': 'שגיאה בטעינת נתוני השירותים הרפואיים.',
         'en': 'Error loading medical services data.'
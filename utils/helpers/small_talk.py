@@ -0,0 +1,210 @@
+"""
+Local greeting / off-topic detection for the medical Q&A phase.
+
+Greetings, thanks, farewells and clearly non-medical questions are
+recognised with the same Hebrew/English character ranges used for language
+detection plus small keyword lexicons, and answered with canned localized
+replies instead of a GPT-4o call. Acknowledgements ("ok", "סבבה") are only
+treated as thanks when the assistant did not just ask a question, and only
+short messages with no health or benefit terms are refused as off-topic.
+"""
+
+import re
+from typing import Dict, Set, Any, Optional
+from utils.helpers.language_utils import HEBREW_CHAR_PATTERN, ENGLISH_CHAR_PATTERN
+from utils.search import service_index
+from utils.search.hebrew import normalize_text, word_variants
+
+GREETING = "greeting"
+THANKS = "thanks"
+FAREWELL = "farewell"
+OFF_TOPIC = "off_topic"
+
+# Small talk is short; longer messages usually carry a real question
+MAX_SMALL_TALK_WORDS = 8
+
+# Longer messages that mention an off-topic word usually still ask something real
+MAX_OFF_TOPIC_WORDS = 8
+
+# A message scoring at least this much against the service index is medical
+MIN_MEDICAL_SCORE = 1.0
+
+WORD_PATTERN = re.compile(f"{HEBREW_CHAR_PATTERN}+|{ENGLISH_CHAR_PATTERN}+")
+
+SMALL_TALK_LEXICONS = {
+    GREETING: [
+        "שלום", "היי", "הי", "הלו", "אהלן", "בוקר", "ערב", "צהריים", "נשמע", "שלומך", "שלומכם",
+        "hi", "hello", "hey", "morning", "evening", "afternoon", "howdy", "greetings"
+    ],
+    THANKS: [
+        "תודה", "תודות", "תנקס",
+        "thanks", "thank", "thx", "ty", "appreciated"
+    ],
+    FAREWELL: [
+        "ביי", "להתראות", "יאללה",
+        "bye", "goodbye", "cya", "farewell"
+    ]
+}
+
+# Acknowledgements close a conversation as thanks, but answer the assistant's follow-up question otherwise
+ACKNOWLEDGEMENT_WORDS = [
+    "מעולה", "מצוין", "מושלם", "אחלה", "סבבה", "אוקיי", "בסדר",
+    "great", "perfect", "awesome", "cool", "ok", "okay"
+]
+
+# Words allowed around small-talk words without turning the message into a question
+FILLER_WORDS = [
+    "רבה", "מאוד", "לך", "לכם", "טוב", "טובה", "נעים", "מה", "יום", "גם", "על", "עזרה", "אתה", "את", "כבר", "שוב",
+    "you", "very", "much", "so", "there", "again", "a", "lot", "good", "day", "nice", "have", "all", "for",
+    "help", "the", "your", "see", "how", "are", "doing", "and", "it", "is", "that", "was", "helpful"
+]
+
+OFF_TOPIC_WORDS = [
+    "מזג", "גשם", "כדורגל", "כדורסל", "ספורט", "משחק", "מתכון", "בישול", "בדיחה", "סרט", "סרטים", "מוזיקה",
+    "פוליטיקה", "בחירות", "ממשלה", "מניות", "ביטקוין", "בורסה", "חדשות", "טיסה", "מלון", "מסעדה", "תכנות", "פייתון",
+    "weather", "rain", "football", "soccer", "basketball", "sport", "sports", "game", "recipe", "cooking", "joke",
+    "movie", "film", "song", "music", "politics", "election", "government", "stock", "stocks", "bitcoin", "crypto",
+    "news", "flight", "hotel", "restaurant", "programming", "python", "javascript"
+]
+
+# Medical vocabulary that the service index may not contain
+MEDICAL_WORDS = [
+    "רופא", "רופאה", "רפואה", "רפואי", "טיפול", "בדיקה", "תרופה", "מרפאה", "קופה", "כאב", "בריאות", "שירות", "תור",
+    "הנחה", "זכאות", "מחלה", "ניתוח", "פציעה", "נפצעתי", "פגיעה", "כואב", "ברך", "גב", "פיזיותרפיה", "החזר", "כיסוי",
+    "הטבה", "מגיע", "זכאי", "ביטוח",
+    "doctor", "medical", "medicine", "treatment", "clinic", "health", "hmo", "pain", "test", "exam", "appointment",
+    "coverage", "covered", "discount", "benefit", "service", "services", "disease", "surgery", "hurt", "injury",
+    "injured", "knee", "back", "physiotherapy", "physio", "therapy", "insurance", "refund", "entitled"
+]
+
+SMALL_TALK_RESPONSES = {
+    GREETING: {
+        'he': 'שלום! אני כאן לעזור לך במידע על השירותים הרפואיים הזמינים לך דרך {hmo_name}. על מה תרצה לשאול?',
+        'en': 'Hello! I am here to help with information about the medical services available to you through {hmo_name}. What would you like to know?'
+    },
+    THANKS: {
+        'he': 'בשמחה! אם יש לך שאלות נוספות על השירותים הרפואיים שלך ב{hmo_name}, אני כאן.',
+        'en': 'You are welcome! If you have more questions about your medical services at {hmo_name}, I am here.'
+    },
+    FAREWELL: {
+        'he': 'להתראות! אם תצטרך מידע נוסף על השירותים הרפואיים שלך ב{hmo_name}, אני כאן.',
+        'en': 'Goodbye! If you need more information about your medical services at {hmo_name}, I am here.'
+    },
+    OFF_TOPIC: {
+        'he': 'אני מתמחה במידע על השירותים הרפואיים הזמינים לך דרך {hmo_name}. האם תוכל לשאול על נושא רפואי ספציפי?',
+        'en': 'I specialize in information about the medical services available to you through {hmo_name}. Could you ask about a specific medical topic?'
+    }
+}
+
+def _normalized_words(words) -> Set[str]:
+    return {normalize_text(word) for word in words}
+
+_LEXICONS = {kind: _normalized_words(words) for kind, words in SMALL_TALK_LEXICONS.items()}
+_ACKNOWLEDGEMENT_WORDS = _normalized_words(ACKNOWLEDGEMENT_WORDS)
+_FILLER_WORDS = _normalized_words(FILLER_WORDS)
+_OFF_TOPIC_WORDS = _normalized_words(OFF_TOPIC_WORDS)
+_MEDICAL_WORDS = _normalized_words(MEDICAL_WORDS)
+
+def _matches(variants: Set[str], lexicon: Set[str]) -> bool:
+    return bool(variants & lexicon)
+
+def _looks_medical(text: str, variants_per_word) -> bool:
+    if any(_matches(variants, _MEDICAL_WORDS) for variants in variants_per_word):
+        return True
+    scores = service_index.category_scores([(text, 1.0)])
+    return any(score >= MIN_MEDICAL_SCORE for score in scores.values())
+
+def _is_question(message: Optional[str]) -> bool:
+    """Check whether an assistant message ends by asking the user something."""
+    return bool(message) and message.rstrip().endswith("?")
+
+def classify_small_talk(text: str, last_assistant_message: Optional[str] = None) -> Optional[str]:
+    """
+    Classify a message as greeting, thanks, farewell or off-topic.
+    
+    Args:
+        text: User message
+        last_assistant_message: Previous assistant turn, if any
+    
+    Returns:
+        Small-talk kind, or None when the message should go to the LLM
+    """
+    
+    # A standalone maqaf or niqqud mark normalizes to an empty word
+    words = [word for word in (normalize_text(word) for word in WORD_PATTERN.findall(text or "")) if word]
+    if not words:
+        return None
+    
+    variants_per_word = [word_variants(word) for word in words]
+    
+    # Pure small talk: every word is a small-talk or filler word
+    if len(words) <= MAX_SMALL_TALK_WORDS:
+        kinds = set()
+        only_small_talk = True
+        acknowledged = False
+        for variants in variants_per_word:
+            word_kinds = {kind for kind, lexicon in _LEXICONS.items() if _matches(variants, lexicon)}
+            if word_kinds:
+                kinds |= word_kinds
+            elif _matches(variants, _ACKNOWLEDGEMENT_WORDS):
+                acknowledged = True
+            elif not _matches(variants, _FILLER_WORDS):
+                only_small_talk = False
+                break
+        
+        # "ok" after a follow-up question is an answer to it, not the end of the conversation
+        if acknowledged and _is_question(last_assistant_message):
+            return None
+        if acknowledged and only_small_talk:
+            kinds.add(THANKS)
+        if only_small_talk and kinds:
+            for kind in (FAREWELL, THANKS, GREETING):
+                if kind in kinds:
+                    return kind
+    
+    # Off-topic: a short message with a non-medical topic word and nothing medical
+    if len(words) <= MAX_OFF_TOPIC_WORDS and any(_matches(variants, _OFF_TOPIC_WORDS) for variants in variants_per_word):
+        if not _looks_medical(text, variants_per_word):
+            return OFF_TOPIC
+    
+    return None
+
+def get_small_talk_response(kind: str, language: str, hmo_name: str) -> str:
+    """
+    Get the canned reply for a small-talk kind in the specified language.
+    
+    Args:
+        kind: Small-talk kind (e.g., 'greeting')
+        language: Language code
+        hmo_name: User's HMO, mentioned in the reply
+    
+    Returns:
+        Reply in requested language
+    """
+    message_dict = SMALL_TALK_RESPONSES.get(kind, SMALL_TALK_RESPONSES[OFF_TOPIC])
+    return message_dict.get(language, message_dict['he']).format(hmo_name=hmo_name)
+
+class SmallTalkStats:
+    """Counters for messages answered locally instead of by the LLM."""
+    
+    def __init__(self):
+        self.checked = 0
+        self.skipped_by_kind: Dict[str, int] = {}
+    
+    def record(self, kind: Optional[str]):
+        self.checked += 1
+        if kind:
+            self.skipped_by_kind[kind] = self.skipped_by_kind.get(kind, 0) + 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get skipped LLM call counts."""
+        skipped = sum(self.skipped_by_kind.values())
+        return {
+            "checked": self.checked,
+            "skipped_llm_calls": skipped,
+            "skip_ratio": round(skipped / self.checked, 4) if self.checked else 0.0,
+            "skipped_by_kind": dict(self.skipped_by_kind)
+        }
+
+# Global small-talk counters, reported in /health
+small_talk_stats = SmallTalkStats()
@@ -0,0 +1,152 @@
+"""
+Token budget management for chat prompts.
+
+Estimates prompt tokens and trims conversation history to a configurable budget,
+keeping the most recent turns and collapsing older ones into a short note.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict
+
+# Approximate characters per token for the GPT-4o tokenizer
+HEBREW_CHARS_PER_TOKEN = 2.5
+OTHER_CHARS_PER_TOKEN = 4.0
+
+# Fixed per-message overhead (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Maximum characters kept per user message in the collapsed history note
+COLLAPSED_MESSAGE_MAX_CHARS = 200
+
+HEBREW_PATTERN = re.compile(r'[\u0590-\u05FF]')
+
+@dataclass
+class HistoryWindow:
+    """Result of fitting a conversation into a token budget."""
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    prompt_tokens: int = 0
+    dropped_messages: int = 0
+    trimmed_tokens: int = 0
+    collapsed: bool = False
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+    
+    Hebrew characters tokenize more densely than Latin text, so they are
+    counted separately.
+    
+    Args:
+        text: Text to estimate
+    
+    Returns:
+        Estimated token count
+    """
+    
+    if not text:
+        return 0
+    
+    hebrew_chars = len(HEBREW_PATTERN.findall(text))
+    other_chars = len(text) - hebrew_chars
+    
+    return int(hebrew_chars / HEBREW_CHARS_PER_TOKEN + other_chars / OTHER_CHARS_PER_TOKEN) + 1
+
+def estimate_message_tokens(message: Dict[str, str]) -> int:
+    """Estimate tokens for a single chat message including overhead."""
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+def _collapse_note(dropped: List[Dict[str, str]], max_tokens: int) -> Dict[str, str]:
+    """
+    Collapse dropped messages into a single system note.
+    
+    Earlier user messages are kept (truncated) when they fit, since they carry
+    the facts the user already provided; otherwise only a count is kept.
+    """
+    
+    count_note = f"[{len(dropped)} earlier messages omitted to fit the context budget]"
+    
+    user_lines = [
+        f"- {msg['content'][:COLLAPSED_MESSAGE_MAX_CHARS]}"
+        for msg in dropped if msg["role"] == "user"
+    ]
+    if user_lines:
+        detailed_note = count_note + "\nEarlier user messages:\n" + "\n".join(user_lines)
+        if estimate_tokens(detailed_note) + MESSAGE_OVERHEAD_TOKENS <= max_tokens:
+            return {"role": "system", "content": detailed_note}
+    
+    return {"role": "system", "content": count_note}
+
+def fit_history_to_budget(
+    system_prompt: str,
+    history: List[Dict[str, str]],
+    user_message: str,
+    token_budget: int
+) -> HistoryWindow:
+    """
+    Build a message list that fits the token budget.
+    
+    The system prompt and current user message are always kept. History is
+    kept newest-first while it fits; older messages are collapsed into a
+    single note. The kept window always starts at a user message so no
+    assistant reply is left without its question.
+    
+    Args:
+        system_prompt: System prompt content
+        history: Previous conversation messages as role/content dicts
+        user_message: Current user message
+        token_budget: Maximum estimated prompt tokens (0 or less disables trimming)
+    
+    Returns:
+        HistoryWindow with the final messages and trimming statistics
+    """
+    
+    system_message = {"role": "system", "content": system_prompt}
+    current_message = {"role": "user", "content": user_message}
+    
+    history_tokens = [estimate_message_tokens(msg) for msg in history]
+    fixed_tokens = estimate_message_tokens(system_message) + estimate_message_tokens(current_message)
+    total_tokens = fixed_tokens + sum(history_tokens)
+    
+    if token_budget <= 0 or total_tokens <= token_budget:
+        return HistoryWindow(
+            messages=[system_message] + list(history) + [current_message],
+            prompt_tokens=total_tokens
+        )
+    
+    # Keep the most recent messages that fit
+    remaining = token_budget - fixed_tokens
+    keep_from = len(history)
+    for index in range(len(history) - 1, -1, -1):
+        if history_tokens[index] > remaining:
+            break
+        remaining -= history_tokens[index]
+        keep_from = index
+    
+    # Never start the window with an orphaned assistant reply
+    while keep_from < len(history) and history[keep_from]["role"] != "user":
+        remaining += history_tokens[keep_from]
+        keep_from += 1
+    
+    kept = list(history[keep_from:])
+    dropped = history[:keep_from]
+    
+    messages = [system_message]
+    collapsed = False
+    if dropped:
+        note = _collapse_note(dropped, remaining)
+        if estimate_message_tokens(note) <= remaining:
+            messages.append(note)
+            collapsed = True
+    messages.extend(kept)
+    messages.append(current_message)
+    
+    prompt_tokens = sum(estimate_message_tokens(msg) for msg in messages)
+    
+    return HistoryWindow(
+        messages=messages,
+        prompt_tokens=prompt_tokens,
+        dropped_messages=len(dropped),
+        trimmed_tokens=max(total_tokens - prompt_tokens, 0),
+        collapsed=collapsed
+    )
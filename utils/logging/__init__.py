@@ -9,11 +9,26 @@ from .logger import (
     log_error,
     log_system_startup
 )
+from .request_context import (
+    RequestContext,
+    start_request_context,
+    reset_request_context,
+    get_request_context,
+    update_request_context
+)
+from .tracing import span, trace_exporter
 
 __all__ = [
     'logger',
     'log_api_call', 
     'log_user_action',
     'log_error',
-    'log_system_startup'
+    'log_system_startup',
+    'RequestContext',
+    'start_request_context',
+    'reset_request_context',
+    'get_request_context',
+    'update_request_context',
+    'span',
+    'trace_exporter'
 ]
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Non-blocking log handlers.
+
+Log calls on the event loop only put the record on a bounded queue; a
+background listener thread writes records to the console and file handlers
+in batches, flushing each handler once per batch. When the queue is full,
+records below WARNING are dropped, and WARNING or higher records replace the
+oldest queued record, so a slow disk never blocks request handling.
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, Any, List
+
+
+class BatchFlushMixin:
+    """Skip the per-record flush of StreamHandler while the listener writes a batch."""
+    
+    batching = False
+    
+    def flush(self):
+        if not self.batching:
+            super().flush()
+
+
+class BatchedStreamHandler(BatchFlushMixin, logging.StreamHandler):
+    """Console handler flushed once per batch."""
+
+
+class BatchedFileHandler(BatchFlushMixin, logging.FileHandler):
+    """File handler flushed once per batch."""
+
+
+class BatchedRotatingFileHandler(BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    """Rotating file handler flushed once per batch."""
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: applies the drop policy when the queue is full."""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped: Dict[str, int] = {}
+        self._drop_lock = threading.Lock()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # StructuredLogger records are already plain JSON strings; only merge args and tracebacks
+        if record.args or record.exc_info:
+            return super().prepare(record)
+        return record
+    
+    def _count_drop(self, record: logging.LogRecord):
+        with self._drop_lock:
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        
+        if record.levelno < logging.WARNING:
+            self._count_drop(record)
+            return
+        
+        # Make room for warnings and errors by evicting the oldest queued record
+        try:
+            evicted = self.queue.get_nowait()
+            self.queue.task_done()
+            self._count_drop(evicted)
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_drop(record)
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that drains up to batch_size records before flushing its handlers."""
+    
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 100):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+        self.running = False
+    
+    def start(self):
+        super().start()
+        self.running = True
+    
+    def stop(self):
+        """Write the queued records and stop the writer thread (no-op when not running)."""
+        if self.running:
+            self.running = False
+            super().stop()
+    
+    def _drain(self) -> List[Any]:
+        batch = [self.dequeue(True)]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _monitor(self):
+        while True:
+            batch = self._drain()
+            stop = False
+            
+            for handler in self.handlers:
+                handler.batching = True
+            try:
+                for record in batch:
+                    if record is self._sentinel:
+                        stop = True
+                        continue
+                    self.handle(record)
+                    self.written += 1
+            finally:
+                for handler in self.handlers:
+                    handler.batching = False
+                    handler.flush()
+                self.batches += 1
+                for _ in batch:
+                    self.queue.task_done()
+            
+            if stop:
+                return
+    
+    def wait_until_empty(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record has been written."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
@@ -2,14 +2,46 @@
 Comprehensive logging system for the Medical Chatbot application.
 """
 
+import atexit
 import logging
 import logging.handlers
 import json
+import queue
+import random
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 from config.settings import settings
+from utils.logging.async_handlers import (
+    BatchedStreamHandler,
+    BatchedRotatingFileHandler,
+    DroppingQueueHandler,
+    BatchingQueueListener
+)
+
+
+LEVEL_NAMES = {level: logging.getLevelName(level) for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)}
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """
+    Parse per-event sample rates.
+    
+    Args:
+        value: Comma-separated event=rate pairs, e.g. "api_access=0.1,user_interaction=0.5"
+    
+    Returns:
+        Mapping of event name to a rate between 0 and 1
+    """
+    
+    rates = {}
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        event, rate = pair.split("=", 1)
+        rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
 
 
 class StructuredLogger:
@@ -17,7 +49,8 @@ class StructuredLogger:
     
     def __init__(self, name: str = "medical_chatbot"):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+        self.sample_rates = parse_sample_rates(settings.LOG_SAMPLE_RATES)
         
         # Remove existing handlers to avoid duplication
         for handler in self.logger.handlers[:]:
@@ -29,27 +62,34 @@ class StructuredLogger:
         )
         
         # Setup handlers
-        self._setup_console_handler()
-        self._setup_file_handler()
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[BatchingQueueListener] = None
+        handlers = [self._setup_console_handler(), self._setup_file_handler()]
+        
+        if settings.LOG_ASYNC_ENABLED:
+            self._setup_queue(handlers)
+        else:
+            for handler in handlers:
+                self.logger.addHandler(handler)
         
         # Prevent duplicate logs
         self.logger.propagate = False
     
-    def _setup_console_handler(self):
+    def _setup_console_handler(self) -> logging.Handler:
         """Setup console handler for development."""
-        console_handler = logging.StreamHandler()
+        console_handler = BatchedStreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(self.console_formatter)
-        self.logger.addHandler(console_handler)
+        return console_handler
     
-    def _setup_file_handler(self):
+    def _setup_file_handler(self) -> logging.Handler:
         """Setup rotating file handler."""
         # Ensure logs directory exists
         log_dir = Path(settings.LOG_FILE).parent
         log_dir.mkdir(exist_ok=True)
         
         # Create rotating file handler
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = BatchedRotatingFileHandler(
             filename=settings.LOG_FILE,
             maxBytes=settings.LOG_MAX_SIZE_MB * 1024 * 1024,  # Convert MB to bytes
             backupCount=settings.LOG_BACKUP_COUNT,
@@ -59,7 +99,39 @@ class StructuredLogger:
         
         # JSON formatter for structured logs
         file_handler.setFormatter(StructuredFormatter())
-        self.logger.addHandler(file_handler)
+        return file_handler
+    
+    def _setup_queue(self, handlers):
+        """Route records through a bounded queue to a background writer thread."""
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        self.queue_handler = DroppingQueueHandler(log_queue)
+        self.listener = BatchingQueueListener(log_queue, *handlers, batch_size=settings.LOG_BATCH_SIZE)
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        atexit.register(self.close)
+    
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued records are written (no-op in synchronous mode)."""
+        if self.listener:
+            self.listener.wait_until_empty(timeout)
+    
+    def close(self):
+        """Write the remaining queued records and stop the writer thread."""
+        if self.listener and self.listener.running:
+            self.listener.stop()
+    
+    def queue_stats(self) -> Dict[str, Any]:
+        """Get queue depth, written records, batches and dropped records per level."""
+        if not self.listener:
+            return {"mode": "sync"}
+        return {
+            "mode": "async",
+            "queued": self.listener.queue.qsize(),
+            "capacity": self.listener.queue.maxsize,
+            "written": self.listener.written,
+            "batches": self.listener.batches,
+            "dropped": dict(self.queue_handler.dropped)
+        }
     
     def _create_log_entry(self, level: str, message: str, **kwargs) -> Dict[str, Any]:
         """Create structured log entry."""
@@ -73,22 +145,29 @@ class StructuredLogger:
         # Add additional context
         if kwargs:
             entry["context"] = kwargs
-            
+        
         return entry
     
-    def info(self, message: str, **kwargs):
-        """Log info level message."""
-        entry = self._create_log_entry("INFO", message, **kwargs)
-        self.logger.info(json.dumps(entry, ensure_ascii=False))
-    
-    def warning(self, message: str, **kwargs):
-        """Log warning level message."""
-        entry = self._create_log_entry("WARNING", message, **kwargs)
-        self.logger.warning(json.dumps(entry, ensure_ascii=False))
+    def _enabled(self, level: int, event: Optional[str] = None) -> bool:
+        """Check the level, and the event's sample rate, before any record is built."""
+        if not self.logger.isEnabledFor(level):
+            return False
+        rate = self.sample_rates.get(event) if event else None
+        return rate is None or random.random() < rate
     
-    def error(self, message: str, exception: Optional[Exception] = None, **kwargs):
-        """Log error level message with optional exception details."""
-        entry = self._create_log_entry("ERROR", message, **kwargs)
+    def _write(self, level: int, message: str, context: Dict[str, Any], event: Optional[str] = None, exception: Optional[Exception] = None):
+        """Build the JSON record and hand it to the logging handlers."""
+        if event is not None and event in self.sample_rates:
+            context["sample_rate"] = self.sample_rates[event]
+        
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "level": LEVEL_NAMES[level],
+            "message": message,
+            "logger": self.logger.name
+        }
+        if context:
+            entry["context"] = context
         
         if exception:
             entry["exception"] = {
@@ -97,51 +176,104 @@ class StructuredLogger:
                 "traceback": traceback.format_exc()
             }
         
-        self.logger.error(json.dumps(entry, ensure_ascii=False))
+        self.logger.log(level, json.dumps(entry, ensure_ascii=False))
+    
+    def info(self, message: str, **kwargs):
+        """Log info level message."""
+        if self.logger.isEnabledFor(logging.INFO):
+            self._write(logging.INFO, message, kwargs)
+    
+    def warning(self, message: str, **kwargs):
+        """Log warning level message."""
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._write(logging.WARNING, message, kwargs)
+    
+    def error(self, message: str, exception: Optional[Exception] = None, **kwargs):
+        """Log error level message with optional exception details."""
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._write(logging.ERROR, message, kwargs, exception=exception)
     
     def debug(self, message: str, **kwargs):
         """Log debug level message."""
-        entry = self._create_log_entry("DEBUG", message, **kwargs)
-        self.logger.debug(json.dumps(entry, ensure_ascii=False))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._write(logging.DEBUG, message, kwargs)
     
     def api_request(self, endpoint: str, method: str, user_info: Optional[Dict] = None, **kwargs):
         """Log API request."""
-        self.info(
-            f"API Request: {method} {endpoint}",
-            endpoint=endpoint,
-            method=method,
-            user_info=user_info,
-            **kwargs
-        )
+        if self._enabled(logging.INFO, "api_request"):
+            self._write(
+                logging.INFO,
+                f"API Request: {method} {endpoint}",
+                {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "user_info": user_info,
+                    **kwargs
+                },
+                "api_request"
+            )
     
     def api_response(self, endpoint: str, status_code: int, response_time_ms: float, **kwargs):
         """Log API response."""
-        self.info(
-            f"API Response: {endpoint} - {status_code}",
-            endpoint=endpoint,
-            status_code=status_code,
-            response_time_ms=response_time_ms,
-            **kwargs
-        )
+        if self._enabled(logging.INFO, "api_response"):
+            self._write(
+                logging.INFO,
+                f"API Response: {endpoint} - {status_code}",
+                {
+                    "endpoint": endpoint,
+                    "status_code": status_code,
+                    "response_time_ms": response_time_ms,
+                    **kwargs
+                },
+                "api_response"
+            )
+    
+    def api_access(self, method: str, endpoint: str, status_code: Optional[int], response_time_ms: float, **kwargs):
+        """Log one access record per HTTP request (request, response and timings)."""
+        # Server errors are always logged, whatever the sample rate
+        event = "api_access" if status_code is not None and status_code < 500 else None
+        if self._enabled(logging.INFO, event):
+            self._write(
+                logging.INFO,
+                f"API Access: {method} {endpoint} - {status_code}",
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "status_code": status_code,
+                    "response_time_ms": response_time_ms,
+                    **kwargs
+                },
+                event
+            )
     
     def user_interaction(self, phase: str, action: str, user_language: str, **kwargs):
         """Log user interactions."""
-        self.info(
-            f"User Interaction: {phase} - {action}",
-            phase=phase,
-            action=action,
-            user_language=user_language,
-            **kwargs
-        )
+        if self._enabled(logging.INFO, "user_interaction"):
+            self._write(
+                logging.INFO,
+                f"User Interaction: {phase} - {action}",
+                {
+                    "phase": phase,
+                    "action": action,
+                    "user_language": user_language,
+                    **kwargs
+                },
+                "user_interaction"
+            )
     
     def azure_openai_request(self, model: str, tokens_used: Optional[int] = None, **kwargs):
         """Log Azure OpenAI API calls."""
-        self.info(
-            f"Azure OpenAI Request: {model}",
-            model=model,
-            tokens_used=tokens_used,
-            **kwargs
-        )
+        if self._enabled(logging.INFO, "azure_openai_request"):
+            self._write(
+                logging.INFO,
+                f"Azure OpenAI Request: {model}",
+                {
+                    "model": model,
+                    "tokens_used": tokens_used,
+                    **kwargs
+                },
+                "azure_openai_request"
+            )
     
     def system_health(self, component: str, status: str, **kwargs):
         """Log system health checks."""
@@ -0,0 +1,121 @@
+"""
+Per-request context shared between the API layer and the service layer.
+
+The error handling middleware opens a RequestContext for every HTTP request;
+endpoints fill in the phase, HMO and tier and record stage spans, and the
+Azure OpenAI service adds token usage and upstream latency to it. The context object is mutable, so
+values added inside the endpoint task are visible to the middleware when it
+logs the response.
+"""
+
+import re
+import time
+import uuid
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+# W3C trace context: version-traceid-parentid-flags
+TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+@dataclass
+class Span:
+    """A timed stage of a request (perf_counter nanoseconds)."""
+    name: str
+    start_ns: int
+    end_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+@dataclass
+class RequestContext:
+    """Identity and Azure OpenAI usage of one HTTP request."""
+    request_id: str
+    endpoint: str
+    trace_id: str
+    parent_span_id: Optional[str] = None
+    start_unix_ns: int = 0
+    start_perf_ns: int = 0
+    spans: List[Span] = field(default_factory=list)
+    phase: Optional[str] = None
+    hmo_name: Optional[str] = None
+    membership_tier: Optional[str] = None
+    azure_calls: int = 0
+    azure_failed_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    upstream_ms: float = 0.0
+    retries: int = 0
+    cost_usd: float = 0.0
+    
+    def usage_summary(self) -> Dict[str, Any]:
+        """Azure OpenAI usage of this request, for the response log record."""
+        return {
+            "request_id": self.request_id,
+            "phase": self.phase,
+            "azure_calls": self.azure_calls,
+            "azure_failed_calls": self.azure_failed_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "upstream_ms": round(self.upstream_ms, 2),
+            "retries": self.retries,
+            "cost_usd": round(self.cost_usd, 6)
+        }
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read the trace and parent span ids from a W3C traceparent header.
+    
+    Returns:
+        Tuple of (trace_id, parent_span_id), or (None, None) when absent or malformed
+    """
+    
+    match = TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+    if not match or match.group(1) == "0" * 32:
+        return None, None
+    return match.group(1), match.group(2)
+
+def start_request_context(endpoint: str, traceparent: Optional[str] = None) -> Token:
+    """
+    Open a request context for the current task.
+    
+    Args:
+        endpoint: Request path
+        traceparent: Incoming W3C traceparent header, to continue the caller's trace
+    
+    Returns:
+        Token for reset_request_context
+    """
+    
+    trace_id, parent_span_id = parse_traceparent(traceparent)
+    return _current_request.set(RequestContext(
+        request_id=uuid.uuid4().hex[:16],
+        endpoint=endpoint,
+        trace_id=trace_id or uuid.uuid4().hex,
+        parent_span_id=parent_span_id,
+        start_unix_ns=time.time_ns(),
+        start_perf_ns=time.perf_counter_ns()
+    ))
+
+def reset_request_context(token: Token):
+    """Close the request context opened with start_request_context."""
+    _current_request.reset(token)
+
+def get_request_context() -> Optional[RequestContext]:
+    """Get the current request context, or None outside a request."""
+    return _current_request.get()
+
+def update_request_context(**fields):
+    """Set phase, HMO or tier on the current request context (no-op outside a request)."""
+    context = _current_request.get()
+    if context is None:
+        return
+    for name, value in fields.items():
+        setattr(context, name, value)
@@ -0,0 +1,189 @@
+"""
+Per-request stage tracing.
+
+Endpoints wrap their stages (language detection, context load, prompt build,
+upstream call, history rebuild) in span(); the spans are kept on the request
+context. The access middleware turns them into a Server-Timing header and a
+stages_ms field on the access record, and optionally exports each request as
+an OpenTelemetry (OTLP/JSON) trace, one JSON document per line.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from config.settings import settings
+from utils.logging.request_context import RequestContext, Span, get_request_context
+from utils.logging.async_handlers import BatchedFileHandler, DroppingQueueHandler, BatchingQueueListener
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+SERIALIZE_STAGE = "serialize"
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a request stage.
+    
+    Args:
+        name: Stage name (used as the Server-Timing metric name)
+        attributes: Extra span attributes for the exported trace
+    """
+    
+    context = get_request_context()
+    if context is None or not settings.TRACING_ENABLED:
+        yield
+        return
+    
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        context.spans.append(Span(name, start_ns, time.perf_counter_ns(), attributes))
+
+def stage_durations_ms(spans: List[Span]) -> Dict[str, float]:
+    """Sum span durations per stage name, in milliseconds (in first-seen order)."""
+    durations: Dict[str, float] = {}
+    for stage in spans:
+        durations[stage.name] = durations.get(stage.name, 0.0) + stage.duration_ms
+    return {name: round(duration, 3) for name, duration in durations.items()}
+
+def serialize_span(context: RequestContext, response_start_ns: int) -> Optional[Span]:
+    """
+    Span from the end of the last stage to the response start.
+    
+    After the endpoint returns, FastAPI validates and serializes the response
+    model, so this gap is attributed to serialization.
+    """
+    
+    if not context.spans:
+        return None
+    last_end_ns = max(stage.end_ns for stage in context.spans)
+    if last_end_ns >= response_start_ns:
+        return None
+    return Span(SERIALIZE_STAGE, last_end_ns, response_start_ns)
+
+def server_timing_header(spans: List[Span], total_ms: float) -> str:
+    """
+    Format stage durations as a Server-Timing header value.
+    
+    Args:
+        spans: Spans finished before the response started
+        total_ms: Time from request start to response start
+    
+    Returns:
+        e.g. "context;dur=1.2, upstream;dur=812.4, total;dur=815.0"
+    """
+    
+    metrics = [f"{name};dur={duration}" for name, duration in stage_durations_ms(spans).items()]
+    metrics.append(f"total;dur={round(total_ms, 3)}")
+    return ", ".join(metrics)
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+class OTLPJsonFileExporter:
+    """Write each request's spans as an OTLP/JSON ExportTraceServiceRequest line."""
+    
+    def __init__(self, path: str, service_name: str = "medical-chatbot"):
+        self.path = path
+        self.service_name = service_name
+        self.listener: Optional[BatchingQueueListener] = None
+        
+        self.logger = logging.getLogger("medical_chatbot.traces")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = BatchedFileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        # Same bounded queue and background writer as the application log
+        if settings.LOG_ASYNC_ENABLED:
+            trace_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+            self.queue_handler = DroppingQueueHandler(trace_queue)
+            self.listener = BatchingQueueListener(trace_queue, file_handler, batch_size=settings.LOG_BATCH_SIZE)
+            self.logger.addHandler(self.queue_handler)
+            self.listener.start()
+            atexit.register(self.close)
+        else:
+            self.logger.addHandler(file_handler)
+    
+    def export(self, context: RequestContext, spans: List[Span], method: str, route: str, status_code: Optional[int], end_perf_ns: int):
+        """
+        Export a request as one server span with a child span per stage.
+        
+        Args:
+            context: Request context (trace id, wall-clock anchor)
+            spans: Stage spans, including the synthetic serialize span
+            method: HTTP method
+            route: Route template
+            status_code: Response status (None if no response was sent)
+            end_perf_ns: perf_counter_ns at the end of the response
+        """
+        
+        def unix_ns(perf_ns: int) -> str:
+            return str(context.start_unix_ns + perf_ns - context.start_perf_ns)
+        
+        root_span_id = uuid.uuid4().hex[:16]
+        root = {
+            "traceId": context.trace_id,
+            "spanId": root_span_id,
+            "name": f"{method} {route}",
+            "kind": SPAN_KIND_SERVER,
+            "startTimeUnixNano": unix_ns(context.start_perf_ns),
+            "endTimeUnixNano": unix_ns(end_perf_ns),
+            "attributes": [
+                _attribute("http.request.method", method),
+                _attribute("http.route", route),
+                _attribute("url.path", context.endpoint),
+                _attribute("http.response.status_code", status_code or 0),
+                _attribute("request.id", context.request_id)
+            ] + ([_attribute("app.phase", context.phase)] if context.phase else []),
+            "status": {"code": 2} if status_code is None or status_code >= 500 else {}
+        }
+        if context.parent_span_id:
+            root["parentSpanId"] = context.parent_span_id
+        
+        otlp_spans = [root]
+        for stage in spans:
+            otlp_spans.append({
+                "traceId": context.trace_id,
+                "spanId": uuid.uuid4().hex[:16],
+                "parentSpanId": root_span_id,
+                "name": stage.name,
+                "kind": SPAN_KIND_INTERNAL,
+                "startTimeUnixNano": unix_ns(stage.start_ns),
+                "endTimeUnixNano": unix_ns(stage.end_ns),
+                "attributes": [_attribute(key, value) for key, value in stage.attributes.items()]
+            })
+        
+        self.logger.info(json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "medical_chatbot"}, "spans": otlp_spans}]
+            }]
+        }, ensure_ascii=False))
+    
+    def close(self):
+        """Write the remaining queued traces and stop the writer thread."""
+        if self.listener and self.listener.running:
+            self.listener.stop()
+
+# Global exporter, enabled by TRACE_EXPORT_FILE
+trace_exporter = OTLPJsonFileExporter(settings.TRACE_EXPORT_FILE) if settings.TRACING_ENABLED and settings.TRACE_EXPORT_FILE else None
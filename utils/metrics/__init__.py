@@ -0,0 +1,53 @@
+"""Prometheus-style metrics for the Medical Chatbot application."""
+
+from .registry import MetricsRegistry, Counter, Gauge, Histogram, DEFAULT_LATENCY_BUCKETS
+from .instruments import (
+    metrics,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    azure_openai_requests_total,
+    azure_openai_request_duration_seconds,
+    azure_openai_requests_in_flight,
+    azure_openai_retries_total,
+    azure_openai_tokens_total,
+    azure_openai_cost_usd_total,
+    medical_qa_context_duration_seconds,
+    system_prompt_chars,
+    medical_qa_answers_total,
+    user_info_turns_total,
+    medical_context_load_seconds,
+    medical_contexts_loaded,
+    answer_cache_entries,
+    answer_cache_hit_ratio,
+    prompt_cache_hit_ratio,
+    prompt_cache_cached_token_ratio
+)
+
+__all__ = [
+    'MetricsRegistry',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'DEFAULT_LATENCY_BUCKETS',
+    'metrics',
+    'http_requests_total',
+    'http_request_duration_seconds',
+    'http_requests_in_flight',
+    'azure_openai_requests_total',
+    'azure_openai_request_duration_seconds',
+    'azure_openai_requests_in_flight',
+    'azure_openai_retries_total',
+    'azure_openai_tokens_total',
+    'azure_openai_cost_usd_total',
+    'medical_qa_context_duration_seconds',
+    'system_prompt_chars',
+    'medical_qa_answers_total',
+    'user_info_turns_total',
+    'medical_context_load_seconds',
+    'medical_contexts_loaded',
+    'answer_cache_entries',
+    'answer_cache_hit_ratio',
+    'prompt_cache_hit_ratio',
+    'prompt_cache_cached_token_ratio'
+]
@@ -0,0 +1,76 @@
+"""
+Application metrics, recorded by the API middleware, the endpoints and the
+Azure OpenAI service, and exposed on /metrics.
+"""
+
+from utils.metrics.registry import MetricsRegistry
+
+# Characters, from short user info prompts up to the full medical context
+PROMPT_SIZE_BUCKETS = (1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+metrics = MetricsRegistry()
+
+# HTTP layer
+http_requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the response body is complete).", ("method", "route", "status")
+)
+http_requests_in_flight = metrics.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+)
+
+# Azure OpenAI
+azure_openai_requests_total = metrics.counter(
+    "azure_openai_requests_total", "Azure OpenAI calls by deployment and outcome.", ("deployment", "outcome")
+)
+azure_openai_request_duration_seconds = metrics.histogram(
+    "azure_openai_request_duration_seconds", "Azure OpenAI call latency, including retries.", ("deployment", "streamed")
+)
+azure_openai_requests_in_flight = metrics.gauge(
+    "azure_openai_requests_in_flight", "Azure OpenAI calls waiting for a response.", ("deployment",)
+)
+azure_openai_retries_total = metrics.counter(
+    "azure_openai_retries_total", "Retried Azure OpenAI attempts.", ("deployment",)
+)
+azure_openai_tokens_total = metrics.counter(
+    "azure_openai_tokens_total", "Azure OpenAI tokens by deployment and type (prompt, completion, cached).", ("deployment", "type")
+)
+azure_openai_cost_usd_total = metrics.counter(
+    "azure_openai_cost_usd_total", "Estimated Azure OpenAI cost in USD.", ("deployment",)
+)
+
+# Request stages
+medical_qa_context_duration_seconds = metrics.histogram(
+    "medical_qa_context_duration_seconds", "Medical context lookup and retrieval time per question."
+)
+system_prompt_chars = metrics.histogram(
+    "system_prompt_chars", "System prompt size in characters.", ("phase",), PROMPT_SIZE_BUCKETS
+)
+medical_qa_answers_total = metrics.counter(
+    "medical_qa_answers_total", "Medical Q&A answers by source (local, cache, llm).", ("source",)
+)
+user_info_turns_total = metrics.counter(
+    "user_info_turns_total", "User info collection turns by status.", ("status",)
+)
+
+# Refreshed from the component stats on every scrape
+medical_context_load_seconds = metrics.gauge(
+    "medical_context_load_seconds", "Time to preload the medical context store at startup."
+)
+medical_contexts_loaded = metrics.gauge(
+    "medical_contexts_loaded", "Medical contexts held in memory."
+)
+answer_cache_entries = metrics.gauge(
+    "answer_cache_entries", "Entries in the answer cache."
+)
+answer_cache_hit_ratio = metrics.gauge(
+    "answer_cache_hit_ratio", "Answer cache hits per lookup."
+)
+prompt_cache_hit_ratio = metrics.gauge(
+    "prompt_cache_hit_ratio", "Share of Azure OpenAI responses with cached prompt tokens.", ("deployment",)
+)
+prompt_cache_cached_token_ratio = metrics.gauge(
+    "prompt_cache_cached_token_ratio", "Share of prompt tokens served from the upstream prompt cache.", ("deployment",)
+)
@@ -0,0 +1,18 @@
+"""Lexical search over the preprocessed medical service data."""
+
+from .hebrew import normalize_text, tokenize, query_terms, index_terms, ENGLISH_ALIASES
+from .bm25 import BM25Index
+from .service_index import ServiceIndex, ServiceDocument, SearchHit, service_index
+
+__all__ = [
+    'normalize_text',
+    'tokenize',
+    'query_terms',
+    'index_terms',
+    'ENGLISH_ALIASES',
+    'BM25Index',
+    'ServiceIndex',
+    'ServiceDocument',
+    'SearchHit',
+    'service_index'
+]
@@ -0,0 +1,100 @@
+"""
+In-memory BM25 inverted index.
+"""
+
+import math
+from collections import defaultdict
+from typing import List, Dict, Set, Tuple, Callable, Optional, Iterable
+
+class BM25Index:
+    """
+    BM25 ranking over field-weighted documents.
+    
+    Documents are added as (text terms, weight) fields so titles and names
+    can count more than descriptions. Each query word is a set of variant
+    terms and contributes its best-scoring variant, so stems and inflected
+    forms of the same word are not counted twice.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_lengths: List[float] = []
+        self._idf: Dict[str, float] = {}
+        self._avg_doc_length = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+    
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct indexed terms."""
+        return len(self._postings)
+    
+    def add_document(self, fields: Iterable[Tuple[List[str], float]]) -> int:
+        """
+        Index a document.
+        
+        Args:
+            fields: (terms, weight) pairs; each occurrence adds `weight` to the term frequency
+        
+        Returns:
+            Document id (insertion order)
+        """
+        
+        doc_id = len(self._doc_lengths)
+        length = 0.0
+        for terms, weight in fields:
+            for term in terms:
+                postings = self._postings[term]
+                postings[doc_id] = postings.get(doc_id, 0.0) + weight
+                length += weight
+        self._doc_lengths.append(length)
+        return doc_id
+    
+    def finalize(self):
+        """Compute IDF values and the average document length after indexing."""
+        count = len(self._doc_lengths)
+        self._avg_doc_length = sum(self._doc_lengths) / count if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+    
+    def score(
+        self,
+        query: List[Tuple[Set[str], float]],
+        doc_filter: Optional[Callable[[int], bool]] = None
+    ) -> Dict[int, float]:
+        """
+        Score documents for a query.
+        
+        Args:
+            query: (variant terms, weight) per query word
+            doc_filter: Optional predicate restricting which documents are scored
+        
+        Returns:
+            Mapping of document id to score (only documents with a match)
+        """
+        
+        scores: Dict[int, float] = defaultdict(float)
+        
+        for variants, query_weight in query:
+            best: Dict[int, float] = {}
+            for term in variants:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = self._idf[term]
+                for doc_id, tf in postings.items():
+                    if doc_filter is not None and not doc_filter(doc_id):
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / self._avg_doc_length)
+                    term_score = idf * tf * (self.k1 + 1) / (tf + norm)
+                    if term_score > best.get(doc_id, 0.0):
+                        best[doc_id] = term_score
+            for doc_id, term_score in best.items():
+                scores[doc_id] += term_score * query_weight
+        
+        return scores
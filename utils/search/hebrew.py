@@ -0,0 +1,108 @@
+"""
+Hebrew-aware text normalization for lexical search.
+
+Strips niqqud and cantillation, folds final letters, and expands each word
+into its plausible stems (without a leading prefix such as ו/ה/ב/ל/מ/ש/כ and
+without a common plural/construct suffix). English words are mapped to the
+Hebrew vocabulary of the service data.
+"""
+
+import re
+from typing import List, Set
+
+# Niqqud, cantillation marks and punctuation points inside Hebrew words
+NIQQUD_PATTERN = re.compile(r'[\u0591-\u05C7]')
+WORD_PATTERN = re.compile(r'[\u05D0-\u05EAa-z0-9]+')
+
+FINAL_LETTERS = str.maketrans({"ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ"})
+
+# Single-letter prefixes; up to two may be stacked (e.g. "ובשיניים", "שהטיפול")
+HEBREW_PREFIXES = "והבלמשכ"
+MAX_PREFIX_LETTERS = 2
+
+# Suffixes after final-letter folding (ים -> ימ)
+HEBREW_SUFFIXES = ("ימ", "ות", "ה", "י")
+
+# Shortest stem kept after stripping affixes
+MIN_STEM_LENGTH = 2
+
+# English service vocabulary mapped to Hebrew terms used in the data
+ENGLISH_ALIASES = {
+    "alternative": "רפואה משלימה", "complementary": "רפואה משלימה",
+    "acupuncture": "דיקור", "shiatsu": "שיאצו", "reflexology": "רפלקסולוגיה",
+    "naturopathy": "נטורופתיה", "homeopathy": "הומאופתיה", "chiropractic": "כירופרקטיקה",
+    "chiropractor": "כירופרקטיקה",
+    "communication": "תקשורת", "speech": "דיבור", "language": "שפה", "stuttering": "גמגום",
+    "voice": "קול", "swallowing": "בליעה", "hearing": "שמיעה", "developmental": "התפתחותי",
+    "dental": "שיניים", "dentist": "שיניים", "teeth": "שיניים", "tooth": "שיניים",
+    "cleaning": "ניקוי", "filling": "סתימות", "fillings": "סתימות", "root": "שורש", "canal": "שורש",
+    "crown": "כתרים", "crowns": "כתרים", "implant": "שתלים", "implants": "שתלים",
+    "orthodontics": "יישור", "braces": "יישור", "cosmetic": "קוסמטיים", "whitening": "קוסמטיים",
+    "optometry": "אופטומטריה", "eye": "ראייה", "eyes": "ראייה", "vision": "ראייה",
+    "glasses": "משקפי", "lenses": "עדשות", "contact": "עדשות מגע", "laser": "תיקון ראייה",
+    "pregnancy": "הריון", "pregnant": "הריון", "birth": "לידה", "prenatal": "הריון",
+    "genetic": "גנטיות", "screening": "סקר", "ultrasound": "סקירות", "complications": "סיבוכי",
+    "workshop": "סדנאות", "workshops": "סדנאות", "smoking": "עישון", "nutrition": "תזונה",
+    "diet": "תזונה", "exercise": "פעילות גופנית", "fitness": "פעילות גופנית",
+    "stress": "מתח", "diabetes": "סוכרת",
+    "children": "ילדים", "kids": "ילדים", "child": "ילדים",
+    "phone": "טלפון", "website": "אתר"
+}
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip niqqud and fold Hebrew final letters."""
+    return NIQQUD_PATTERN.sub('', text).lower().translate(FINAL_LETTERS)
+
+def word_variants(word: str) -> Set[str]:
+    """
+    Expand a normalized word into the stems it may stand for.
+    
+    Prefix stripping is ambiguous in Hebrew ("הריון" starts with ה), so the
+    original word is always kept alongside the stripped forms.
+    """
+    
+    if not word:
+        return set()
+    
+    variants = {word}
+    
+    if not 'א' <= word[0] <= 'ת':
+        return variants
+    
+    stem = word
+    for _ in range(MAX_PREFIX_LETTERS):
+        if len(stem) - 1 < MIN_STEM_LENGTH + 1 or stem[0] not in HEBREW_PREFIXES:
+            break
+        stem = stem[1:]
+        variants.add(stem)
+    
+    for form in list(variants):
+        for suffix in HEBREW_SUFFIXES:
+            if len(form) - len(suffix) >= MIN_STEM_LENGTH + 1 and form.endswith(suffix):
+                variants.add(form[:-len(suffix)])
+                break
+    
+    return variants
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized words, expanding English aliases into Hebrew words."""
+    words = []
+    for word in WORD_PATTERN.findall(normalize_text(text)):
+        if len(word) < 2:
+            continue
+        words.append(word)
+        alias = ENGLISH_ALIASES.get(word)
+        if alias:
+            words.extend(normalize_text(alias).split())
+    return words
+
+def query_terms(text: str) -> List[Set[str]]:
+    """Tokenize a query into one variant set per word."""
+    return [word_variants(word) for word in tokenize(text)]
+
+def index_terms(text: str) -> List[str]:
+    """Tokenize a document into all variant terms for indexing."""
+    terms = []
+    for word in tokenize(text):
+        terms.extend(word_variants(word))
+    return terms
@@ -0,0 +1,191 @@
+"""
+Service Search Index
+
+In-memory index over the preprocessed service JSONs (preprocessing/jsons/),
+built once at application startup. Indexes every service and every category
+overview, and answers ranked lookups optionally resolved to a user's HMO and
+membership tier.
+"""
+
+import os
+import json
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+from utils.search.bm25 import BM25Index
+from utils.search.hebrew import query_terms, index_terms
+
+# Field weights: service and category names matter more than descriptions
+TITLE_WEIGHT = 2.0
+SERVICE_NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+@dataclass
+class ServiceDocument:
+    """An indexed service, or a category overview when service_name is None."""
+    category_key: str
+    category_title: str
+    service_name: Optional[str]
+    description: str
+    benefits: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    phone_numbers: Dict[str, str] = field(default_factory=dict)
+    websites: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+    document: ServiceDocument
+    score: float
+    benefits: Optional[str] = None
+
+class ServiceIndex:
+    """BM25 index over services and category overviews."""
+    
+    def __init__(self):
+        self._index = BM25Index()
+        self.documents: List[ServiceDocument] = []
+        self.categories: Dict[str, Dict[str, Any]] = {}
+        self.jsons_folder: Optional[str] = None
+        self.loaded = False
+        self.build_time_ms = 0.0
+    
+    def load(self, jsons_folder: str = "preprocessing/jsons") -> int:
+        """
+        Build the index from every service JSON in a folder, replacing current contents.
+        
+        Args:
+            jsons_folder: Folder containing the preprocessed service JSONs
+        
+        Returns:
+            Number of indexed documents
+        """
+        
+        start_time = time.perf_counter()
+        index = BM25Index()
+        documents: List[ServiceDocument] = []
+        categories: Dict[str, Dict[str, Any]] = {}
+        
+        filenames = sorted(name for name in os.listdir(jsons_folder) if name.endswith('.json')) if os.path.isdir(jsons_folder) else []
+        
+        for filename in filenames:
+            with open(os.path.join(jsons_folder, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            category_key = filename[:-len('.json')]
+            title = data.get('title', category_key)
+            phone_numbers = data.get('phone_numbers', {}).get('contact_info', {})
+            websites = {
+                hmo: details.get('website', '')
+                for hmo, details in data.get('additional_information', {}).get('details', {}).items()
+            }
+            categories[category_key] = {"title": title, "services": list(data.get('services_descriptions', {}))}
+            
+            overview = " ".join([data.get('general_description', '')] + list(data.get('specific_description', {}).values()))
+            documents.append(ServiceDocument(category_key, title, None, overview, {}, phone_numbers, websites))
+            index.add_document([
+                (index_terms(title), TITLE_WEIGHT),
+                (index_terms(overview), DESCRIPTION_WEIGHT)
+            ])
+            
+            services_details = data.get('services_details', {})
+            for service_name, description in data.get('services_descriptions', {}).items():
+                benefits = {
+                    hmo: {tier: details[service_name] for tier, details in tiers.items() if service_name in details}
+                    for hmo, tiers in services_details.items()
+                }
+                documents.append(ServiceDocument(category_key, title, service_name, description, benefits, phone_numbers, websites))
+                index.add_document([
+                    (index_terms(title), TITLE_WEIGHT),
+                    (index_terms(service_name), SERVICE_NAME_WEIGHT),
+                    (index_terms(description), DESCRIPTION_WEIGHT)
+                ])
+        
+        index.finalize()
+        
+        self._index = index
+        self.documents = documents
+        self.categories = categories
+        self.jsons_folder = jsons_folder
+        self.build_time_ms = (time.perf_counter() - start_time) * 1000
+        self.loaded = True
+        
+        return len(documents)
+    
+    def _ensure_loaded(self):
+        """Build the index on first use if it was not built at startup."""
+        if not self.loaded:
+            self.load(self.jsons_folder or "preprocessing/jsons")
+    
+    def _score(self, queries: List[Tuple[str, float]], services_only: bool = False) -> Dict[int, float]:
+        self._ensure_loaded()
+        
+        weighted_query = []
+        for text, weight in queries:
+            weighted_query.extend((variants, weight) for variants in query_terms(text))
+        
+        doc_filter = (lambda doc_id: self.documents[doc_id].service_name is not None) if services_only else None
+        return self._index.score(weighted_query, doc_filter)
+    
+    def search(
+        self,
+        query: str,
+        hmo_name: Optional[str] = None,
+        membership_tier: Optional[str] = None,
+        limit: int = 5,
+        services_only: bool = True
+    ) -> List[SearchHit]:
+        """
+        Ranked lookup of services matching a query.
+        
+        Args:
+            query: Free-text query (Hebrew or English)
+            hmo_name: Resolve benefits for this HMO (optional)
+            membership_tier: Resolve benefits for this tier (optional, requires hmo_name)
+            limit: Maximum number of hits
+            services_only: Exclude category overview documents
+        
+        Returns:
+            Hits ordered by descending score
+        """
+        
+        scores = self._score([(query, 1.0)], services_only)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        
+        hits = []
+        for doc_id, score in ranked:
+            document = self.documents[doc_id]
+            benefits = None
+            if hmo_name and membership_tier:
+                benefits = document.benefits.get(hmo_name, {}).get(membership_tier)
+            hits.append(SearchHit(document=document, score=round(score, 4), benefits=benefits))
+        return hits
+    
+    def category_scores(self, queries: List[Tuple[str, float]]) -> Dict[str, float]:
+        """
+        Score categories for weighted query texts (e.g. question and recent history).
+        
+        A category scores as its best-matching document, so one strongly
+        matching service outweighs many weak matches.
+        
+        Returns:
+            Mapping of category title to score (only categories with a match)
+        """
+        
+        scores: Dict[str, float] = {}
+        for doc_id, score in self._score(queries).items():
+            title = self.documents[doc_id].category_title
+            scores[title] = max(scores.get(title, 0.0), score)
+        return scores
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get index size and build statistics."""
+        return {
+            "loaded": self.loaded,
+            "categories": len(self.categories),
+            "documents": len(self.documents),
+            "vocabulary": self._index.vocabulary_size,
+            "build_time_ms": round(self.build_time_ms, 2)
+        }
+
+# Global service index, built in the application lifespan
+service_index = ServiceIndex()